@@ -3,9 +3,11 @@ from bson import ObjectId
 import urllib.parse
 import threading
 import asyncio
+import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import weakref
+from pymongo import UpdateOne
 from pymongo.errors import NetworkTimeout, ServerSelectionTimeoutError, ConnectionFailure
 
 # Utils
@@ -46,10 +48,10 @@ class FlowDB:
         self.db_name = self.environment_utils.get_env_variable("MONGO_DB_NAME")
 
         # Mongo Connection Pool Configs
-        self.max_pool_size = 50
-        self.min_pool_size = 0  # Create connections on-demand instead of at startup
+        self.max_pool_size = 200  # Sized for webhook bursts; checkouts are short, so headroom beats queueing
+        self.min_pool_size = 20  # Keep a warm floor so bursts don't pay connection setup
         self.max_idle_time_ms = 30000
-        self.wait_queue_timeout_ms = 10000  # Reduced from 30000ms for faster failure detection
+        self.wait_queue_timeout_ms = 500  # Fail a checkout fast instead of queueing behind a saturated pool
         self.connect_timeout_ms = 10000  # Reduced from 20000ms for faster failure detection
         self.server_selection_timeout_ms = 10000  # Increased from 5000ms for consistency
         self.socket_timeout_ms = 10000  # Added for socket-level timeout
@@ -77,6 +79,34 @@ class FlowDB:
         # Thread-safe initialization lock
         self._client_lock = threading.Lock()
 
+        # Per-brand trigger cache - triggers change rarely compared to message
+        # volume, so a short TTL saves one DB roundtrip per inbound message
+        self.trigger_cache_ttl_seconds = 60
+        self._trigger_cache = {}  # {brand_id: (expires_at, triggers)}
+        self._trigger_cache_lock = threading.Lock()
+
+        # Per-flow document cache - flows change on publish/edit, not per
+        # message, so a short TTL drops the fetch+deserialize per webhook
+        self.flow_cache_ttl_seconds = 60
+        self._flow_cache = {}  # {flow_id: (expires_at, flow)}
+        self._flow_cache_lock = threading.Lock()
+        # Single-flight map for flow cache misses: when a hot flow expires
+        # under concurrent webhooks, one fetch runs and the rest await it
+        self._flow_fetch_futures = {}  # {flow_id: Future}
+
+        # Node-detail cache - node type definitions are effectively static
+        # (seeded once, edited via admin APIs), so a long TTL plus write
+        # invalidation gives a near-100% hit rate on the per-hop type lookup
+        self.node_detail_cache_ttl_seconds = 300
+        self._node_detail_cache = {}  # {node_id: (expires_at, node_detail)}
+        self._node_detail_cache_lock = threading.Lock()
+
+        # Micro-batch buffer for delay inserts - bursts (broadcast flows) are
+        # flushed with one insert_many instead of one round-trip per record
+        self.delay_batch_flush_seconds = 0.01
+        self._delay_batch = []
+        self._delay_flush_task = None
+
     def _get_client_for_current_loop(self):
         """
         Thread-safe method to get the MongoDB client and collections for the current event loop.
@@ -162,6 +192,33 @@ class FlowDB:
         }
     
     
+    async def aclose(self):
+        """
+        Flush any buffered delay saves, then close all MongoDB clients.
+        Called at application shutdown so the coalescing window can't drop
+        delay records that were queued but not yet written.
+        """
+        flush_task = self._delay_flush_task
+        if flush_task is not None and not flush_task.done():
+            try:
+                await flush_task
+            except Exception as e:
+                self.log_util.warning(
+                    service_name="FlowDB",
+                    message=f"Error awaiting delay flush task at shutdown: {str(e)}"
+                )
+        if self._delay_batch:
+            docs, self._delay_batch = self._delay_batch, []
+            client_data = self._get_client_for_current_loop()
+            try:
+                await client_data['collections']['delays'].insert_many(docs, ordered=False)
+            except Exception as e:
+                self.log_util.error(
+                    service_name="FlowDB",
+                    message=f"Error flushing delay batch of {len(docs)} at shutdown: {str(e)}"
+                )
+        self.close()
+
     def close(self):
         """
         Close all MongoDB clients and cleanup resources
@@ -253,18 +310,53 @@ class FlowDB:
 
     async def get_flow(self, flow_id: str) -> Optional[FlowData]:
         """
-        Get a flow by ID
+        Get a flow by ID.
+        Served from a short-TTL cache; flow writes invalidate the entry.
         """
-        client_data = self._get_client_for_current_loop()
+        cached = self._flow_cache.get(flow_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Single-flight: when several webhooks miss the cache for the same
+        # flow at once, only the first issues the DB read and the rest await
+        # its result instead of stampeding Mongo with identical queries
+        inflight = self._flow_fetch_futures.get(flow_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._flow_fetch_futures[flow_id] = future
+
+        flow = None
         try:
-            result = await client_data['collections']['flows'].find_one({"_id": ObjectId(flow_id)})
-            if result is None:
-                return None
-            result["id"] = str(result["_id"])
-            return FlowData.model_validate(result)
-        except Exception as e:
-            self.log_util.error(service_name="FlowDB", message=f"Error getting flow: {str(e)}")
-            return None
+            client_data = self._get_client_for_current_loop()
+            try:
+                result = await client_data['collections']['flows'].find_one({"_id": ObjectId(flow_id)})
+                if result is not None:
+                    result["id"] = str(result["_id"])
+                    flow = FlowData.model_validate(result)
+                    with self._flow_cache_lock:
+                        self._flow_cache[flow_id] = (time.monotonic() + self.flow_cache_ttl_seconds, flow)
+            except Exception as e:
+                self.log_util.error(service_name="FlowDB", message=f"Error getting flow: {str(e)}")
+            return flow
+        finally:
+            self._flow_fetch_futures.pop(flow_id, None)
+            # Resolve the shared future even if this task was cancelled so
+            # concurrent awaiters never hang; errors surface as None, the
+            # same contract the direct caller gets
+            if not future.done():
+                future.set_result(flow)
+
+    def invalidate_flow_cache(self, flow_id: Optional[str] = None) -> None:
+        """
+        Drop cached flows so the next read reflects flow writes.
+        Clears the whole cache when flow_id is not provided.
+        """
+        with self._flow_cache_lock:
+            if flow_id is None:
+                self._flow_cache.clear()
+            else:
+                self._flow_cache.pop(flow_id, None)
 
     async def get_flow_by_id(self, flow_id: str) -> Optional[FlowData]:
         """
@@ -336,6 +428,7 @@ class FlowDB:
             if result is None:
                 return None
             result["id"] = str(result["_id"])
+            self.invalidate_flow_cache(flow_id)
             return FlowData.model_validate(result)
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error updating flow: {str(e)}")
@@ -364,6 +457,9 @@ class FlowDB:
             if result is None:
                 return None
             result["id"] = str(result["_id"])
+            # Publishing/unpublishing changes which triggers are live
+            self.invalidate_trigger_cache()
+            self.invalidate_flow_cache(flow_id)
             return FlowData.model_validate(result)
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error updating flow status: {str(e)}")
@@ -481,6 +577,7 @@ class FlowDB:
             await client_data['collections']['flow_triggers'].delete_many({"flow_id": flow_id})
 
             if not triggers:
+                self.invalidate_trigger_cache()
                 return True
 
             trigger_docs = []
@@ -496,18 +593,36 @@ class FlowDB:
             if trigger_docs:
                 await client_data['collections']['flow_triggers'].insert_many(trigger_docs)
 
+            self.invalidate_trigger_cache()
             return True
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error saving flow triggers: {str(e)}")
             return False
 
+    def invalidate_trigger_cache(self, brand_id: Optional[int] = None) -> None:
+        """
+        Drop cached triggers so the next read reflects trigger/flow writes.
+        Clears the whole cache when brand_id is not provided.
+        """
+        with self._trigger_cache_lock:
+            if brand_id is None:
+                self._trigger_cache.clear()
+            else:
+                self._trigger_cache.pop(brand_id, None)
+
     async def get_flow_triggers_by_brand_id(self, brand_id: int) -> List[FlowTriggerData]:
         """
         Get all flow triggers for a brand.
         Since triggers are linked to flows, we need to:
         1. Get all flows for this brand with status="published"
         2. Get all triggers for those flows
+        Results are cached per brand for a short TTL (see trigger_cache_ttl_seconds);
+        trigger and flow-status writes invalidate the cache.
         """
+        cached = self._trigger_cache.get(brand_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         client_data = self._get_client_for_current_loop()
         try:
             # First, get all published flow IDs for this brand
@@ -518,6 +633,8 @@ class FlowDB:
                 flow_ids.append(str(flow_dict["_id"]))
             
             if not flow_ids:
+                with self._trigger_cache_lock:
+                    self._trigger_cache[brand_id] = (time.monotonic() + self.trigger_cache_ttl_seconds, [])
                 return []
             
             # Get all triggers for these published flows
@@ -526,7 +643,10 @@ class FlowDB:
             async for trigger_dict in cursor:
                 trigger_dict["id"] = str(trigger_dict["_id"])
                 triggers.append(FlowTriggerData.model_validate(trigger_dict))
-            
+
+            with self._trigger_cache_lock:
+                self._trigger_cache[brand_id] = (time.monotonic() + self.trigger_cache_ttl_seconds, triggers)
+
             return triggers
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error getting flow triggers by brand_id: {str(e)}")
@@ -539,6 +659,8 @@ class FlowDB:
         client_data = self._get_client_for_current_loop()
         try:
             result = await client_data['collections']['flows'].delete_one({"_id": ObjectId(flow_id)})
+            self.invalidate_trigger_cache()
+            self.invalidate_flow_cache(flow_id)
             return result.deleted_count > 0
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error deleting flow: {str(e)}")
@@ -597,6 +719,21 @@ class FlowDB:
             self.log_util.error(service_name="FlowDB", message=f"Error saving user data: {str(e)}")
             return None
 
+    async def update_user_lead_id(self, user_db_id: str, lead_id: str) -> bool:
+        """
+        Backfill the lead_id on an already-saved user record.
+        """
+        client_data = self._get_client_for_current_loop()
+        try:
+            result = await client_data['collections']['users'].update_one(
+                {"_id": ObjectId(user_db_id)},
+                {"$set": {"lead_id": lead_id, "updated_at": datetime.utcnow()}}
+            )
+            return result.matched_count > 0
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error updating user lead_id: {str(e)}")
+            return False
+
     async def get_user_data(self, user_identifier: str, brand_id: int, channel: str = "whatsapp", channel_account_id: Optional[str] = None) -> Optional[UserData]:
         """
         Get user data by identifier, channel, and channel_account_id.
@@ -614,12 +751,47 @@ class FlowDB:
             self.log_util.error(service_name="FlowDB", message=f"Error getting user data: {str(e)}")
             return None
 
+    async def get_users_for_delays(self, delays: List["DelayData"]) -> List[UserData]:
+        """
+        Batch-fetch the user rows behind a sweep of delay records with one
+        $or query instead of one find_one per delay. Callers map results
+        back to delays via the channel identifier on user_detail.
+        """
+        if not delays:
+            return []
+        client_data = self._get_client_for_current_loop()
+        try:
+            queries = [
+                self._build_user_query(
+                    delay.user_identifier, delay.brand_id,
+                    delay.channel, delay.channel_account_id
+                )
+                for delay in delays
+            ]
+            cursor = client_data['collections']['users'].find({"$or": queries})
+            results = []
+            async for doc in cursor:
+                doc["id"] = str(doc["_id"])
+                results.append(UserData.model_validate(doc))
+            return results
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error batch-getting users for delays: {str(e)}")
+            return []
+
     async def update_user_automation_state(self, user_identifier: str, brand_id: int, is_in_automation: bool, 
                                           current_flow_id: Optional[str] = None, current_node_id: Optional[str] = None, 
                                           channel: str = "whatsapp", channel_account_id: Optional[str] = None,
-                                          delay_node_data: Optional[Dict[str, Any]] = None) -> Optional[UserData]:
-        """
-        Update user automation state
+                                          delay_node_data: Optional[Dict[str, Any]] = None,
+                                          validation_failed: Optional[bool] = None,
+                                          failure_message: Optional[str] = None,
+                                          clear_delay_data: bool = False) -> Optional[UserData]:
+        """
+        Update user automation state.
+        When validation_failed is provided, the validation state is written in
+        the same update (failure count incremented via $inc) instead of a
+        separate update_validation_state round-trip.
+        clear_delay_data=True nulls delay_node_data in the same write, so a
+        delay-complete transition doesn't need a second clearing round-trip.
         """
         client_data = self._get_client_for_current_loop()
         try:
@@ -628,7 +800,7 @@ class FlowDB:
                 "channel": channel,
                 "updated_at": datetime.utcnow()
             }
-            
+
             if current_flow_id is not None:
                 update_dict["current_flow_id"] = current_flow_id
             if current_node_id is not None:
@@ -638,14 +810,29 @@ class FlowDB:
             if delay_node_data is not None:
                 # Save delay node data
                 update_dict["delay_node_data"] = delay_node_data
-            elif not is_in_automation:
-                # Clear delay_node_data when exiting automation
+            elif clear_delay_data or not is_in_automation:
+                # Clear delay_node_data when asked to (delay complete) or
+                # when exiting automation
                 update_dict["delay_node_data"] = None
-            
+
+            update: Dict[str, Any] = {"$set": update_dict}
+            if validation_failed is not None:
+                if validation_failed:
+                    update_dict["validation.failed"] = True
+                    update_dict["validation.failure_message"] = failure_message
+                    update["$inc"] = {"validation.failure_count": 1}
+                else:
+                    # Reset on success
+                    update_dict["validation"] = {
+                        "failed": False,
+                        "failure_count": 0,
+                        "failure_message": None
+                    }
+
             query = self._build_user_query(user_identifier, brand_id, channel, channel_account_id)
             result = await client_data['collections']['users'].find_one_and_update(
                 query,
-                {"$set": update_dict},
+                update,
                 return_document=True
             )
             if result is None:
@@ -656,53 +843,182 @@ class FlowDB:
             self.log_util.error(service_name="FlowDB", message=f"Error updating user automation state: {str(e)}")
             return None
 
-    async def update_validation_state(self, user_identifier: str, brand_id: int, validation_failed: bool, 
+    async def update_user_delay_state(self, user_identifier: str, brand_id: int, flow_id: Optional[str],
+                                      delay_node_id: Optional[str] = None,
+                                      delay_node_data: Optional[Dict[str, Any]] = None,
+                                      clear_delay_data: bool = False, channel: str = "whatsapp",
+                                      channel_account_id: Optional[str] = None,
+                                      validation_failed: Optional[bool] = None,
+                                      failure_message: Optional[str] = None) -> Optional[UserData]:
+        """
+        Update user state for a delay node transition in one round-trip.
+        Saving puts the user in automation at the delay node with the node data.
+        Clearing uses a conditional aggregation-pipeline update so an automation
+        exit that happened meanwhile is preserved server-side, instead of a
+        separate read followed by a write.
+        When validation_failed is provided, the validation state is folded into
+        the same $set (failure count incremented server-side) instead of a
+        separate update_validation_state round-trip.
+        """
+        client_data = self._get_client_for_current_loop()
+        try:
+            now = datetime.utcnow()
+            if clear_delay_data:
+                # Only the clear branch uses pipeline form - it needs $cond.
+                # Values that aren't server-side expressions must be wrapped
+                # in $literal here, or strings starting with "$" would be
+                # evaluated as field paths
+                set_stage: Dict[str, Any] = {
+                    "channel": channel,
+                    "updated_at": now,
+                    # Keep the flow id while the user is still in automation;
+                    # leave state untouched after an exit
+                    "current_flow_id": {"$cond": ["$is_in_automation", flow_id, "$current_flow_id"]},
+                    # Delay data is cleared regardless of automation state - a
+                    # stale entry would make the next message look like a
+                    # delay interrupt
+                    "delay_node_data": None
+                }
+                if channel_account_id is not None:
+                    set_stage["channel_account_id"] = channel_account_id
+                if validation_failed is not None:
+                    if validation_failed:
+                        set_stage["validation"] = {
+                            "failed": True,
+                            "failure_count": {"$add": [{"$ifNull": ["$validation.failure_count", 0]}, 1]},
+                            # Flow-configured, user-facing text - wrap it so a
+                            # message starting with "$" isn't read as a path
+                            "failure_message": {"$literal": failure_message}
+                        }
+                    else:
+                        set_stage["validation"] = {
+                            "failed": False,
+                            "failure_count": 0,
+                            "failure_message": None
+                        }
+                update: Any = [{"$set": set_stage}]
+            else:
+                # The save branch embeds delay_node_data, a model_dump of a
+                # frontend-authored node (extra='allow'), so it must be a
+                # plain update - in pipeline form any nested "$"-prefixed
+                # value or key would be evaluated or abort the write
+                set_fields: Dict[str, Any] = {
+                    "is_in_automation": True,
+                    "channel": channel,
+                    "updated_at": now,
+                    "current_flow_id": flow_id,
+                    "current_node_id": delay_node_id,
+                    "delay_node_data": delay_node_data
+                }
+                if channel_account_id is not None:
+                    set_fields["channel_account_id"] = channel_account_id
+                update = {"$set": set_fields}
+                if validation_failed is not None:
+                    if validation_failed:
+                        set_fields["validation.failed"] = True
+                        set_fields["validation.failure_message"] = failure_message
+                        update["$inc"] = {"validation.failure_count": 1}
+                    else:
+                        set_fields["validation"] = {
+                            "failed": False,
+                            "failure_count": 0,
+                            "failure_message": None
+                        }
+
+            query = self._build_user_query(user_identifier, brand_id, channel, channel_account_id)
+            result = await client_data['collections']['users'].find_one_and_update(
+                query,
+                update,
+                return_document=True
+            )
+            if result is None:
+                return None
+            result["id"] = str(result["_id"])
+            return UserData.model_validate(result)
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error updating user delay state: {str(e)}")
+            return None
+
+    async def bulk_update_user_automation_state(self, user_identifiers: List[str], brand_id: int,
+                                                flow_id: str, trigger_node_id: str,
+                                                channel: str = "whatsapp") -> int:
+        """
+        Put many users into automation at a trigger node with batched bulk_write
+        calls instead of one round-trip per user (used by scheduled broadcasts).
+        Uses ordered=False so one bad document doesn't abort the batch.
+        Returns the number of users that were matched and updated.
+        """
+        client_data = self._get_client_for_current_loop()
+        try:
+            now = datetime.utcnow()
+            operations = []
+            for user_identifier in user_identifiers:
+                query = self._build_user_query(user_identifier, brand_id, channel)
+                operations.append(UpdateOne(query, {
+                    "$set": {
+                        "is_in_automation": True,
+                        "current_flow_id": flow_id,
+                        "current_node_id": trigger_node_id,
+                        "channel": channel,
+                        "updated_at": now
+                    }
+                }))
+
+            if not operations:
+                return 0
+
+            # Batch to keep individual bulk_write payloads bounded
+            batch_size = 1000
+            matched_count = 0
+            for start in range(0, len(operations), batch_size):
+                result = await client_data['collections']['users'].bulk_write(
+                    operations[start:start + batch_size],
+                    ordered=False
+                )
+                matched_count += result.matched_count
+
+            return matched_count
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error bulk updating user automation state: {str(e)}")
+            return 0
+
+    async def update_validation_state(self, user_identifier: str, brand_id: int, validation_failed: bool,
                                      failure_message: Optional[str] = None, channel: str = "whatsapp", 
                                      channel_account_id: Optional[str] = None) -> Optional[UserData]:
         """
-        Update user validation state
+        Update user validation state in a single round-trip and return the
+        updated row. Failure counts are incremented server-side via $inc, so
+        no pre-read of the current state is needed.
         """
         client_data = self._get_client_for_current_loop()
         try:
-            # Get current user to access validation state
-            current_user = await self.get_user_data(user_identifier, brand_id, channel, channel_account_id)
-            if not current_user:
-                return None
-            
-            # Import ValidationData here to avoid circular imports
-            from models.validation_data import ValidationData
-            
+            update_dict: Dict[str, Any] = {
+                "channel": channel,
+                "updated_at": datetime.utcnow()
+            }
+            if channel_account_id is not None:
+                update_dict["channel_account_id"] = channel_account_id
+
+            update: Dict[str, Any] = {"$set": update_dict}
             if validation_failed:
-                # Increment failure count
-                new_validation = ValidationData(
-                    failed=True,
-                    failure_count=current_user.validation.failure_count + 1,
-                    failure_message=failure_message
-                )
+                update_dict["validation.failed"] = True
+                update_dict["validation.failure_message"] = failure_message
+                update["$inc"] = {"validation.failure_count": 1}
             else:
                 # Reset on success
-                new_validation = ValidationData(
-                    failed=False,
-                    failure_count=0,
-                    failure_message=None
-                )
-            
-            # Update validation object
+                update_dict["validation"] = {
+                    "failed": False,
+                    "failure_count": 0,
+                    "failure_message": None
+                }
+
             query = self._build_user_query(user_identifier, brand_id, channel, channel_account_id)
-            update_dict = {
-                        "validation": new_validation.model_dump(),
-                "channel": channel,
-                        "updated_at": datetime.utcnow()
-                    }
-            if channel_account_id is not None:
-                update_dict["channel_account_id"] = channel_account_id
-            
             result = await client_data['collections']['users'].find_one_and_update(
                 query,
-                {"$set": update_dict},
+                update,
                 return_document=True
             )
-            
+
             if result is None:
                 return None
             result["id"] = str(result["_id"])
@@ -878,18 +1194,58 @@ class FlowDB:
     async def get_node_detail_by_id(self, node_id: str) -> Optional[NodeDetailData]:
         """
         Get node detail by node_id (e.g., "trigger-keyword", "message", etc.)
+        Served from a TTL cache; node-detail writes invalidate the entry.
         """
+        cached = self._node_detail_cache.get(node_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
         client_data = self._get_client_for_current_loop()
         try:
             result = await client_data['collections']['node_details'].find_one({"node_id": node_id})
             if result is None:
                 return None
             result["id"] = str(result["_id"])
-            return NodeDetailData.model_validate(result)
+            node_detail = NodeDetailData.model_validate(result)
+            with self._node_detail_cache_lock:
+                self._node_detail_cache[node_id] = (
+                    time.monotonic() + self.node_detail_cache_ttl_seconds, node_detail
+                )
+            return node_detail
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error getting node detail: {str(e)}")
             return None
 
+    async def preload_node_details(self) -> int:
+        """
+        Warm the node-detail cache with every node-type definition in one
+        query. Called at startup so the first webhooks after a deploy don't
+        each pay a find_one for their node-type lookups.
+        Returns the number of entries loaded; failures leave the cache to
+        fill lazily.
+        """
+        try:
+            node_details = await self.get_all_node_details()
+            expires_at = time.monotonic() + self.node_detail_cache_ttl_seconds
+            with self._node_detail_cache_lock:
+                for node_detail in node_details:
+                    self._node_detail_cache[node_detail.node_id] = (expires_at, node_detail)
+            return len(node_details)
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error preloading node details: {str(e)}")
+            return 0
+
+    def invalidate_node_detail_cache(self, node_id: Optional[str] = None) -> None:
+        """
+        Drop cached node details so the next read reflects node-detail writes.
+        Clears the whole cache when node_id is not provided.
+        """
+        with self._node_detail_cache_lock:
+            if node_id is None:
+                self._node_detail_cache.clear()
+            else:
+                self._node_detail_cache.pop(node_id, None)
+
     async def get_all_node_details(self) -> List[NodeDetailData]:
         """
         Get all node details
@@ -938,6 +1294,7 @@ class FlowDB:
             if result is None:
                 return None
             result["id"] = str(result["_id"])
+            self.invalidate_node_detail_cache(node_id)
             return NodeDetailData.model_validate(result)
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error updating node detail: {str(e)}")
@@ -950,6 +1307,7 @@ class FlowDB:
         client_data = self._get_client_for_current_loop()
         try:
             result = await client_data['collections']['node_details'].delete_one({"node_id": node_id})
+            self.invalidate_node_detail_cache(node_id)
             return result.deleted_count > 0
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error deleting node detail: {str(e)}")
@@ -983,6 +1341,7 @@ class FlowDB:
             
             if result:
                 result["id"] = str(result["_id"])
+                self.invalidate_node_detail_cache(node_detail.node_id)
                 return NodeDetailData.model_validate(result)
             return None
         except Exception as e:
@@ -1049,7 +1408,66 @@ class FlowDB:
             self.log_util.error(service_name="FlowDB", message=f"Error getting transaction counts by node: {str(e)}")
             return {}
     
+    async def ensure_indexes(self) -> None:
+        """
+        Create the indexes the hot paths rely on (idempotent, called at startup).
+        The delays lookup index is partial on processed: False so pending-delay
+        cancellation is an index seek over only outstanding records.
+        """
+        client_data = self._get_client_for_current_loop()
+        try:
+            await client_data['collections']['delays'].create_index(
+                [("user_identifier", 1), ("brand_id", 1), ("flow_id", 1),
+                 ("delay_node_id", 1), ("processed", 1)],
+                partialFilterExpression={"processed": False},
+                name="pending_delay_lookup"
+            )
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error ensuring indexes: {str(e)}")
+
     # Delay CRUD operations
+    async def save_delay_batched(self, delay: "DelayData") -> Optional["DelayData"]:
+        """
+        Queue a delay record and flush the pending batch shortly after with one
+        insert_many, so bursts of delay saves (broadcast flows) share a single
+        round-trip instead of paying one insert each.
+        The id is assigned client-side so callers get it back immediately.
+        """
+        from models.delay_data import DelayData
+
+        try:
+            delay_dict = delay.model_dump(exclude={"id"})
+            delay_dict["_id"] = ObjectId()
+            self._delay_batch.append(delay_dict)
+            if self._delay_flush_task is None or self._delay_flush_task.done():
+                self._delay_flush_task = asyncio.get_running_loop().create_task(
+                    self._flush_delay_batch()
+                )
+            # Build the return value from a copy - the batch holds a reference
+            # to delay_dict, and adding "id" to it would persist a redundant
+            # string id field alongside _id at flush time
+            return DelayData.model_validate({**delay_dict, "id": str(delay_dict["_id"])})
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error queueing delay: {str(e)}")
+            return None
+
+    async def _flush_delay_batch(self) -> None:
+        """
+        Flush the pending delay batch after a short coalescing window.
+        Saves that land while an insert_many is in flight append to the fresh
+        batch without scheduling a new flush task (this one isn't done yet),
+        so the loop keeps draining until the buffer is empty at exit - a
+        record can't be stranded waiting for some later save to reschedule.
+        """
+        await asyncio.sleep(self.delay_batch_flush_seconds)
+        while self._delay_batch:
+            docs, self._delay_batch = self._delay_batch, []
+            client_data = self._get_client_for_current_loop()
+            try:
+                await client_data['collections']['delays'].insert_many(docs, ordered=False)
+            except Exception as e:
+                self.log_util.error(service_name="FlowDB", message=f"Error flushing delay batch of {len(docs)}: {str(e)}")
+
     async def save_delay(self, delay: "DelayData") -> Optional["DelayData"]:
         """
         Save a delay record to the database.
@@ -1127,7 +1545,37 @@ class FlowDB:
         except Exception as e:
             self.log_util.error(service_name="FlowDB", message=f"Error marking delay as processed: {str(e)}")
             return False
-    
+
+    async def mark_delays_as_processed(self, delay_ids: List[str]) -> int:
+        """
+        Mark a batch of delays as processed in one update_many, amortizing
+        the round-trip across a sweep instead of paying it per delay.
+
+        Args:
+            delay_ids: Delay record IDs
+
+        Returns:
+            Number of delay records updated
+        """
+        if not delay_ids:
+            return 0
+        client_data = self._get_client_for_current_loop()
+        try:
+            from bson import ObjectId
+            result = await client_data['collections']['delays'].update_many(
+                {"_id": {"$in": [ObjectId(delay_id) for delay_id in delay_ids]}},
+                {
+                    "$set": {
+                        "processed": True,
+                        "updated_at": datetime.utcnow()
+                    }
+                }
+            )
+            return result.modified_count
+        except Exception as e:
+            self.log_util.error(service_name="FlowDB", message=f"Error batch-marking delays as processed: {str(e)}")
+            return 0
+
     # Flow Settings CRUD operations
     async def save_flow_settings(self, flow_settings: "FlowSettingsData") -> Optional["FlowSettingsData"]:
         """
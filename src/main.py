@@ -1,9 +1,28 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
+# Use uvloop for the event loop when available (faster I/O scheduling)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    uvloop = None
+
+# Serialize responses with orjson when available (faster than stdlib json,
+# handles datetimes natively); falls back to the default JSONResponse.
+# ORJSONResponse imports fine without orjson but fails at render time,
+# so the guard checks for orjson itself
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponseClass
+except ImportError:
+    DefaultResponseClass = JSONResponse
+
 # Utils
 from utils.log_utils import LogUtil
 from utils.environment_utils import EnvironmentUtils
@@ -141,7 +160,20 @@ delay_scheduler_service = DelaySchedulerService(
 async def lifespan(app: FastAPI):
     # Startup
     log_util.info(service_name="FlowService", message="Application startup complete")
-    
+
+    # Record which loop implementation actually won so a deploy that lost
+    # uvloop (missing wheel, wrong image) is visible in the logs
+    loop_impl = type(asyncio.get_running_loop()).__module__
+    log_util.info(service_name="FlowService", message=f"Event loop implementation: {loop_impl}")
+
+    # Ensure hot-path indexes exist (idempotent)
+    await flow_db.ensure_indexes()
+
+    # Warm the node-detail cache so the first webhooks after a deploy
+    # don't each pay a lookup for node-type metadata
+    preloaded = await flow_db.preload_node_details()
+    log_util.info(service_name="FlowService", message=f"Preloaded {preloaded} node details into cache")
+
     # Start delay scheduler
     await delay_scheduler_service.start()
     log_util.info(service_name="FlowService", message="Delay scheduler started")
@@ -152,8 +184,12 @@ async def lifespan(app: FastAPI):
     # Stop delay scheduler
     await delay_scheduler_service.stop()
     log_util.info(service_name="FlowService", message="Delay scheduler stopped")
-    
-    flow_db.close()
+
+    # Close shared HTTP clients
+    await whatsapp_flow_service.aclose()
+
+
+    await flow_db.aclose()
     log_util.info(service_name="FlowService", message="Application shutdown complete")
 
 # Create FastAPI app
@@ -161,7 +197,8 @@ app = FastAPI(
     title="xpulse flow service",
     description="Generic flow automation service for multi-channel messaging",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponseClass
 )
 
 # Configure CORS
@@ -2,6 +2,47 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+# Suffix convention for delay branch result ids: a delay node's delayResult
+# entries are "<node_id>__interrupted" / "<node_id>__not_interrupted".
+# endswith against these beats a substring scan: it fails on the last
+# character for non-matching ids instead of walking the whole string
+INTERRUPTED_SUFFIX = "__interrupted"
+NOT_INTERRUPTED_SUFFIX = "__not_interrupted"
+
+
+class DelayNodeView:
+    """
+    Lightweight read view over a stored delay_node_data dict.
+    The delay hot paths touch the same handful of fields on every inbound
+    message; slot attribute loads replace the repeated dict lookups, and the
+    interrupted/not-interrupted result ids are resolved once on construction.
+    """
+    __slots__ = ("id", "delay_interrupt", "delay_result", "delay_duration",
+                 "delay_unit", "wait_time_seconds", "interrupted_id",
+                 "not_interrupted_id")
+
+    def __init__(self, delay_node_data: Dict[str, Any]):
+        self.id = delay_node_data.get("id")
+        self.delay_interrupt = delay_node_data.get("delayInterrupt", False)
+        self.delay_result = delay_node_data.get("delayResult")
+        self.delay_duration = delay_node_data.get("delayDuration", 0)
+        self.delay_unit = delay_node_data.get("delayUnit", "minutes")
+        self.wait_time_seconds = delay_node_data.get("wait_time_seconds", 0)
+        # Prefer the ids tagged at save time; fall back to scanning delayResult
+        # for delay data persisted before tagging existed
+        interrupted_id = delay_node_data.get("_interrupted_id")
+        not_interrupted_id = delay_node_data.get("_not_interrupted_id")
+        if not interrupted_id and not not_interrupted_id:
+            for item in self.delay_result or []:
+                if isinstance(item, dict):
+                    item_id = item.get("id", "")
+                    if item_id.endswith(NOT_INTERRUPTED_SUFFIX):
+                        not_interrupted_id = item_id
+                    elif item_id.endswith(INTERRUPTED_SUFFIX):
+                        interrupted_id = item_id
+        self.interrupted_id = interrupted_id
+        self.not_interrupted_id = not_interrupted_id
+
 
 class DelayData(BaseModel):
     """
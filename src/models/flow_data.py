@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, Discriminator, ConfigDict
+from pydantic import BaseModel, Field, Discriminator, ConfigDict, model_validator
 from typing import Optional, List, Dict, Any, Union, Literal, Annotated
 from datetime import datetime
 
@@ -112,6 +112,8 @@ class DelayResultItem(BaseModel):
     isDefault: bool
     nodeResultId: str
 
+_DELAY_UNIT_SECONDS = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+
 class DelayNode(BaseFlowNode):
     type: Literal["delay"]
     delayDuration: int  # Duration in seconds
@@ -119,6 +121,17 @@ class DelayNode(BaseFlowNode):
     waitForReply: Optional[bool] = False  # If true, wait for reply; if false, proceed after delay
     delayInterrupt: Optional[bool] = False  # If true, delay can be interrupted by user reply
     delayResult: Optional[List[DelayResultItem]] = None  # Array format from frontend
+    wait_time_seconds: int = 0  # Precomputed total wait time (set at save/validation time)
+
+    @model_validator(mode="after")
+    def _compute_wait_time_seconds(self):
+        # Precompute the total wait once when the flow is saved/validated so
+        # the delay runtime path reads a stored value instead of recomputing
+        # duration * unit on every message (consumers keep an == 0 fallback
+        # for flows persisted before this field existed)
+        if self.wait_time_seconds == 0:
+            self.wait_time_seconds = self.delayDuration * _DELAY_UNIT_SECONDS.get(self.delayUnit, 0)
+        return self
 
 # Send Template Node
 class TemplateHeaderValue(BaseModel):
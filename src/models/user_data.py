@@ -23,3 +23,16 @@ class UserData(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @property
+    def validation_failure_count(self) -> int:
+        """
+        Current validation failure count, normalized here so callers don't
+        re-probe whether validation is a dict or a ValidationData object.
+        """
+        validation = self.validation
+        if not validation:
+            return 0
+        if isinstance(validation, dict):
+            return validation.get("failure_count", 0)
+        return getattr(validation, "failure_count", 0)
+
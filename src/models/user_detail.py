@@ -13,7 +13,20 @@ class UserDetail(BaseModel):
     facebook_user_id: Optional[str] = Field(default=None, description="Facebook user ID (for Facebook)")
     telegram_user_id: Optional[str] = Field(default=None, description="Telegram user ID (for Telegram)")
     custom_identifier: Optional[str] = Field(default=None, description="Custom identifier for other channels")
-    
+
+    def as_dict(self) -> dict:
+        """
+        Return the model_dump of this detail, cached on the instance.
+        The detail is dumped at several points while handling one webhook
+        (node service payloads, state updates); caching avoids re-walking
+        the model each time. The cache is dropped when an identifier is set.
+        """
+        cached = getattr(self, "_as_dict_cache", None)
+        if cached is None:
+            cached = self.model_dump()
+            object.__setattr__(self, "_as_dict_cache", cached)
+        return cached
+
     def get_identifier(self, channel: str) -> Optional[str]:
         """
         Get the appropriate identifier based on the channel.
@@ -39,6 +52,9 @@ class UserDetail(BaseModel):
         """
         Set the appropriate identifier based on the channel.
         """
+        # Identifier changed; drop the cached dump so as_dict rebuilds it
+        if getattr(self, "_as_dict_cache", None) is not None:
+            object.__setattr__(self, "_as_dict_cache", None)
         channel_lower = channel.lower()
         
         if channel_lower == "whatsapp" or channel_lower == "sms":
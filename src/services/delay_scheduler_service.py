@@ -3,6 +3,7 @@ Delay Scheduler Service
 Background service that monitors delay records and triggers delay_complete webhooks.
 """
 import asyncio
+import traceback
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from datetime import datetime
 from utils.log_utils import LogUtil
@@ -25,12 +26,17 @@ class DelaySchedulerService:
         log_util: LogUtil,
         flow_db: FlowDB,
         webhook_service: Optional["WebhookService"] = None,
-        check_interval_seconds: int = 60
+        check_interval_seconds: int = 60,
+        max_concurrent_delays: int = 16
     ):
         self.log_util = log_util
         self.flow_db = flow_db
         self.webhook_service = webhook_service
         self.check_interval_seconds = check_interval_seconds
+        # Upper bound on delays processed concurrently per sweep; delays for
+        # different users are independent, so the sweep fans out instead of
+        # paying each webhook's full processing latency in sequence
+        self.max_concurrent_delays = max_concurrent_delays
         self._running = False
         self._task = None
     
@@ -83,7 +89,6 @@ class DelaySchedulerService:
                     service_name="DelaySchedulerService",
                     message=f"Error in scheduler loop: {str(e)}"
                 )
-                import traceback
                 self.log_util.error(
                     service_name="DelaySchedulerService",
                     message=f"Traceback: {traceback.format_exc()}"
@@ -107,25 +112,52 @@ class DelaySchedulerService:
                 message=f"Found {len(pending_delays)} expired delay(s) to process"
             )
             
-            for delay in pending_delays:
-                try:
-                    await self._trigger_delay_complete_webhook(delay)
-                    # Mark delay as processed
-                    await self.flow_db.mark_delay_as_processed(delay.id)
-                    self.log_util.info(
-                        service_name="DelaySchedulerService",
-                        message=f"Delay {delay.id} processed and marked as complete for user {delay.user_identifier}"
-                    )
-                except Exception as e:
-                    self.log_util.error(
-                        service_name="DelaySchedulerService",
-                        message=f"Error processing delay {delay.id}: {str(e)}"
-                    )
-                    import traceback
-                    self.log_util.error(
-                        service_name="DelaySchedulerService",
-                        message=f"Traceback: {traceback.format_exc()}"
-                    )
+            # Expired delays arrive in time-correlated bursts, so the sweep
+            # amortizes its I/O across the batch: one $or query fetches every
+            # user row up front (instead of a find_one per delay) and one
+            # update_many marks the successful delays afterwards (instead of
+            # an update_one per delay)
+            users = await self.flow_db.get_users_for_delays(pending_delays)
+            users_by_key = {}
+            for user_data in users:
+                identifier = user_data.user_detail.get_identifier(user_data.channel) if user_data.user_detail else None
+                if identifier:
+                    users_by_key[(identifier, user_data.brand_id, user_data.channel_account_id)] = user_data
+
+            # Process the batch concurrently (bounded by a semaphore) instead
+            # of paying each webhook's full processing latency in sequence.
+            # Per-delay failures stay isolated, exactly as with the old
+            # serial loop: a delay is only marked processed if its webhook
+            # trigger completed without raising
+            semaphore = asyncio.Semaphore(self.max_concurrent_delays)
+
+            async def _process_one(delay):
+                async with semaphore:
+                    try:
+                        user_data = users_by_key.get(
+                            (delay.user_identifier, delay.brand_id, delay.channel_account_id)
+                        )
+                        await self._trigger_delay_complete_webhook(delay, user_data)
+                        return delay.id
+                    except Exception as e:
+                        self.log_util.error(
+                            service_name="DelaySchedulerService",
+                            message=f"Error processing delay {delay.id}: {str(e)}"
+                        )
+                        self.log_util.error(
+                            service_name="DelaySchedulerService",
+                            message=f"Traceback: {traceback.format_exc()}"
+                        )
+                        return None
+
+            results = await asyncio.gather(*(_process_one(delay) for delay in pending_delays))
+            processed_ids = [delay_id for delay_id in results if delay_id]
+            if processed_ids:
+                marked = await self.flow_db.mark_delays_as_processed(processed_ids)
+                self.log_util.info(
+                    service_name="DelaySchedulerService",
+                    message=f"Processed {len(processed_ids)}/{len(pending_delays)} delay(s), marked {marked} as complete"
+                )
         
         except Exception as e:
             self.log_util.error(
@@ -133,12 +165,14 @@ class DelaySchedulerService:
                 message=f"Error getting pending delays: {str(e)}"
             )
     
-    async def _trigger_delay_complete_webhook(self, delay):
+    async def _trigger_delay_complete_webhook(self, delay, user_data=None):
         """
         Trigger delay_complete webhook for a delay record.
-        
+
         Args:
             delay: DelayData object
+            user_data: Pre-fetched UserData for this delay (from the sweep's
+                batched lookup); fetched individually when not provided
         """
         if not self.webhook_service:
             self.log_util.error(
@@ -146,15 +180,17 @@ class DelaySchedulerService:
                 message="WebhookService not initialized, cannot trigger delay_complete webhook"
             )
             return
-        
-        # Get user data to get user_id
-        user_data = await self.flow_db.get_user_data(
-            user_identifier=delay.user_identifier,
-            brand_id=delay.brand_id,
-            channel=delay.channel,
-            channel_account_id=delay.channel_account_id
-        )
-        
+
+        # Get user data to get user_id (only when the caller didn't already
+        # batch-fetch it)
+        if user_data is None:
+            user_data = await self.flow_db.get_user_data(
+                user_identifier=delay.user_identifier,
+                brand_id=delay.brand_id,
+                channel=delay.channel,
+                channel_account_id=delay.channel_account_id
+            )
+
         if not user_data:
             self.log_util.warning(
                 service_name="DelaySchedulerService",
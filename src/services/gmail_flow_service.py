@@ -1,4 +1,5 @@
 from typing import Optional, Dict, Any
+import traceback
 import httpx
 import os
 
@@ -183,7 +184,6 @@ class GmailFlowService:
                 service_name="GmailFlowService",
                 message=f"[SEND_EMAIL_TEMPLATE] Error calling email service API: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="GmailFlowService",
                 message=f"[SEND_EMAIL_TEMPLATE] Traceback: {traceback.format_exc()}"
@@ -288,7 +288,6 @@ class GmailFlowService:
                 service_name="GmailFlowService",
                 message=f"[PROCESS_EMAIL_TEMPLATE_NODE] Error processing email template node: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="GmailFlowService",
                 message=f"[PROCESS_EMAIL_TEMPLATE_NODE] Traceback: {traceback.format_exc()}"
@@ -3,6 +3,7 @@ Lead Management Service
 Handles integration with lead management service for user/lead creation and lookup.
 """
 from typing import Optional, Dict, Any
+import traceback
 import httpx
 
 from utils.log_utils import LogUtil
@@ -127,7 +128,6 @@ class LeadManagementService:
                 service_name="LeadManagementService",
                 message=f"Error in get_or_create_lead: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="LeadManagementService",
                 message=f"Traceback: {traceback.format_exc()}"
@@ -309,7 +309,6 @@ class LeadManagementService:
                 service_name="LeadManagementService",
                 message=f"Error creating new user: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="LeadManagementService",
                 message=f"Traceback: {traceback.format_exc()}"
@@ -3,7 +3,9 @@ Node Identification and Processing Service
 Handles node identification, reply matching, validation, and node processing.
 Refactored from UserStateService to separate concerns.
 """
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, List, Callable, TYPE_CHECKING
+import traceback
 from utils.log_utils import LogUtil
 from database.flow_db import FlowDB
 from models.flow_data import FlowData
@@ -17,12 +19,51 @@ if TYPE_CHECKING:
     from services.user_transaction_service import UserTransactionService
 
 
+def _node_to_dict(node: Any) -> Dict[str, Any]:
+    """
+    Convert a flow node to a plain dict, memoizing the model_dump result on
+    the node instance. Nodes live inside cached FlowData documents, so each
+    node is dumped at most once per cached flow, and only for the node a
+    lookup actually matched.
+    """
+    if isinstance(node, dict):
+        return node
+    if hasattr(node, "model_dump"):
+        cached = getattr(node, "_node_dict_cache", None)
+        if cached is None:
+            cached = node.model_dump()
+            object.__setattr__(node, "_node_dict_cache", cached)
+        return cached
+    return dict(node)
+
+
+@dataclass(slots=True)
+class _FlowIndex:
+    """
+    Cached per-flow-version lookup structures.
+    identify_and_process_node resolves nodes and edges several times per
+    message (current node, retry node, next node, edge from source); the
+    index turns each of those scans into one dict lookup and is rebuilt
+    only when the flow's updated_at changes.
+    """
+    version: Any
+    # {node_id: node_dict} - nodes dumped to dicts once per flow version
+    nodes_by_id: Dict[str, Dict[str, Any]]
+    # Edge list as fetched, for callers that still take the full list
+    edges: List[Any]
+    # {source_node_id: first edge from that source} - matches the order the
+    # old linear scan would have found
+    edges_by_source: Dict[str, Any]
+    # Node ids with at least one outgoing edge (includes button answer ids)
+    source_ids: set
+
+
 class NodeIdentificationService:
     """
     Service for identifying next nodes in a flow and processing them.
     Handles reply matching, validation, mismatch handling, and node processing.
     """
-    
+
     def __init__(
         self,
         log_util: LogUtil,
@@ -38,7 +79,43 @@ class NodeIdentificationService:
         self.gmail_flow_service = gmail_flow_service
         self.process_internal_node_service = process_internal_node_service
         self.user_transaction_service = user_transaction_service
-    
+        # {flow_id: _FlowIndex} - per-flow-version lookup structures; stale
+        # versions are replaced in place, and the whole map is cleared when
+        # it grows past the bound
+        self._flow_index_cache: Dict[str, _FlowIndex] = {}
+
+    async def _get_flow_index(self, flow: FlowData) -> _FlowIndex:
+        """
+        Get (or build) the cached lookup index for a flow version.
+        The edge fetch is folded into the build, so repeat messages on the
+        same flow skip both the edge round-trip and the node scans.
+        """
+        index = self._flow_index_cache.get(flow.id)
+        if index is not None and index.version == flow.updated_at:
+            return index
+        edges = await self.flow_db.get_flow_edges(flow.id)
+        nodes_by_id: Dict[str, Dict[str, Any]] = {}
+        for node in flow.flowNodes:
+            node_dict = _node_to_dict(node)
+            node_id = node_dict.get("id")
+            if node_id:
+                nodes_by_id[node_id] = node_dict
+        edges_by_source: Dict[str, Any] = {}
+        for edge in edges:
+            # First edge per source wins, matching the old scan order
+            edges_by_source.setdefault(edge.source_node_id, edge)
+        index = _FlowIndex(
+            version=flow.updated_at,
+            nodes_by_id=nodes_by_id,
+            edges=edges,
+            edges_by_source=edges_by_source,
+            source_ids=set(edges_by_source)
+        )
+        if len(self._flow_index_cache) >= 128:
+            self._flow_index_cache.clear()
+        self._flow_index_cache[flow.id] = index
+        return index
+
     async def identify_and_process_node(
         self,
         metadata: WebhookMetadata,
@@ -76,13 +153,6 @@ class NodeIdentificationService:
         Returns:
             Dict with status ("success" or "error"), message, next_node_id
         """
-        def _node_to_dict(node: Any) -> Dict[str, Any]:
-            if hasattr(node, "model_dump"):
-                return node.model_dump()
-            if isinstance(node, dict):
-                return node
-            return dict(node)
-
         try:
             # Extract values from metadata
             user_identifier = metadata.sender
@@ -105,8 +175,10 @@ class NodeIdentificationService:
                     "next_node_id": None
                 }
             
-            # STEP 3: Get edges
-            edges = await self.flow_db.get_flow_edges(flow_id)
+            # STEP 3: Get edges (served from the per-flow-version index; the
+            # DB round-trip only happens when the flow version changed)
+            index = await self._get_flow_index(flow)
+            edges = index.edges
             if not edges:
                 return {
                     "status": "error",
@@ -121,10 +193,7 @@ class NodeIdentificationService:
             
             # First check if current_node_id is a button answer ID by checking edges
             # Button answer IDs are source_node_ids in edges but not nodes in flowNodes
-            source_node_ids_in_edges = {edge.source_node_id for edge in edges}
-            node_ids_in_flow = {_node_to_dict(node).get("id") for node in flow.flowNodes}
-            
-            if current_node_id in source_node_ids_in_edges and current_node_id not in node_ids_in_flow:
+            if current_node_id in index.source_ids and current_node_id not in index.nodes_by_id:
                 # current_node_id is a button answer ID, not a node
                 is_button_answer_id = True
                 self.log_util.info(
@@ -132,12 +201,7 @@ class NodeIdentificationService:
                     message=f"[IDENTIFY_NODE] current_node_id={current_node_id} is a button answer ID, not a node. Skipping node lookup."
                 )
             else:
-                # Try to find it as a node
-                for node in flow.flowNodes:
-                    node_dict = _node_to_dict(node)
-                    if node_dict.get("id") == current_node_id:
-                        current_node = node_dict
-                        break
+                current_node = index.nodes_by_id.get(current_node_id)
             
             if not current_node:
                 self.log_util.warning(
@@ -164,12 +228,8 @@ class NodeIdentificationService:
                     )
                     
                     # Get node data for the node to retry
-                    for node in flow.flowNodes:
-                        node_dict = _node_to_dict(node)
-                        if node_dict.get("id") == next_node_id:
-                            next_node_data = node_dict
-                            break
-                    
+                    next_node_data = index.nodes_by_id.get(next_node_id)
+
                     if not next_node_data:
                         return {
                             "status": "error",
@@ -194,12 +254,8 @@ class NodeIdentificationService:
                 )
                 
                 # Get node data for the node to process
-                for node in flow.flowNodes:
-                    node_dict = _node_to_dict(node)
-                    if node_dict.get("id") == next_node_id:
-                        next_node_data = node_dict
-                        break
-                
+                next_node_data = index.nodes_by_id.get(next_node_id)
+
                 if not next_node_data:
                     return {
                         "status": "error",
@@ -211,41 +267,29 @@ class NodeIdentificationService:
                 # Determine source_node_id to use for edge lookup
                 source_node_id_to_use = None
                 
-                # Check if matched_answer_id is in data
+                # Check if matched_answer_id is in data; a button answer ID
+                # takes precedence over the current node as edge source
                 matched_answer_id = data.get("matched_answer_id")
-                if matched_answer_id:
-                    # Use matched_answer_id as source_node_id (button answer ID)
-                    source_node_id_to_use = matched_answer_id
-                    self.log_util.info(
-                        service_name="NodeIdentificationService",
-                        message=f"[IDENTIFY_NODE] Using matched_answer_id from data as source_node_id: {source_node_id_to_use}"
-                    )
-                else:
-                    # Use current_node_id as source_node_id
-                    source_node_id_to_use = current_node_id
+                source_node_id_to_use = matched_answer_id or current_node_id
+
+                # Find next node from edges using source_node_id; one summary
+                # line records the whole lookup instead of a play-by-play
+                next_edge = index.edges_by_source.get(source_node_id_to_use)
+                if next_edge is not None:
+                    next_node_id = next_edge.target_node_id
                     self.log_util.info(
-                        service_name="NodeIdentificationService",
-                        message=f"[IDENTIFY_NODE] Using current_node_id as source_node_id: {source_node_id_to_use}"
+                        "NodeIdentificationService",
+                        "[IDENTIFY_NODE] Edge lookup: source=%s (%s) -> %s",
+                        source_node_id_to_use,
+                        "matched_answer_id" if matched_answer_id else "current_node_id",
+                        next_node_id
                     )
-                
-                # Find next node from edges using source_node_id
-                self.log_util.info(
-                    service_name="NodeIdentificationService",
-                    message=f"[IDENTIFY_NODE] Looking for edge with source_node_id={source_node_id_to_use} in {len(edges)} edges"
-                )
-                for edge in edges:
-                    if edge.source_node_id == source_node_id_to_use:
-                        next_node_id = edge.target_node_id
-                        self.log_util.info(
-                            service_name="NodeIdentificationService",
-                            message=f"[IDENTIFY_NODE] ✅ Found edge: {source_node_id_to_use} -> {next_node_id}"
-                        )
-                        break
-                
+
                 if not next_node_id:
+                    # The full source-id dump is only worth building on failure
                     self.log_util.error(
                         service_name="NodeIdentificationService",
-                        message=f"[IDENTIFY_NODE] ❌ No edge found with source_node_id={source_node_id_to_use}. Available source_node_ids: {[edge.source_node_id for edge in edges]}"
+                        message=f"[IDENTIFY_NODE] ❌ No edge found with source_node_id={source_node_id_to_use}. Available source_node_ids: {sorted(index.edges_by_source)}"
                     )
                     return {
                         "status": "error",
@@ -254,12 +298,8 @@ class NodeIdentificationService:
                     }
                 
                 # Get next node data
-                for node in flow.flowNodes:
-                    node_dict = _node_to_dict(node)
-                    if node_dict.get("id") == next_node_id:
-                        next_node_data = node_dict
-                        break
-                
+                next_node_data = index.nodes_by_id.get(next_node_id)
+
                 if not next_node_data:
                     return {
                         "status": "error",
@@ -445,7 +485,8 @@ class NodeIdentificationService:
                     flow=flow,
                     current_processed_node_id=next_node_id,
                     current_processed_node_data=next_node_data,
-                    edges=edges
+                    edges=edges,
+                    nodes_by_id=index.nodes_by_id
                 )
                 
                 if chain_result.get("should_chain"):
@@ -488,7 +529,6 @@ class NodeIdentificationService:
                 service_name="NodeIdentificationService",
                 message=f"[IDENTIFY_NODE] ❌ Error identifying and processing node: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="NodeIdentificationService",
                 message=f"[IDENTIFY_NODE] Traceback: {traceback.format_exc()}"
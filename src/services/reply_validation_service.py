@@ -2,7 +2,18 @@
 Reply Validation Service
 Handles reply matching, validation checks, and mismatch handling.
 """
-from typing import Optional, Dict, Any, List, TYPE_CHECKING
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, TYPE_CHECKING
+
+try:
+    # google-re2: linear-time matching, so user-supplied validation patterns
+    # cannot trigger catastrophic backtracking and hang a worker
+    import re2
+except ImportError:
+    # Optional dependency - the stdlib backtracking engine is used when unavailable
+    re2 = None
 
 if TYPE_CHECKING:
     from typing import Callable
@@ -13,6 +24,77 @@ from models.flow_data import FlowData
 from models.user_data import UserData
 
 
+# Fixed-shape results returned on hot webhook paths.
+# Frozen via MappingProxyType so they can be returned by reference instead of
+# allocating a new dict per call; callers must treat them as read-only.
+_RETRY_RESULT: Mapping[str, Any] = MappingProxyType({
+    "status": "retry",
+    "fallback_message": None,  # Let node processor handle the message
+    "message": "Reply did not match, retrying current node"
+})
+
+_EXTRACT_ERROR_RESULT: Mapping[str, Any] = MappingProxyType({
+    "status": "error",
+    "message": "Could not extract user input"
+})
+
+_USER_REPLY_NOT_FOUND_RESULT: Mapping[str, Any] = MappingProxyType({
+    "status": "error",
+    "message": "user_reply not found in data",
+    "matched_answer_id": None,
+    "matched_node_id": None,
+    "fallback_message": None
+})
+
+_USE_DEFAULT_EDGE_RESULT: Mapping[str, Any] = MappingProxyType({
+    "status": "use_default_edge",
+    "matched_answer_id": None,
+    "matched_node_id": None,
+    "fallback_message": None
+})
+
+# Well-known validation patterns, compiled once at import time so the hot path
+# never pays regex-compilation cost for Email/Phone validation.
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_CLEANUP_PATTERN = re.compile(r'[\s\-\(\)\+]')
+
+
+def _result(status: str, *, message: Optional[str] = None,
+            matched_answer_id: Optional[str] = None,
+            matched_node_id: Optional[str] = None,
+            fallback_message: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a validate_and_match_reply result dict.
+    One construction site for the common shape instead of a dict literal
+    per return; the message key is only included when set.
+    """
+    result = {
+        "status": status,
+        "matched_answer_id": matched_answer_id,
+        "matched_node_id": matched_node_id,
+        "fallback_message": fallback_message
+    }
+    if message is not None:
+        result["message"] = message
+    return result
+
+
+@lru_cache(maxsize=512)
+def _get_regex(pattern: str) -> Any:
+    """
+    Compile and cache user-supplied validation regex patterns.
+    Each unique pattern is compiled once and reused across messages.
+    Prefers the RE2 engine (linear-time, ReDoS-safe); patterns using features
+    RE2 does not support (e.g. backreferences) fall back to the stdlib engine.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
 class ReplyValidationService:
     """
     Service for validating user replies, matching them against expected answers,
@@ -26,58 +108,314 @@ class ReplyValidationService:
     ):
         self.log_util = log_util
         self.flow_db = flow_db
-    
+        # Pre-built answer indexes per flow version: a flow-wide
+        # {expected_input_cf: (node_id, answer_id)} map for mismatch handling
+        # and a per-node {node_id: {expected_input_cf: answer_id}} map for
+        # current-node matching, so both paths do one dict lookup instead of
+        # scanning nodes/answers on each reply. Keys are casefolded once at
+        # build time for correct case-insensitive Unicode comparison.
+        self._answer_index_cache: Dict[Any, Tuple[Dict[str, Tuple[str, str]], Dict[str, Dict[str, str]], Dict[str, Dict[str, Any]]]] = {}
+
+    def _build_answer_indexes(self, flow: FlowData) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, Dict[str, str]], Dict[str, Dict[str, Any]]]:
+        """
+        Build (or fetch from cache) the answer indexes for a flow, plus a
+        {node_id: node_dict} map so node lookups skip the per-message scan.
+        Keyed on (flow id, updated_at) so a re-published flow gets fresh indexes.
+        The flow-wide index covers button/list question nodes (the mismatch
+        scan never matched other types); the per-node index also covers
+        trigger_template nodes, which process_reply_match handles.
+        """
+        cache_key = (flow.id, flow.updated_at)
+        cached = self._answer_index_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        answer_index: Dict[str, Tuple[str, str]] = {}
+        node_answer_lookup: Dict[str, Dict[str, str]] = {}
+        nodes_by_id: Dict[str, Dict[str, Any]] = {}
+        for node in flow.flowNodes:
+            if hasattr(node, "model_dump"):
+                node_dict = node.model_dump()
+            elif isinstance(node, dict):
+                node_dict = node
+            else:
+                node_dict = dict(node)
+
+            dict_node_id = node_dict.get("id")
+            if dict_node_id:
+                nodes_by_id[dict_node_id] = node_dict
+
+            node_type = node_dict.get("type")
+            if node_type not in ("trigger_template", "button_question", "list_question"):
+                continue
+            node_id = node_dict.get("id")
+            per_node: Dict[str, str] = {}
+            for answer in node_dict.get("expectedAnswers") or []:
+                expected_input = answer.get("expectedInput", "")
+                if expected_input:
+                    expected_cf = expected_input.casefold()
+                    # Keep the first answer registered for a text (matches
+                    # the original scan order)
+                    per_node.setdefault(expected_cf, answer.get("id"))
+                    if node_type in ("button_question", "list_question"):
+                        answer_index.setdefault(expected_cf, (node_id, answer.get("id")))
+            if node_id:
+                node_answer_lookup[node_id] = per_node
+
+        # Keep the cache small - stale entries for replaced flows are dropped
+        if len(self._answer_index_cache) >= 128:
+            self._answer_index_cache.clear()
+        indexes = (answer_index, node_answer_lookup, nodes_by_id)
+        self._answer_index_cache[cache_key] = indexes
+        return indexes
+
+    def _get_answer_index(self, flow: FlowData) -> Dict[str, Tuple[str, str]]:
+        """
+        Flow-wide {expected_input_cf: (node_id, answer_id)} index over all
+        button/list question nodes, for mismatch handling.
+        """
+        return self._build_answer_indexes(flow)[0]
+
+    def _get_node_answer_lookup(self, flow: FlowData) -> Dict[str, Dict[str, str]]:
+        """
+        Per-node {node_id: {expected_input_cf: answer_id}} index, for
+        matching a reply against the current node's expected answers.
+        """
+        return self._build_answer_indexes(flow)[1]
+
+    def _get_nodes_by_id(self, flow: FlowData) -> Dict[str, Dict[str, Any]]:
+        """
+        {node_id: node_dict} map for the flow, so node lookups don't
+        re-run model_dump over flowNodes on every message.
+        """
+        return self._build_answer_indexes(flow)[2]
+
+    def _validate_number(self, user_reply: str, user_reply_stripped: str,
+                         min_value: str, max_value: str) -> Optional[str]:
+        """
+        Number validation: numeric input within optional min/max bounds.
+        Returns an error message on failure, None when the reply passes.
+        """
+        try:
+            user_num = float(user_reply_stripped)
+        except (ValueError, TypeError):
+            self.log_util.info(
+                service_name="ReplyValidationService",
+                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Number validation: not a valid number"
+            )
+            return "Input must be a number"
+
+        if min_value and min_value.strip():
+            try:
+                min_num = float(min_value.strip())
+                if user_num < min_num:
+                    self.log_util.info(
+                        service_name="ReplyValidationService",
+                        message=f"[VALIDATE_REPLY] Number '{user_reply}' failed minValue validation: {min_value} (user: {user_num})"
+                    )
+                    return f"Number below minimum: {min_value}"
+            except (ValueError, TypeError) as e:
+                self.log_util.warning(
+                    service_name="ReplyValidationService",
+                    message=f"[VALIDATE_REPLY] Invalid minValue '{min_value}': {str(e)}"
+                )
+                return f"Invalid minimum value: {min_value}"
+
+        if max_value and max_value.strip():
+            try:
+                max_num = float(max_value.strip())
+                if user_num > max_num:
+                    self.log_util.info(
+                        service_name="ReplyValidationService",
+                        message=f"[VALIDATE_REPLY] Number '{user_reply}' failed maxValue validation: {max_value} (user: {user_num})"
+                    )
+                    return f"Number above maximum: {max_value}"
+            except (ValueError, TypeError) as e:
+                self.log_util.warning(
+                    service_name="ReplyValidationService",
+                    message=f"[VALIDATE_REPLY] Invalid maxValue '{max_value}': {str(e)}"
+                )
+                return f"Invalid maximum value: {max_value}"
+
+        return None
+
+    def _validate_text(self, user_reply: str, user_reply_stripped: str,
+                       min_value: str, max_value: str) -> Optional[str]:
+        """
+        Text validation: reply length within optional min/max bounds.
+        Returns an error message on failure, None when the reply passes.
+        """
+        if min_value and min_value.strip():
+            try:
+                min_len = int(min_value.strip())
+                if len(user_reply) < min_len:
+                    self.log_util.info(
+                        service_name="ReplyValidationService",
+                        message=f"[VALIDATE_REPLY] Text reply '{user_reply}' (length: {len(user_reply)}) failed minValue validation: {min_value}"
+                    )
+                    return f"Text length below minimum: {min_value} characters"
+            except (ValueError, TypeError):
+                self.log_util.warning(
+                    service_name="ReplyValidationService",
+                    message=f"[VALIDATE_REPLY] Invalid minValue for Text validation: {min_value}"
+                )
+
+        if max_value and max_value.strip():
+            try:
+                max_len = int(max_value.strip())
+                if len(user_reply) > max_len:
+                    self.log_util.info(
+                        service_name="ReplyValidationService",
+                        message=f"[VALIDATE_REPLY] Text reply '{user_reply}' (length: {len(user_reply)}) failed maxValue validation: {max_value}"
+                    )
+                    return f"Text length above maximum: {max_value} characters"
+            except (ValueError, TypeError):
+                self.log_util.warning(
+                    service_name="ReplyValidationService",
+                    message=f"[VALIDATE_REPLY] Invalid maxValue for Text validation: {max_value}"
+                )
+
+        return None
+
+    def _validate_email(self, user_reply: str, user_reply_stripped: str,
+                        min_value: str, max_value: str) -> Optional[str]:
+        """
+        Email validation: basic email format check.
+        Returns an error message on failure, None when the reply passes.
+        """
+        if not _EMAIL_PATTERN.match(user_reply_stripped):
+            self.log_util.info(
+                service_name="ReplyValidationService",
+                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Email validation"
+            )
+            return "Invalid email format"
+        return None
+
+    def _validate_phone(self, user_reply: str, user_reply_stripped: str,
+                        min_value: str, max_value: str) -> Optional[str]:
+        """
+        Phone validation: digits after stripping common formatting characters.
+        Returns an error message on failure, None when the reply passes.
+        """
+        phone_cleaned = _PHONE_CLEANUP_PATTERN.sub('', user_reply_stripped)
+        if not phone_cleaned.isdigit() or len(phone_cleaned) < 7:
+            self.log_util.info(
+                service_name="ReplyValidationService",
+                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Phone validation"
+            )
+            return "Invalid phone format"
+        return None
+
+    # Dispatch table for answerValidation types - one dict lookup instead of
+    # an if/elif chain of string comparisons per message
+    _TYPE_VALIDATORS = {
+        "Number": _validate_number,
+        "Text": _validate_text,
+        "Email": _validate_email,
+        "Phone": _validate_phone,
+    }
+
+    @staticmethod
+    def _extract_validation_params(answer_validation: Any) -> Tuple[int, str]:
+        """
+        Extract (max_fallback_count, fallback_message) from a node's answerValidation,
+        which may be a dict or a model object.
+        Defaults to 3 retries and the generic fallback message.
+        """
+        max_fallback_count = 3
+        fallback_message = "This is not the valid response. Please try again below"
+
+        if not answer_validation:
+            return max_fallback_count, fallback_message
+
+        if isinstance(answer_validation, dict):
+            fails_count_str = answer_validation.get("failsCount", "3")
+            node_fallback = answer_validation.get("fallback", "")
+        else:
+            fails_count_str = getattr(answer_validation, "failsCount", "3")
+            node_fallback = getattr(answer_validation, "fallback", "")
+
+        try:
+            max_fallback_count = int(fails_count_str) if fails_count_str else 3
+        except (ValueError, TypeError):
+            max_fallback_count = 3
+
+        if node_fallback and node_fallback.strip():
+            fallback_message = node_fallback.strip()
+
+        return max_fallback_count, fallback_message
+
     async def process_reply_match(
         self,
         source_node: Dict[str, Any],
         user_reply: str,
-        edges: List[Any]
+        edges: List[Any],
+        flow: Optional[FlowData] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Process when user reply matches the current node's expected answers in list and button questions.
         Returns dict with matched_answer_id if a match is found, None otherwise.
         Node service will use this answer_id to find next node via edges.
+        When flow is provided, the match is a single lookup in the per-node
+        answer index instead of an answer scan.
         """
         try:
             node_type = source_node.get("type")
-            
+
             # Only process nodes that have expected answers
             if node_type not in ("trigger_template", "button_question", "list_question"):
                 return None
-            
+
             expected_answers = source_node.get("expectedAnswers", [])
             if not expected_answers:
                 return None
-            
+
             if not user_reply:
                 return None
-            
-            # Match user input to expected answers
-            self.log_util.info(
-                service_name="ReplyValidationService",
-                message=f"[PROCESS_REPLY_MATCH] Checking {len(expected_answers)} expected answers for user_reply='{user_reply}'"
-            )
-            for answer in expected_answers:
-                expected_input = answer.get("expectedInput", "")
-                answer_id = answer.get("id")
+
+            # Casefold once; every comparison below reuses it
+            user_reply_cf = user_reply.casefold()
+
+            # Guard the per-answer logs with a level check so the f-strings are
+            # only built when INFO logging is actually enabled
+            info_enabled = self.log_util.is_info_enabled()
+            if info_enabled:
                 self.log_util.info(
                     service_name="ReplyValidationService",
-                    message=f"[PROCESS_REPLY_MATCH] Comparing expected_input='{expected_input}' (lower: '{expected_input.lower()}') with user_reply='{user_reply}' (lower: '{user_reply.lower()}')"
+                    message=f"[PROCESS_REPLY_MATCH] Checking {len(expected_answers)} expected answers for user_reply='{user_reply}'"
                 )
-                if expected_input and expected_input.lower() == user_reply.lower():
-                    # Return the matched answer ID - node service will find next node via edges
+
+            answer_id = None
+            node_lookup = None
+            if flow is not None:
+                node_lookup = self._get_node_answer_lookup(flow).get(source_node.get("id"))
+            if node_lookup is not None:
+                answer_id = node_lookup.get(user_reply_cf)
+            else:
+                # No index available (node missing an id, or caller without the
+                # flow) - fall back to scanning the answers
+                for answer in expected_answers:
+                    expected_input = answer.get("expectedInput", "")
+                    if expected_input and expected_input.casefold() == user_reply_cf:
+                        answer_id = answer.get("id")
+                        break
+
+            if answer_id:
+                # Return the matched answer ID - node service will find next node via edges
+                if info_enabled:
                     self.log_util.info(
                         service_name="ReplyValidationService",
                         message=f"[PROCESS_REPLY_MATCH] ✅ Match found! Returning matched_answer_id={answer_id}"
                     )
-                    return {
-                        "matched_answer_id": answer_id
-                    }
-            
-            self.log_util.info(
-                service_name="ReplyValidationService",
-                message=f"[PROCESS_REPLY_MATCH] ❌ No match found for user_reply='{user_reply}'"
-            )
+                return {
+                    "matched_answer_id": answer_id
+                }
+
+            if info_enabled:
+                self.log_util.info(
+                    service_name="ReplyValidationService",
+                    message=f"[PROCESS_REPLY_MATCH] ❌ No match found for user_reply='{user_reply}'"
+                )
             return None
         except Exception as e:
             self.log_util.error(
@@ -120,21 +458,10 @@ class ReplyValidationService:
             }
         
         # Same node - retry scenario, check validation count
-        # Get fallback count from current node (default 3)
-        max_fallback_count = 3
+        # Get fallback count and message from current node (defaults: 3 retries, generic message)
         answer_validation = current_node_data.get("answerValidation")
-        
-        if answer_validation:
-            if isinstance(answer_validation, dict):
-                fails_count_str = answer_validation.get("failsCount", "3")
-            else:
-                fails_count_str = getattr(answer_validation, "failsCount", "3")
-            
-            try:
-                max_fallback_count = int(fails_count_str) if fails_count_str else 3
-            except (ValueError, TypeError):
-                max_fallback_count = 3
-        
+        max_fallback_count, fallback_message = self._extract_validation_params(answer_validation)
+
         # Get current validation count from user state
         validation = user_state.get("validation", {})
         if isinstance(validation, dict):
@@ -142,18 +469,7 @@ class ReplyValidationService:
         else:
             # Handle case where validation might be a ValidationData object
             current_validation_count = getattr(validation, "failure_count", 0) if validation else 0
-        
-        # Get fallback message from node or use default
-        fallback_message = "This is not the valid response. Please try again below"
-        if answer_validation:
-            if isinstance(answer_validation, dict):
-                node_fallback = answer_validation.get("fallback", "")
-            else:
-                node_fallback = getattr(answer_validation, "fallback", "")
-            
-            if node_fallback and node_fallback.strip():
-                fallback_message = node_fallback.strip()
-        
+
         # Check if within limit
         if current_validation_count < max_fallback_count:
             # Within limit - increment validation count and allow retry
@@ -209,37 +525,16 @@ class ReplyValidationService:
         """
         try:
             if not user_reply:
-                return {
-                    "status": "error",
-                    "message": "Could not extract user input"
-                }
-            
-            def _node_to_dict(node: Any) -> Dict[str, Any]:
-                if hasattr(node, "model_dump"):
-                    return node.model_dump()
-                if isinstance(node, dict):
-                    return node
-                return dict(node)
-            
-            # Check if reply matches any button/list node in the flow
+                return _EXTRACT_ERROR_RESULT
+
+            # Check if reply matches any button/list node in the flow via the
+            # pre-built answer index (one dict lookup instead of a node scan)
             matched_node_id = None
             matched_answer_id = None
-            
-            for node in flow.flowNodes:
-                node_dict = _node_to_dict(node)
-                check_node_type = node_dict.get("type")
-                
-                if check_node_type in ("button_question", "list_question"):
-                    expected_answers = node_dict.get("expectedAnswers", [])
-                    for answer in expected_answers:
-                        expected_input = answer.get("expectedInput", "")
-                        if expected_input and expected_input.lower() == user_reply.lower():
-                            matched_node_id = node_dict.get("id")
-                            matched_answer_id = answer.get("id")
-                            break
-                    if matched_node_id:
-                        break
-            
+            answer_hit = self._get_answer_index(flow).get(user_reply.casefold())
+            if answer_hit:
+                matched_node_id, matched_answer_id = answer_hit
+
             # If match found in another node, return match info
             if matched_node_id and matched_answer_id:
                 next_node_id = None
@@ -257,11 +552,7 @@ class ReplyValidationService:
                     }
             
             # No match found anywhere in flow - return retry status
-            return {
-                "status": "retry",
-                "fallback_message": None,  # Let node processor handle the message
-                "message": "Reply did not match, retrying current node"
-            }
+            return _RETRY_RESULT
                 
         except Exception as e:
             self.log_util.error(
@@ -305,25 +596,25 @@ class ReplyValidationService:
         """
         try:
             # Log data received in validation service for debugging
-            self.log_util.info(
-                service_name="ReplyValidationService",
-                message=f"[VALIDATE_REPLY] Data received - keys: {list(data.keys()) if data else 'None'}, user_reply: '{data.get('user_reply') if data else None}', data_type: {type(data)}, full_data: {data}"
-            )
+            # Level-guarded: the full-data dump is expensive to format per message
+            if self.log_util.is_info_enabled():
+                self.log_util.info(
+                    service_name="ReplyValidationService",
+                    message=f"[VALIDATE_REPLY] Data received - keys: {list(data.keys()) if data else 'None'}, user_reply: '{data.get('user_reply') if data else None}', data_type: {type(data)}, full_data: {data}"
+                )
             
             # Extract user_reply from data
+            # Empty or whitespace-only replies (e.g. status/ack webhooks) can never
+            # match anything - bail out before any flow/node work. Strip once here
+            # and reuse the stripped value throughout.
             user_reply = data.get("user_reply")
-            if not user_reply:
+            user_reply_stripped = user_reply.strip() if user_reply else ""
+            if not user_reply_stripped:
                 self.log_util.warning(
                     service_name="ReplyValidationService",
                     message=f"[VALIDATE_REPLY] ❌ user_reply not found in data. Data keys: {list(data.keys()) if data else 'None'}, data value: {data}"
                 )
-                return {
-                    "status": "error",
-                    "message": "user_reply not found in data",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _USER_REPLY_NOT_FOUND_RESULT
             
             # Extract user info from metadata
             user_identifier = metadata.sender
@@ -342,13 +633,7 @@ class ReplyValidationService:
                     service_name="ReplyValidationService",
                     message=f"[VALIDATE_REPLY] ❌ Flow {flow_id} not found"
                 )
-                return {
-                    "status": "error",
-                    "message": f"Flow {flow_id} not found",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _result("error", message=f"Flow {flow_id} not found")
             
             self.log_util.info(
                 service_name="ReplyValidationService",
@@ -360,13 +645,7 @@ class ReplyValidationService:
                     service_name="ReplyValidationService",
                     message=f"[VALIDATE_REPLY] ❌ No edges found for flow {flow_id}"
                 )
-                return {
-                    "status": "error",
-                    "message": "No edges found for flow",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _result("error", message="No edges found for flow")
             
             self.log_util.info(
                 service_name="ReplyValidationService",
@@ -378,49 +657,39 @@ class ReplyValidationService:
                 service_name="ReplyValidationService",
                 message=f"[VALIDATE_REPLY] Step 2: Looking for current_node_id={current_node_id} in flow with {len(flow.flowNodes)} nodes"
             )
-            def _node_to_dict(node: Any) -> Dict[str, Any]:
-                if hasattr(node, "model_dump"):
-                    return node.model_dump()
-                if isinstance(node, dict):
-                    return node
-                return dict(node)
-            
-            current_node = None
-            for node in flow.flowNodes:
-                node_dict = _node_to_dict(node)
-                if node_dict.get("id") == current_node_id:
-                    current_node = node_dict
-                    break
-            
+            nodes_by_id = self._get_nodes_by_id(flow)
+            current_node = nodes_by_id.get(current_node_id)
+
             if not current_node:
                 self.log_util.error(
                     service_name="ReplyValidationService",
-                    message=f"[VALIDATE_REPLY] ❌ Current node {current_node_id} not found in flow. Available node IDs: {[(_node_to_dict(n).get('id')) for n in flow.flowNodes]}"
+                    message=f"[VALIDATE_REPLY] ❌ Current node {current_node_id} not found in flow. Available node IDs: {sorted(nodes_by_id)}"
                 )
-                return {
-                    "status": "error",
-                    "message": f"Current node {current_node_id} not found in flow",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _result("error", message=f"Current node {current_node_id} not found in flow")
             
+            # Unpack the frequently used node fields once instead of repeated
+            # dict lookups throughout the function
+            node_type = current_node.get("type")
+            answer_validation = current_node.get("answerValidation")
+            user_input_variable = current_node.get("userInputVariable", "")
+
             self.log_util.info(
                 service_name="ReplyValidationService",
-                message=f"[VALIDATE_REPLY] Step 2: Current node found, type={current_node.get('type')}"
+                message=f"[VALIDATE_REPLY] Step 2: Current node found, type={node_type}"
             )
-            
+
             # Step 3: Try to match reply with expected answers in current node FIRST
             # This doesn't require user data, so we do it before fetching user
             self.log_util.info(
                 service_name="ReplyValidationService",
-                message=f"[VALIDATE_REPLY] Checking reply match for current_node_id={current_node_id}, user_reply='{user_reply}', node_type={current_node.get('type')}"
+                message=f"[VALIDATE_REPLY] Checking reply match for current_node_id={current_node_id}, user_reply='{user_reply}', node_type={node_type}"
             )
             
             matched_result = await self.process_reply_match(
                 source_node=current_node,
                 user_reply=user_reply,
-                edges=edges
+                edges=edges,
+                flow=flow
             )
             
             self.log_util.info(
@@ -432,7 +701,6 @@ class ReplyValidationService:
                 # ✅ REPLY MATCHED in current node
                 # If is_text is true, save flow context value
                 if is_text:
-                    user_input_variable = current_node.get("userInputVariable", "")
                     if user_input_variable:
                         # Save flow context variable
                         await self.flow_db.save_or_update_flow_variable(
@@ -454,18 +722,12 @@ class ReplyValidationService:
                     service_name="ReplyValidationService",
                     message=f"[VALIDATE_REPLY] ✅ Reply matched in current node! Returning status='matched', matched_answer_id={matched_answer_id}"
                 )
-                return {
-                    "status": "matched",
-                    "matched_answer_id": matched_answer_id,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _result("matched", matched_answer_id=matched_answer_id)
             
             # ❌ REPLY DID NOT MATCH in current node
             # For text questions (is_text=True), validate against answerValidation rules
             if is_text:
                 # Step 4.5: Validate text reply against answerValidation (regex, minValue, maxValue)
-                answer_validation = current_node.get("answerValidation")
                 validation_passed = True
                 validation_error_message = None
                 
@@ -482,132 +744,18 @@ class ReplyValidationService:
                         min_value = getattr(answer_validation, "minValue", "")
                         max_value = getattr(answer_validation, "maxValue", "")
                     
-                    # Helper function to check if string is numeric
-                    def is_numeric_string(s: str) -> bool:
-                        """Check if string represents a valid number (integer or float)"""
-                        if not s or not s.strip():
-                            return False
-                        try:
-                            float(s.strip())
-                            return True
-                        except (ValueError, TypeError):
-                            return False
-                    
-                    # Validate based on validation type
-                    if validation_type == "Number":
-                        # Number validation: validate as numeric values
-                        if not is_numeric_string(user_reply):
-                            validation_passed = False
-                            validation_error_message = "Input must be a number"
-                            self.log_util.info(
-                                service_name="ReplyValidationService",
-                                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Number validation: not a valid number"
-                            )
-                        else:
-                            # Validate minValue for numbers
-                            if validation_passed and min_value and min_value.strip():
-                                try:
-                                    user_num = float(user_reply.strip())
-                                    min_num = float(min_value.strip())
-                                    if user_num < min_num:
-                                        validation_passed = False
-                                        validation_error_message = f"Number below minimum: {min_value}"
-                                        self.log_util.info(
-                                            service_name="ReplyValidationService",
-                                            message=f"[VALIDATE_REPLY] Number '{user_reply}' failed minValue validation: {min_value} (user: {user_num})"
-                                        )
-                                except (ValueError, TypeError) as e:
-                                    validation_passed = False
-                                    validation_error_message = f"Invalid minimum value: {min_value}"
-                                    self.log_util.warning(
-                                        service_name="ReplyValidationService",
-                                        message=f"[VALIDATE_REPLY] Invalid minValue '{min_value}': {str(e)}"
-                                    )
-                            
-                            # Validate maxValue for numbers
-                            if validation_passed and max_value and max_value.strip():
-                                try:
-                                    user_num = float(user_reply.strip())
-                                    max_num = float(max_value.strip())
-                                    if user_num > max_num:
-                                        validation_passed = False
-                                        validation_error_message = f"Number above maximum: {max_value}"
-                                        self.log_util.info(
-                                            service_name="ReplyValidationService",
-                                            message=f"[VALIDATE_REPLY] Number '{user_reply}' failed maxValue validation: {max_value} (user: {user_num})"
-                                        )
-                                except (ValueError, TypeError) as e:
-                                    validation_passed = False
-                                    validation_error_message = f"Invalid maximum value: {max_value}"
-                                    self.log_util.warning(
-                                        service_name="ReplyValidationService",
-                                        message=f"[VALIDATE_REPLY] Invalid maxValue '{max_value}': {str(e)}"
-                                    )
-                    
-                    elif validation_type == "Text":
-                        # Text validation: validate as text length
-                        if validation_passed and min_value and min_value.strip():
-                            try:
-                                min_len = int(min_value.strip())
-                                if len(user_reply) < min_len:
-                                    validation_passed = False
-                                    validation_error_message = f"Text length below minimum: {min_value} characters"
-                                    self.log_util.info(
-                                        service_name="ReplyValidationService",
-                                        message=f"[VALIDATE_REPLY] Text reply '{user_reply}' (length: {len(user_reply)}) failed minValue validation: {min_value}"
-                                    )
-                            except (ValueError, TypeError):
-                                self.log_util.warning(
-                                    service_name="ReplyValidationService",
-                                    message=f"[VALIDATE_REPLY] Invalid minValue for Text validation: {min_value}"
-                                )
-                        
-                        if validation_passed and max_value and max_value.strip():
-                            try:
-                                max_len = int(max_value.strip())
-                                if len(user_reply) > max_len:
-                                    validation_passed = False
-                                    validation_error_message = f"Text length above maximum: {max_value} characters"
-                                    self.log_util.info(
-                                        service_name="ReplyValidationService",
-                                        message=f"[VALIDATE_REPLY] Text reply '{user_reply}' (length: {len(user_reply)}) failed maxValue validation: {max_value}"
-                                    )
-                            except (ValueError, TypeError):
-                                self.log_util.warning(
-                                    service_name="ReplyValidationService",
-                                    message=f"[VALIDATE_REPLY] Invalid maxValue for Text validation: {max_value}"
-                                )
-                    
-                    elif validation_type == "Email":
-                        # Email validation: basic email format check
-                        import re
-                        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-                        if not re.match(email_pattern, user_reply.strip()):
-                            validation_passed = False
-                            validation_error_message = "Invalid email format"
-                            self.log_util.info(
-                                service_name="ReplyValidationService",
-                                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Email validation"
-                            )
-                    
-                    elif validation_type == "Phone":
-                        # Phone validation: basic phone format check (digits, may include +, -, spaces, parentheses)
-                        import re
-                        # Remove common phone formatting characters and check if remaining are digits
-                        phone_cleaned = re.sub(r'[\s\-\(\)\+]', '', user_reply.strip())
-                        if not phone_cleaned.isdigit() or len(phone_cleaned) < 7:
-                            validation_passed = False
-                            validation_error_message = "Invalid phone format"
-                            self.log_util.info(
-                                service_name="ReplyValidationService",
-                                message=f"[VALIDATE_REPLY] Text reply '{user_reply}' failed Phone validation"
-                            )
-                    
+                    # Validate based on validation type via the dispatch table
+                    validator = self._TYPE_VALIDATORS.get(validation_type)
+                    if validator:
+                        validation_error_message = validator(
+                            self, user_reply, user_reply_stripped, min_value, max_value
+                        )
+                        validation_passed = validation_error_message is None
+
                     # Validate regex pattern (applies to all validation types if provided)
                     if validation_passed and regex_pattern and regex_pattern.strip():
-                        import re
                         try:
-                            if not re.search(regex_pattern, user_reply):
+                            if not _get_regex(regex_pattern).search(user_reply):
                                 validation_passed = False
                                 validation_error_message = "Regex validation failed"
                                 self.log_util.info(
@@ -622,30 +770,10 @@ class ReplyValidationService:
                 
                 # If validation failed, check failsCount limit
                 if not validation_passed:
-                    # Get max fallback count from current node (default 3)
-                    max_fallback_count = 3
-                    if answer_validation:
-                        if isinstance(answer_validation, dict):
-                            fails_count_str = answer_validation.get("failsCount", "3")
-                        else:
-                            fails_count_str = getattr(answer_validation, "failsCount", "3")
-                        
-                        try:
-                            max_fallback_count = int(fails_count_str) if fails_count_str else 3
-                        except (ValueError, TypeError):
-                            max_fallback_count = 3
-                    
-                    # Get fallback message from node or use default
-                    fallback_message = "This is not the valid response. Please try again below"
-                    if answer_validation:
-                        if isinstance(answer_validation, dict):
-                            node_fallback = answer_validation.get("fallback", "")
-                        else:
-                            node_fallback = getattr(answer_validation, "fallback", "")
-                        
-                        if node_fallback and node_fallback.strip():
-                            fallback_message = node_fallback.strip()
-                    
+                    # Get max fallback count and fallback message from current node
+                    max_fallback_count, fallback_message = self._extract_validation_params(answer_validation)
+
+
                     # Check if current validation count >= max limit
                     if current_validation_count >= max_fallback_count:
                         # Validation limit exceeded - exit automation
@@ -653,28 +781,20 @@ class ReplyValidationService:
                             service_name="ReplyValidationService",
                             message=f"[VALIDATE_REPLY] Text validation limit exceeded ({current_validation_count}/{max_fallback_count}) for user {user_identifier}"
                         )
-                        return {
-                            "status": "validation_exit",
-                            "message": "Validation limit exceeded, automation exited",
-                            "matched_answer_id": None,
-                            "matched_node_id": None,
-                            "fallback_message": fallback_message
-                        }
+                        return _result(
+                            "validation_exit",
+                            message="Validation limit exceeded, automation exited",
+                            fallback_message=fallback_message
+                        )
                     
                     # Validation failed but within limit - return retry
                     self.log_util.info(
                         service_name="ReplyValidationService",
                         message=f"[VALIDATE_REPLY] Text validation failed ({current_validation_count + 1}/{max_fallback_count}) for user {user_identifier}: {validation_error_message}"
                     )
-                    return {
-                        "status": "mismatch_retry",
-                        "matched_answer_id": None,
-                        "matched_node_id": None,
-                        "fallback_message": fallback_message
-                    }
+                    return _result("mismatch_retry", fallback_message=fallback_message)
                 
                 # Validation passed - save flow context variable and use default edge
-                user_input_variable = current_node.get("userInputVariable", "")
                 if user_input_variable:
                     # Save flow context variable for text question (validation passed)
                     await self.flow_db.save_or_update_flow_variable(
@@ -691,12 +811,7 @@ class ReplyValidationService:
                     )
                 
                 # For text questions with passed validation, use default edge
-                return {
-                    "status": "use_default_edge",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _USE_DEFAULT_EDGE_RESULT
             
             # Step 4: Check if reply matches any button/list node in the entire flow (skip if is_text=True)
             if not is_text:
@@ -711,86 +826,41 @@ class ReplyValidationService:
                 
                 if mismatch_result["status"] == "matched_other_node":
                     # Matched in another node in the flow
-                    return {
-                        "status": "matched_other_node",
-                        "matched_node_id": mismatch_result.get("matched_node_id"),
-                        "matched_answer_id": None,
-                        "fallback_message": None
-                    }
+                    return _result(
+                        "matched_other_node",
+                        matched_node_id=mismatch_result.get("matched_node_id")
+                    )
             
             # Step 5: Check validation for button/list questions in current node (only reached if reply didn't match)
-            node_type = current_node.get("type")
             if node_type in ("button_question", "list_question"):
-                # Get max fallback count from current node (default 3)
-                max_fallback_count = 3
-                answer_validation = current_node.get("answerValidation")
-                
-                if answer_validation:
-                    if isinstance(answer_validation, dict):
-                        fails_count_str = answer_validation.get("failsCount", "3")
-                    else:
-                        fails_count_str = getattr(answer_validation, "failsCount", "3")
-                    
-                    try:
-                        max_fallback_count = int(fails_count_str) if fails_count_str else 3
-                    except (ValueError, TypeError):
-                        max_fallback_count = 3
-                
-                # Get fallback message from node or use default
-                fallback_message = "This is not the valid response. Please try again below"
-                if answer_validation:
-                    if isinstance(answer_validation, dict):
-                        node_fallback = answer_validation.get("fallback", "")
-                    else:
-                        node_fallback = getattr(answer_validation, "fallback", "")
-                    
-                    if node_fallback and node_fallback.strip():
-                        fallback_message = node_fallback.strip()
-                
+                # Get max fallback count and fallback message from current node
+                max_fallback_count, fallback_message = self._extract_validation_params(
+                    answer_validation
+                )
+
+
                 # Check if current validation count >= max limit
                 if current_validation_count >= max_fallback_count:
                     # Validation limit exceeded - exit automation
                     # Note: UserStateService will handle exiting automation and call node service
-                    return {
-                        "status": "validation_exit",
-                        "message": "Validation limit exceeded, automation exited",
-                        "matched_answer_id": None,
-                        "matched_node_id": None,
-                        "fallback_message": fallback_message  # Use node fallback message
-                    }
+                    return _result(
+                        "validation_exit",
+                        message="Validation limit exceeded, automation exited",
+                        fallback_message=fallback_message  # Use node fallback message
+                    )
                 
                 # For button/list questions, return retry with fallback message
                 # Note: UserStateService will handle validation state updates
-                return {
-                    "status": "mismatch_retry",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": fallback_message
-                }
+                return _result("mismatch_retry", fallback_message=fallback_message)
             else:
                 # For other node types, use default edge (no validation needed)
-                return {
-                    "status": "use_default_edge",
-                    "matched_answer_id": None,
-                    "matched_node_id": None,
-                    "fallback_message": None
-                }
+                return _USE_DEFAULT_EDGE_RESULT
                 
         except Exception as e:
             self.log_util.error(
                 service_name="ReplyValidationService",
-                message=f"[VALIDATE_REPLY] ❌ Exception in validate_and_match_reply: {str(e)}"
+                message=f"[VALIDATE_REPLY] ❌ Exception in validate_and_match_reply: {str(e)}",
+                exc_info=True
             )
-            import traceback
-            self.log_util.error(
-                service_name="ReplyValidationService",
-                message=f"[VALIDATE_REPLY] Traceback: {traceback.format_exc()}"
-            )
-            return {
-                "status": "error",
-                "message": str(e),
-                "matched_answer_id": None,
-                "matched_node_id": None,
-                "fallback_message": None
-            }
+            return _result("error", message=str(e))
 
@@ -13,7 +13,7 @@ class TimeTriggeredAutomationService:
     Service for handling scheduled/time-based trigger webhooks.
     Processes flows that are triggered by time-based events (scheduled, recurring, etc.)
     """
-    
+
     def __init__(
         self,
         log_util: LogUtil,
@@ -21,7 +21,7 @@ class TimeTriggeredAutomationService:
     ):
         self.log_util = log_util
         self.flow_db = flow_db
-    
+
     async def process_scheduled_trigger(
         self,
         request: WebhookMessageRequest
@@ -76,24 +76,41 @@ class TimeTriggeredAutomationService:
                 message=f"Scheduled trigger details - trigger_id: {trigger_id}, flow_id: {flow_id}, trigger_node_id: {trigger_node_id}, scheduled_time: {scheduled_time}, trigger_type: {trigger_type}"
             )
             
-            # TODO: Implement flow execution logic
-            # 1. Retrieve flow by flow_id
-            # 2. Get trigger node
-            # 3. Get target users (from target_users or query based on criteria)
-            # 4. For each target user, initiate the flow
-            # 5. Handle recurring triggers if applicable
-            
+            # Initiate the flow for all target users with one batched bulk write
+            # instead of a state write per user - a single round-trip per batch
+            # dominates the cost for large broadcasts
+            # TODO: Handle recurring triggers and criteria-based target user queries
+            initiated_count = 0
+            failed_count = 0
+            if target_users and trigger_node_id:
+                target_channel = request.message_body.get("target_channel", "whatsapp")
+                initiated_count = await self.flow_db.bulk_update_user_automation_state(
+                    user_identifiers=target_users,
+                    brand_id=request.brand_id,
+                    flow_id=flow_id,
+                    trigger_node_id=trigger_node_id,
+                    channel=target_channel
+                )
+                failed_count = len(target_users) - initiated_count
+                if failed_count:
+                    self.log_util.warning(
+                        service_name="TimeTriggeredAutomationService",
+                        message=f"Bulk initiate for flow {flow_id} matched {initiated_count}/{len(target_users)} target users"
+                    )
+
             self.log_util.info(
                 service_name="TimeTriggeredAutomationService",
-                message=f"Scheduled trigger processed successfully for flow_id: {flow_id}"
+                message=f"Scheduled trigger processed for flow_id: {flow_id}, initiated: {initiated_count}, failed: {failed_count}"
             )
-            
+
             return {
                 "status": "success",
                 "message": "Scheduled trigger processed successfully",
                 "flow_id": flow_id,
                 "trigger_id": trigger_id,
-                "target_users_count": len(target_users) if target_users else 0
+                "target_users_count": len(target_users) if target_users else 0,
+                "initiated_count": initiated_count,
+                "failed_count": failed_count
             }
             
         except Exception as e:
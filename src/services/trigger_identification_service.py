@@ -1,4 +1,13 @@
-from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
+import re
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
+
+try:
+    # pyahocorasick: C-backed multi-keyword matching, single pass over the text
+    import ahocorasick
+except ImportError:
+    # Optional dependency - a Python substring scan is used when unavailable
+    ahocorasick = None
 
 # Utils
 from utils.log_utils import LogUtil
@@ -18,6 +27,43 @@ if TYPE_CHECKING:
     from services.user_state_service import UserStateService
 
 
+@lru_cache(maxsize=128)
+def _build_keyword_automaton(keyword_items: Tuple[Tuple[str, str, str], ...]) -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton from (keyword_lower, flow_id, node_id) items.
+    Cached on the keyword set itself, so the automaton is only rebuilt when a
+    brand's keyword triggers actually change.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None or not keyword_items:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword_lower, flow_id, node_id in keyword_items:
+        # Keep the first trigger registered for a keyword (matches the original
+        # first-trigger-wins scan order)
+        if keyword_lower not in automaton:
+            automaton.add_word(keyword_lower, (flow_id, node_id))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=128)
+def _build_keyword_regex(keyword_items: Tuple[Tuple[str, str, str], ...]) -> Tuple[Any, Dict[str, Tuple[str, str]]]:
+    """
+    Fallback multi-keyword matcher used when pyahocorasick is unavailable.
+    Compiles all keywords into one alternation regex so the C-level re engine
+    scans the text in a single pass.
+    Returns (pattern, {keyword_lower: (flow_id, node_id)}); cached on the
+    keyword set like the automaton builder.
+    """
+    keyword_map: Dict[str, Tuple[str, str]] = {}
+    for keyword_lower, flow_id, node_id in keyword_items:
+        # Keep the first trigger registered for a keyword (first-trigger-wins)
+        keyword_map.setdefault(keyword_lower, (flow_id, node_id))
+    pattern = re.compile("|".join(map(re.escape, keyword_map)))
+    return pattern, keyword_map
+
+
 class TriggerIdentificationService:
     """
     Service for identifying triggers and initiating flows when users are not in automation.
@@ -202,11 +248,15 @@ class TriggerIdentificationService:
         Returns: (flow_id, node_id) tuple if match found, None otherwise
         """
         try:
-            self.log_util.info(
-                service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] Starting trigger check for brand_id: {brand_id}, message_type: {message_type}, channel: {channel}"
-            )
-            
+            # Level-guard the per-message info logs so their f-strings are only
+            # built when INFO logging is actually enabled
+            info_enabled = self.log_util.is_info_enabled()
+            if info_enabled:
+                self.log_util.info(
+                    service_name="TriggerIdentificationService",
+                    message=f"[TRIGGER_CHECK] Starting trigger check for brand_id: {brand_id}, message_type: {message_type}, channel: {channel}"
+                )
+
             # Step 1: Extract text content from normalized data
             # Data is already normalized by WebhookService, so extract user_reply directly
             text_content = message_body.get("user_reply", "").strip() or None
@@ -218,16 +268,13 @@ class TriggerIdentificationService:
                 )
                 return None
             
-            self.log_util.info(
-                service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] Extracted text content: '{text_content}' (channel: {channel})"
-            )
-            
+            if info_enabled:
+                self.log_util.info(
+                    service_name="TriggerIdentificationService",
+                    message=f"[TRIGGER_CHECK] Extracted text content: '{text_content}' (channel: {channel})"
+                )
+
             # Step 3: Get all triggers for this brand
-            self.log_util.info(
-                service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] Fetching triggers for brand_id: {brand_id}"
-            )
             triggers = await self.flow_db.get_flow_triggers_by_brand_id(brand_id)
             if triggers is None or len(triggers) == 0:
                 self.log_util.warning(
@@ -236,62 +283,91 @@ class TriggerIdentificationService:
                 )
                 return None
             
-            self.log_util.info(
-                service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] Found {len(triggers)} triggers to check against text: '{text_content}'"
-            )
-            
-            # Step 4: Check each trigger
-            for trigger in triggers:
+            if info_enabled:
                 self.log_util.info(
                     service_name="TriggerIdentificationService",
-                    message=f"[TRIGGER_CHECK] Checking trigger: type={trigger.trigger_type}, flow_id={trigger.flow_id}, node_id={trigger.node_id}, values={trigger.trigger_values}"
+                    message=f"[TRIGGER_CHECK] Found {len(triggers)} triggers to check against text: '{text_content}'"
                 )
+
+            # Lowercase the message text once - comparisons below reuse this local
+            # instead of re-lowercasing the same string for every trigger value
+            text_lower = text_content.lower()
+
+            # Step 4: Build match indexes from the trigger list
+            # Keyword triggers are matched with a single Aho-Corasick pass over the
+            # text (O(len(text))) instead of a per-trigger substring scan; template
+            # triggers use an exact-match dict keyed by the lowered button text
+            keyword_items: List[Tuple[str, str, str]] = []
+            keyword_exact_index: Dict[str, Tuple[str, str]] = {}
+            template_index: Dict[str, Tuple[str, str]] = {}
+            for trigger in triggers:
                 if trigger.trigger_type == "keyword":
-                    # Keyword triggers only work with text messages
-                    if message_type == "text":
-                        # Check if message text contains any keyword (case-insensitive)
-                        for keyword in trigger.trigger_values:
-                            self.log_util.info(
-                                service_name="TriggerIdentificationService",
-                                message=f"[TRIGGER_CHECK] Comparing keyword '{keyword}' (lower: '{keyword.lower()}') with text '{text_content}' (lower: '{text_content.lower()}')"
-                            )
-                            if keyword.lower() in text_content.lower():
-                                self.log_util.info(
-                                    service_name="TriggerIdentificationService",
-                                    message=f"[TRIGGER_CHECK] ✅ Keyword trigger matched: '{keyword}' in message '{text_content}' for flow_id: {trigger.flow_id}, node_id: {trigger.node_id}"
-                                )
-                                return (trigger.flow_id, trigger.node_id)
-                            else:
-                                self.log_util.info(
-                                    service_name="TriggerIdentificationService",
-                                    message=f"[TRIGGER_CHECK] ❌ Keyword '{keyword}' not found in '{text_content}'"
-                                )
-                    else:
-                        self.log_util.info(
-                            service_name="TriggerIdentificationService",
-                            message=f"[TRIGGER_CHECK] Skipping keyword trigger (message_type is '{message_type}', not 'text')"
-                        )
-                
+                    for keyword in trigger.trigger_values:
+                        keyword_lower = keyword.lower()
+                        keyword_items.append((keyword_lower, trigger.flow_id, trigger.node_id))
+                        # Keep the first trigger registered for a keyword (first-trigger-wins)
+                        keyword_exact_index.setdefault(keyword_lower, (trigger.flow_id, trigger.node_id))
                 elif trigger.trigger_type == "template":
-                    # Template triggers work with both text and button messages
-                    # Check if message text/button exactly matches any expected button text (case-insensitive)
+                    # Keep the first trigger registered for a button text (first-trigger-wins)
                     for button_text in trigger.trigger_values:
+                        template_index.setdefault(button_text.lower(), (trigger.flow_id, trigger.node_id))
+
+            # Template triggers work with both text and button messages
+            # Checked first: an exact match is a single dict lookup and cheaper
+            # than the keyword scan, so exact hits return early
+            template_hit = template_index.get(text_lower)
+            if template_hit:
+                self.log_util.info(
+                    service_name="TriggerIdentificationService",
+                    message=f"[TRIGGER_CHECK] ✅ Template trigger matched: '{text_content}' (type: {message_type}) for flow_id: {template_hit[0]}, node_id: {template_hit[1]}"
+                )
+                return template_hit
+
+            # Keyword triggers only work with text messages
+            if message_type == "text" and keyword_items:
+                # Fast path: the whole message equals a keyword - a single dict
+                # lookup, no substring scan needed
+                exact_hit = keyword_exact_index.get(text_lower)
+                if exact_hit:
+                    self.log_util.info(
+                        service_name="TriggerIdentificationService",
+                        message=f"[TRIGGER_CHECK] ✅ Keyword trigger matched exactly: '{text_content}' for flow_id: {exact_hit[0]}, node_id: {exact_hit[1]}"
+                    )
+                    return exact_hit
+
+                # Fast path: a single keyword needs just one substring check,
+                # skip building the automaton/regex entirely
+                if len(keyword_items) == 1:
+                    keyword_lower, flow_id, node_id = keyword_items[0]
+                    # bytes.find uses the C memmem routine, which beats the
+                    # str containment scan on long message texts
+                    if text_lower.encode("utf-8").find(keyword_lower.encode("utf-8")) != -1:
                         self.log_util.info(
                             service_name="TriggerIdentificationService",
-                            message=f"[TRIGGER_CHECK] Comparing template button '{button_text}' (lower: '{button_text.lower()}') with text '{text_content}' (lower: '{text_content.lower()}')"
+                            message=f"[TRIGGER_CHECK] ✅ Keyword trigger matched: '{keyword_lower}' in message '{text_content}' for flow_id: {flow_id}, node_id: {node_id}"
                         )
-                        if button_text.lower() == text_content.lower():
+                        return (flow_id, node_id)
+                else:
+                    automaton = _build_keyword_automaton(tuple(keyword_items))
+                    if automaton is not None:
+                        for _, payload in automaton.iter(text_lower):
                             self.log_util.info(
                                 service_name="TriggerIdentificationService",
-                                message=f"[TRIGGER_CHECK] ✅ Template trigger matched: '{button_text}' matches message '{text_content}' (type: {message_type}) for flow_id: {trigger.flow_id}, node_id: {trigger.node_id}"
+                                message=f"[TRIGGER_CHECK] ✅ Keyword trigger matched in message '{text_content}' for flow_id: {payload[0]}, node_id: {payload[1]}"
                             )
-                            return (trigger.flow_id, trigger.node_id)
-                        else:
+                            return payload
+                    else:
+                        # pyahocorasick not installed - one C-level scan via an
+                        # alternation regex instead of a per-keyword substring loop
+                        pattern, keyword_map = _build_keyword_regex(tuple(keyword_items))
+                        match = pattern.search(text_lower)
+                        if match:
+                            flow_id, node_id = keyword_map[match.group(0)]
                             self.log_util.info(
                                 service_name="TriggerIdentificationService",
-                                message=f"[TRIGGER_CHECK] ❌ Template button '{button_text}' does not match '{text_content}'"
+                                message=f"[TRIGGER_CHECK] ✅ Keyword trigger matched: '{match.group(0)}' in message '{text_content}' for flow_id: {flow_id}, node_id: {node_id}"
                             )
+                            return (flow_id, node_id)
             
             self.log_util.info(
                 service_name="TriggerIdentificationService",
@@ -302,12 +378,8 @@ class TriggerIdentificationService:
         except Exception as e:
             self.log_util.error(
                 service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] ❌ Error checking triggers: {str(e)}"
-            )
-            import traceback
-            self.log_util.error(
-                service_name="TriggerIdentificationService",
-                message=f"[TRIGGER_CHECK] Traceback: {traceback.format_exc()}"
+                message=f"[TRIGGER_CHECK] ❌ Error checking triggers: {str(e)}",
+                exc_info=True
             )
             return None
 
@@ -1,4 +1,10 @@
-from typing import Optional, Dict, Any, List
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from datetime import datetime, timedelta
 
 # Utils
@@ -13,15 +19,209 @@ from services.whatsapp_flow_service import WhatsAppFlowService
 from services.node_identification_service import NodeIdentificationService
 from services.reply_validation_service import ReplyValidationService
 from services.lead_management_service import LeadManagementService
-from services.lead_management_service import LeadManagementService
 
 # Models
+from models.delay_data import DelayData, DelayNodeView, INTERRUPTED_SUFFIX, NOT_INTERRUPTED_SUFFIX
 from models.user_data import UserData
 from models.flow_data import FlowData
 from models.user_detail import UserDetail
 from models.webhook_message_data import WebhookMetadata
 
 
+# Default sub-service instances shared across UserStateService constructions.
+# The service may be instantiated per-request; building the collaborator graph
+# (WhatsAppFlowService and friends) every time allocates the same objects over
+# and over, so defaults are built once per (log_util, flow_db, url) and reused.
+_shared_service_cache: Dict[Tuple, Any] = {}
+_shared_service_lock = threading.Lock()
+
+# Delay unit -> seconds multiplier, resolved with one dict lookup on the
+# delay hot path instead of an if/elif chain
+_UNIT_SECONDS = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+
+# Statically known node-type classification: types in these sets never need
+# the node_detail metadata lookup to decide whether they wait for user input
+_USER_INPUT_TYPES = frozenset({"button_question", "list_question", "question", "trigger_template"})
+_TRANSIENT_TYPES = frozenset({"message", "send_template", "send_email_template", "condition"})
+
+# Validation-status -> (is_validation_error, fallback_message, node_id_to_process)
+# resolvers for the node service parameters; one dict lookup instead of a
+# per-message if/elif chain over the status string
+_STATUS_HANDLERS: Dict[str, Callable[[Dict[str, Any], "UserData"], Tuple[bool, Optional[str], Optional[str]]]] = {
+    # Reply matched expected answer
+    "matched": lambda validation_result, existing_user: (False, None, None),
+    # Reply matched another node in the flow
+    "matched_other_node": lambda validation_result, existing_user: (
+        False, None, validation_result.get("matched_node_id")
+    ),
+    # Reply didn't match, retry current node with fallback
+    "mismatch_retry": lambda validation_result, existing_user: (
+        True, validation_result.get("fallback_message"), existing_user.current_node_id
+    ),
+}
+
+# use_default_edge or other status
+_DEFAULT_STATUS_HANDLER = lambda validation_result, existing_user: (False, None, None)
+
+# Bounds for the per-service validation result cache - identical replies to
+# the same node (button taps, yes/no) are common, and within a short window
+# the validation outcome is deterministic for the same failure count
+_VALIDATION_CACHE_TTL_SECONDS = 30
+_VALIDATION_CACHE_MAX_ENTRIES = 1024
+
+# Number of asyncio locks in the per-sender serialization table; senders
+# map onto a fixed shard by hash so memory stays bounded regardless of
+# how many distinct users message the service
+_SENDER_LOCK_SHARDS = 256
+
+# Per-call handoff flag for the sender lock, set by
+# check_and_process_user_with_flow and read by _spawn_node_processing in the
+# same task. A spawned chain writes the user's automation state, so the lock
+# must stay held until the chain finishes - otherwise a queued follow-up
+# message from the same user would run against pre-chain state. The holder is
+# a one-element list: [True] once a spawned chain has taken lock ownership.
+_sender_lock_handoff: "contextvars.ContextVar[Optional[List[bool]]]" = \
+    contextvars.ContextVar("sender_lock_handoff", default=None)
+
+# Pre-built response for the most common webhook outcome: a message that
+# matches no trigger. Built once at import; callers (and WebhookService)
+# only read from status responses, so the shared dict must not be mutated
+_NO_TRIGGER_RESPONSE = {
+    "status": "no_trigger",
+    "message": "No trigger matched",
+    "flow_id": None,
+    "trigger_node_id": None
+}
+
+# How long a completed delay-data clear suppresses duplicate clears for the
+# same (user, brand, flow). Webhook bursts during a delay can race several
+# clear attempts; within this window the later ones return without a write
+_DELAY_CLEAR_DEDUP_TTL_SECONDS = 5
+
+# Upper bound on remembered (sender, brand) -> flow_id hints used to start
+# the flow-context fetch alongside the user-state read; cleared wholesale
+# when full, same as the other bounded maps in this module
+_SENDER_FLOW_HINT_MAX_ENTRIES = 4096
+
+
+# Webhook payload key -> normalized lead field, covering the camelCase and
+# snake_case spellings the channel adapters emit; extend here as fields grow
+_LEAD_FIELD_KEYS = {
+    "first_name": "first_name",
+    "firstName": "first_name",
+    "last_name": "last_name",
+    "lastName": "last_name",
+    "address": "address",
+}
+
+
+@dataclass(slots=True)
+class _LeadFields:
+    """Normalized lead attributes extracted from a webhook payload."""
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    address: Optional[str] = None
+
+
+def _extract_lead_fields(data: Optional[Dict[str, Any]]) -> _LeadFields:
+    """
+    Resolve lead fields from a webhook payload in one pass over data.items(),
+    instead of chained data.get("snake") or data.get("camel") probes per field.
+    The first non-empty value per normalized field wins.
+    """
+    fields = _LeadFields()
+    if data:
+        for key, value in data.items():
+            attr = _LEAD_FIELD_KEYS.get(key)
+            if attr and value and getattr(fields, attr) is None:
+                setattr(fields, attr, value)
+    return fields
+
+
+@dataclass(slots=True)
+class _FlowContext:
+    """
+    Cached per-flow-version processing context.
+    Node processing can hop through several nodes of the same flow for one
+    webhook; the context is built once per (flow_id, updated_at) so the hops
+    share the flow object instead of re-reading it.
+    """
+    version: Any
+    flow: "FlowData"
+    # {node_id: node_dict} - nodes dumped to dicts once per flow version
+    nodes_by_id: Dict[str, Dict[str, Any]]
+    # Node ids that have at least one outgoing edge; a node is terminal
+    # exactly when its id is not in this set
+    source_ids: set
+    # {node_id: True | False | None} - whether the node parks the user
+    # waiting for input, classified once per flow version from the type
+    # tables. None means the type is unknown here and the caller falls
+    # back to the node_detail lookup
+    parks_user_by_id: Dict[str, Optional[bool]]
+
+
+@dataclass(slots=True)
+class ValidationStepResult:
+    """
+    Outcome of _process_validation_and_get_node_service_params.
+    A slotted dataclass instead of an ad-hoc dict: one allocation, fixed
+    attribute loads on the hot path, and the field set is checked at
+    construction time.
+    """
+    handled: bool = False
+    is_validation_error: bool = False
+    fallback_message: Optional[str] = None
+    node_id_to_process: Optional[str] = None
+    current_node_id_for_service: Optional[str] = None
+    validation_result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    validation_exit: bool = False
+    node_service_response: Optional[Dict[str, Any]] = None
+
+
+def _node_to_dict(node: Any) -> Dict[str, Any]:
+    """
+    Convert a flow node to a plain dict, memoizing the model_dump result on
+    the node instance. The same node objects live inside cached FlowData
+    documents, so across hops and requests each node is dumped at most once.
+    """
+    if isinstance(node, dict):
+        return node
+    if hasattr(node, "model_dump"):
+        cached = getattr(node, "_node_dict_cache", None)
+        if cached is None:
+            cached = node.model_dump()
+            object.__setattr__(node, "_node_dict_cache", cached)
+        return cached
+    return dict(node)
+
+
+def _get_user_detail_dict(existing_user: Optional["UserData"]) -> Optional[Dict[str, Any]]:
+    """
+    Dump existing_user.user_detail to a dict, handling the missing-user case.
+    The dump itself is cached on the UserDetail instance (UserDetail.as_dict),
+    so the several call sites in one request reuse the same dict.
+    """
+    if not existing_user or not existing_user.user_detail:
+        return None
+    return existing_user.user_detail.as_dict()
+
+
+def _get_shared_service(key: Tuple, factory: Callable[[], Any]) -> Any:
+    """
+    Return the cached sub-service for key, constructing it once via factory.
+    Double-checked under a lock so concurrent constructions stay single.
+    """
+    service = _shared_service_cache.get(key)
+    if service is None:
+        with _shared_service_lock:
+            service = _shared_service_cache.get(key)
+            if service is None:
+                service = factory()
+                _shared_service_cache[key] = service
+    return service
+
+
 class UserStateService:
     def __init__(
         self,
@@ -39,40 +239,234 @@ class UserStateService:
         self.flow_service = flow_service
         self.node_process_service = node_process_service  # Kept for backward compatibility, but will use API
         self.trigger_identification_service = None  # Will be set via setter to avoid circular dependency
+        # {(flow_id, node_id, is_text, normalized_reply): (expires_at, validation_count, result)}
+        self._validation_cache: "OrderedDict[Tuple, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        # {flow_id: _FlowContext} - processing context per flow version; the
+        # underlying flow read is TTL-cached with write invalidation in FlowDB,
+        # and updated_at acts as the version key here
+        self._flow_context_cache: Dict[str, _FlowContext] = {}
+        # Strong references to offloaded node-processing tasks (a bare
+        # create_task result can be garbage collected mid-flight)
+        self._background_tasks: set = set()
+        # {(flow_id, node_id, data_key): Future} - concurrent identical
+        # node-service calls collapse onto one in-flight future
+        self._inflight_node_calls: Dict[Tuple, "asyncio.Future"] = {}
+        # Single-flight state for delay-data clears: a per-(user, brand, flow)
+        # lock serializes concurrent clears and a recently-cleared timestamp
+        # map short-circuits duplicates inside the dedup window
+        self._delay_clear_locks: Dict[Tuple, "asyncio.Lock"] = {}
+        self._recently_cleared_delays: Dict[Tuple, float] = {}
+        # (sender, brand_id) -> flow_id observed on the last message; lets
+        # the next message start warming that flow's context while the user
+        # read is still in flight (a wrong hint just warms an extra cached
+        # flow, so staleness is harmless)
+        self._sender_flow_hints: Dict[Tuple[str, int], str] = {}
+        # Fixed table of locks serializing processing per sender (sharded by
+        # sender hash); see check_and_process_user_with_flow
+        self._sender_locks = [asyncio.Lock() for _ in range(_SENDER_LOCK_SHARDS)]
+        # In-automation scenario handlers keyed by
+        # (is_delay_complete, has_delay_node_data); a delay_complete event
+        # takes the same path whether or not the delay data survived
+        self._automation_dispatch = {
+            (True, True): self._handle_delay_complete,
+            (True, False): self._handle_delay_complete,
+            (False, True): self._handle_delay_interrupt,
+            (False, False): self._handle_regular_reply,
+        }
+        # Default sub-services are shared across instances (see module cache
+        # above) instead of being reallocated per UserStateService
+        base_key = (id(log_util), id(flow_db))
         # Initialize WhatsAppFlowService for channel-specific operations
-        self.whatsapp_flow_service = WhatsAppFlowService(
-            log_util=log_util,
-            flow_db=flow_db,
-            node_process_api_url=node_process_api_url
+        self.whatsapp_flow_service = _get_shared_service(
+            ("whatsapp_flow", *base_key, node_process_api_url),
+            lambda: WhatsAppFlowService(
+                log_util=log_util,
+                flow_db=flow_db,
+                node_process_api_url=node_process_api_url
+            )
         )
-        # Initialize ReplyValidationService if not provided
-        if reply_validation_service:
-            self.reply_validation_service = reply_validation_service
-        else:
-            self.reply_validation_service = ReplyValidationService(
+        # Initialize remaining sub-services if not provided
+        whatsapp_flow_service = self.whatsapp_flow_service
+        self.reply_validation_service = reply_validation_service or _get_shared_service(
+            ("reply_validation", *base_key),
+            lambda: ReplyValidationService(
                 log_util=log_util,
                 flow_db=flow_db
             )
-        # Initialize NodeIdentificationService if not provided
-        if node_identification_service:
-            self.node_identification_service = node_identification_service
-        else:
-            self.node_identification_service = NodeIdentificationService(
+        )
+        self.node_identification_service = node_identification_service or _get_shared_service(
+            ("node_identification", *base_key, node_process_api_url),
+            lambda: NodeIdentificationService(
                 log_util=log_util,
                 flow_db=flow_db,
-                whatsapp_flow_service=self.whatsapp_flow_service
+                whatsapp_flow_service=whatsapp_flow_service
             )
-        # Initialize LeadManagementService if not provided
-        if lead_management_service:
-            self.lead_management_service = lead_management_service
-        else:
-            self.lead_management_service = LeadManagementService(
+        )
+        self.lead_management_service = lead_management_service or _get_shared_service(
+            ("lead_management", id(log_util)),
+            lambda: LeadManagementService(
                 log_util=log_util
             )
+        )
     
     def set_trigger_identification_service(self, trigger_identification_service):
         """Set the trigger identification service (called after initialization to avoid circular dependency)"""
         self.trigger_identification_service = trigger_identification_service
+
+    def _spawn_node_processing(self, coro, description: str,
+                               sender: Optional[str] = None) -> None:
+        """
+        Run a node-processing chain as a background task so the webhook can be
+        acknowledged as soon as the user state is settled. The task is kept
+        strongly referenced until done; completion is logged with its duration
+        and failures are logged instead of propagating.
+
+        When sender is given, the chain runs under that sender's sharded lock.
+        The chain writes the user's automation state, so without the lock a
+        rapid follow-up message could read the user before the write lands
+        and e.g. re-match a trigger it already fired. When the caller is the
+        webhook path that currently holds the lock, ownership is handed to the
+        chain task (the webhook returns without releasing and the chain
+        releases when done), so even messages already queued on the lock wait
+        for the chain; otherwise the chain re-acquires the lock itself.
+        """
+        if sender is not None:
+            lock = self._sender_locks[hash(sender) % _SENDER_LOCK_SHARDS]
+            handoff = _sender_lock_handoff.get()
+            if handoff is not None and not handoff[0] and lock.locked():
+                handoff[0] = True
+
+                async def _run_with_held_lock(chain=coro):
+                    try:
+                        return await chain
+                    finally:
+                        lock.release()
+
+                coro = _run_with_held_lock()
+            else:
+                async def _run_under_sender_lock(chain=coro):
+                    async with lock:
+                        return await chain
+
+                coro = _run_under_sender_lock()
+
+        started_at = time.monotonic()
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+
+        def _on_done(finished_task: "asyncio.Task") -> None:
+            self._background_tasks.discard(finished_task)
+            duration_ms = (time.monotonic() - started_at) * 1000
+            exc = finished_task.exception() if not finished_task.cancelled() else None
+            if exc is not None:
+                self.log_util.error(
+                    service_name="UserStateService",
+                    message=f"Background node processing failed ({description}, {duration_ms:.0f}ms): {str(exc)}"
+                )
+            elif self.log_util.is_info_enabled():
+                self.log_util.info(
+                    service_name="UserStateService",
+                    message=f"Background node processing finished ({description}, {duration_ms:.0f}ms)"
+                )
+
+        task.add_done_callback(_on_done)
+
+    async def _process_chained_node_deduped(
+        self,
+        metadata: "WebhookMetadata",
+        data: Dict[str, Any],
+        current_node_id: str,
+        flow_id: str
+    ) -> Dict[str, Any]:
+        """
+        Call identify_and_process_node for a chained hop, collapsing concurrent
+        identical calls onto one in-flight future. Bursty identical webhooks
+        (delay_complete fan-out, duplicate channel deliveries) then trigger the
+        downstream processing once instead of once per webhook. The key
+        includes the sender: dedup is only safe across retries of the same
+        user's webhook - different users at the same node sending the same
+        reply must each get their own node-service call.
+        """
+        try:
+            data_key = hash(repr(sorted(data.items()))) if data else None
+        except Exception:
+            data_key = id(data)
+        key = (metadata.sender, metadata.brand_id, flow_id, current_node_id, data_key)
+
+        inflight = self._inflight_node_calls.get(key)
+        if inflight is not None:
+            return await inflight
+
+        future: "asyncio.Future" = asyncio.get_running_loop().create_future()
+        self._inflight_node_calls[key] = future
+        try:
+            response = await self.node_identification_service.identify_and_process_node(
+                metadata=metadata,
+                data=data,
+                is_validation_error=False,
+                fallback_message=None,
+                node_id_to_process=None,
+                current_node_id=current_node_id,
+                flow_id=flow_id,
+                user_detail=None,  # Not available in chained processing
+                lead_id=None  # Not available in chained processing
+            )
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved in case no duplicate caller is awaiting it
+            future.exception()
+            raise
+        finally:
+            self._inflight_node_calls.pop(key, None)
+
+    async def _get_flow_context(self, flow_id: str) -> Optional[_FlowContext]:
+        """
+        Get the cached processing context for a flow, rebuilding it when the
+        flow version (updated_at) changes. The flow read itself is served from
+        FlowDB's short-TTL cache, so recursive hops on the same flow stay in
+        memory instead of issuing a DB round-trip each.
+        """
+        flow = await self.flow_db.get_flow_by_id(flow_id)
+        if not flow:
+            return None
+        context = self._flow_context_cache.get(flow_id)
+        if context is not None and context.version == flow.updated_at:
+            return context
+        # Dump every node to a dict once per flow version; hops then resolve
+        # nodes with one dict lookup instead of scanning and re-dumping
+        nodes_by_id: Dict[str, Dict[str, Any]] = {}
+        parks_user_by_id: Dict[str, Optional[bool]] = {}
+        for node in flow.flowNodes:
+            node_dict = _node_to_dict(node)
+            node_id = node_dict.get("id")
+            if node_id:
+                nodes_by_id[node_id] = node_dict
+                # Classify each node once at build time so the processing
+                # loop answers "does this node wait for input?" with a dict
+                # lookup per hop instead of repeated type checks; a delay
+                # node parks the user when it isn't short-circuited by a
+                # processed_value (that case returns before classification)
+                node_type = node_dict.get("type")
+                if node_type in _USER_INPUT_TYPES or node_type == "delay":
+                    parks_user_by_id[node_id] = True
+                elif node_type in _TRANSIENT_TYPES:
+                    parks_user_by_id[node_id] = False
+                else:
+                    parks_user_by_id[node_id] = None
+        # Fetch edges once per flow version; the terminal-node check per hop
+        # becomes a set lookup instead of a DB read plus an edge scan
+        edges = await self.flow_db.get_flow_edges(flow_id)
+        source_ids = {sid for edge in edges
+                      if (sid := getattr(edge, 'source_node_id', None))}
+        context = _FlowContext(version=flow.updated_at, flow=flow,
+                               nodes_by_id=nodes_by_id, source_ids=source_ids,
+                               parks_user_by_id=parks_user_by_id)
+        if len(self._flow_context_cache) >= 128:
+            self._flow_context_cache.clear()
+        self._flow_context_cache[flow_id] = context
+        return context
     
     async def _process_validation_and_get_node_service_params(
         self,
@@ -87,15 +481,15 @@ class UserStateService:
         brand_id: int,
         channel: str,
         channel_account_id: Optional[str]
-    ) -> Dict[str, Any]:
+    ) -> ValidationStepResult:
         """
         Process validation service call and return parameters for node identification service.
-        
+
         This function:
         1. Calls validation service with current node and user reply
         2. Handles validation_exit case (exits automation and returns early)
         3. Returns parameters needed to call node identification service
-        
+
         Args:
             metadata: WebhookMetadata from saved webhook
             data: Normalized data from saved webhook
@@ -108,15 +502,11 @@ class UserStateService:
             brand_id: Brand ID
             channel: Channel name
             channel_account_id: Channel account ID
-        
+
         Returns:
-            Dict with:
-                - handled: bool - True if validation_exit was handled (automation exited), False if node service should be called
-                - is_validation_error: bool - Whether validation failed
-                - fallback_message: Optional[str] - Fallback message for validation errors
-                - node_id_to_process: Optional[str] - Node ID to process (for matched_other_node or retry)
-                - current_node_id_for_service: str - Current node ID to use for node service (may be matched_answer_id)
-                - validation_result: Dict[str, Any] - Validation result for later use
+            ValidationStepResult. handled=True means validation_exit was
+            handled and the caller should return early; otherwise the
+            remaining fields are the node identification service parameters.
         """
         try:
             self.log_util.info(
@@ -124,34 +514,73 @@ class UserStateService:
                 message=f"[EXISTING_USER] Current node has expected reply, calling validation service"
             )
             
-            # Get current validation count from user state
-            current_validation_count = 0
-            if existing_user.validation:
-                if isinstance(existing_user.validation, dict):
-                    current_validation_count = existing_user.validation.get("failure_count", 0)
-                else:
-                    current_validation_count = existing_user.validation.failure_count if hasattr(existing_user.validation, "failure_count") else 0
-            
-            # Log data being passed to validation service for debugging
-            self.log_util.info(
-                service_name="UserStateService",
-                message=f"[EXISTING_USER] Data passed to validation service - keys: {list(data.keys()) if data else 'None'}, user_reply: '{data.get('user_reply') if data else None}', full_data: {data}"
-            )
-            
-            validation_result = await self.reply_validation_service.validate_and_match_reply(
-                metadata=metadata,
-                data=data,
-                current_node_id=existing_user.current_node_id,
-                flow_id=flow.id,
-                is_text=is_text,
-                current_validation_count=current_validation_count
-            )
+            # Get current validation count from user state (normalized on the model)
+            current_validation_count = existing_user.validation_failure_count
             
+            # Log data being passed to validation service for debugging.
+            # Repr-ing the full data dict is expensive, so it only happens when
+            # DEBUG logging is actually enabled
+            if self.log_util.is_debug_enabled():
+                self.log_util.debug(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Data passed to validation service - keys: {list(data.keys()) if data else 'None'}, user_reply: '{data.get('user_reply') if data else None}', full_data: {data}"
+                )
+
+            # Short-circuit repeats: the same user re-sending the same reply
+            # to the same node within a short window resolves to the same
+            # validation outcome as long as the failure count hasn't moved.
+            # The key includes the sender because validate_and_match_reply
+            # also writes per-user state (flow variables, validation counts) -
+            # a hit may only ever swallow a duplicate of that same user's write
+            cache_key = (sender, brand_id, flow.id, existing_user.current_node_id,
+                         is_text, (data.get("user_reply") or "").strip().lower())
+            validation_result = None
+            cached = self._validation_cache.get(cache_key)
+            if cached is not None:
+                expires_at, cached_count, cached_result = cached
+                if expires_at > time.monotonic() and cached_count == current_validation_count:
+                    self._validation_cache.move_to_end(cache_key)
+                    validation_result = cached_result
+                else:
+                    self._validation_cache.pop(cache_key, None)
+
+            if validation_result is None:
+                # Kick off validation first, then do the Python-side prep while
+                # its round-trips are in flight
+                validation_task = asyncio.ensure_future(
+                    self.reply_validation_service.validate_and_match_reply(
+                        metadata=metadata,
+                        data=data,
+                        current_node_id=existing_user.current_node_id,
+                        flow_id=flow.id,
+                        is_text=is_text,
+                        current_validation_count=current_validation_count
+                    )
+                )
+
+                # Prewarm the user_detail dump - every branch below that calls
+                # the node service reuses the cached dict
+                _get_user_detail_dict(existing_user)
+
+                validation_result = await validation_task
+
+                # Skip caching validation_exit so the retry-limit semantics
+                # stay exact
+                if validation_result.get("status") != "validation_exit":
+                    self._validation_cache[cache_key] = (
+                        time.monotonic() + _VALIDATION_CACHE_TTL_SECONDS,
+                        current_validation_count,
+                        validation_result
+                    )
+                    if len(self._validation_cache) > _VALIDATION_CACHE_MAX_ENTRIES:
+                        self._validation_cache.popitem(last=False)
+
             # Log validation result for debugging
-            self.log_util.info(
-                service_name="UserStateService",
-                message=f"[EXISTING_USER] Validation result: status={validation_result.get('status')}, matched_answer_id={validation_result.get('matched_answer_id')}, matched_node_id={validation_result.get('matched_node_id')}"
-            )
+            if self.log_util.is_info_enabled():
+                self.log_util.info(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Validation result: status={validation_result.get('status')}, matched_answer_id={validation_result.get('matched_answer_id')}, matched_node_id={validation_result.get('matched_node_id')}"
+                )
             
             # Handle validation_exit case - send error message but keep automation active
             if validation_result["status"] == "validation_exit":
@@ -166,7 +595,7 @@ class UserStateService:
                 fallback_message = validation_result.get("fallback_message")
                 
                 # Call node service with validation error to send error message only
-                user_detail_dict = existing_user.user_detail.model_dump() if existing_user.user_detail else None
+                user_detail_dict = _get_user_detail_dict(existing_user)
                 node_service_response = await self.node_identification_service.identify_and_process_node(
                     metadata=metadata,
                     data=data,
@@ -183,41 +612,19 @@ class UserStateService:
                 # DON'T update user state - keep current_node_id and validation count as is
                 # User can still send correct message to proceed
                 # Return handled=True to return early (don't process any node)
-                return {
-                    "handled": True,  # Return early, don't process any node
-                    "validation_exit": True,
-                    "node_service_response": node_service_response
-                }
-            
-            # Determine parameters for node service
-            is_validation_error = False
-            fallback_message = None
-            node_id_to_process = None
-            
-            if validation_result["status"] == "matched":
-                # Reply matched expected answer
-                is_validation_error = False
-                fallback_message = None
-                node_id_to_process = None
-                
-            elif validation_result["status"] == "matched_other_node":
-                # Reply matched another node in the flow
-                is_validation_error = False
-                fallback_message = None
-                node_id_to_process = validation_result.get("matched_node_id")
-                
-            elif validation_result["status"] == "mismatch_retry":
-                # Reply didn't match, retry current node with fallback
-                is_validation_error = True
-                fallback_message = validation_result.get("fallback_message")
-                node_id_to_process = existing_user.current_node_id  # Retry same node
-                
-            else:
-                # use_default_edge or other status
-                is_validation_error = False
-                fallback_message = None
-                node_id_to_process = None
+                # Return early, don't process any node
+                return ValidationStepResult(
+                    handled=True,
+                    validation_exit=True,
+                    node_service_response=node_service_response
+                )
             
+            # Determine parameters for node service via the status dispatch table
+            status_handler = _STATUS_HANDLERS.get(validation_result["status"], _DEFAULT_STATUS_HANDLER)
+            is_validation_error, fallback_message, node_id_to_process = status_handler(
+                validation_result, existing_user
+            )
+
             # Determine current_node_id_for_service
             # For matched status, use matched_answer_id as current_node_id
             current_node_id_for_service = existing_user.current_node_id
@@ -232,15 +639,10 @@ class UserStateService:
                         service_name="UserStateService",
                         message=f"[EXISTING_USER] Status is 'matched' but matched_answer_id is None/empty. Cannot proceed without matched_answer_id."
                     )
-                    return {
-                        "handled": False,
-                        "is_validation_error": False,
-                        "fallback_message": None,
-                        "node_id_to_process": None,
-                        "current_node_id_for_service": None,
-                        "validation_result": validation_result,
-                        "error": "matched_answer_id is required for 'matched' status but is None/empty"
-                    }
+                    return ValidationStepResult(
+                        validation_result=validation_result,
+                        error="matched_answer_id is required for 'matched' status but is None/empty"
+                    )
                 current_node_id_for_service = matched_answer_id
                 self.log_util.info(
                     service_name="UserStateService",
@@ -253,35 +655,25 @@ class UserStateService:
                 )
             
             # Return parameters for node identification service
-            return {
-                "handled": False,
-                "is_validation_error": is_validation_error,
-                "fallback_message": fallback_message,
-                "node_id_to_process": node_id_to_process,
-                "current_node_id_for_service": current_node_id_for_service,
-                "validation_result": validation_result
-            }
+            return ValidationStepResult(
+                is_validation_error=is_validation_error,
+                fallback_message=fallback_message,
+                node_id_to_process=node_id_to_process,
+                current_node_id_for_service=current_node_id_for_service,
+                validation_result=validation_result
+            )
             
         except Exception as e:
             self.log_util.error(
                 service_name="UserStateService",
-                message=f"Error in _process_validation_and_get_node_service_params: {str(e)}"
-            )
-            import traceback
-            self.log_util.error(
-                service_name="UserStateService",
-                message=f"Traceback: {traceback.format_exc()}"
+                message=f"Error in _process_validation_and_get_node_service_params: {str(e)}",
+                exc_info=True
             )
             # Return error state
-            return {
-                "handled": False,
-                "is_validation_error": False,
-                "fallback_message": None,
-                "node_id_to_process": None,
-                "current_node_id_for_service": existing_user.current_node_id,
-                "validation_result": None,
-                "error": str(e)
-            }
+            return ValidationStepResult(
+                current_node_id_for_service=existing_user.current_node_id,
+                error=str(e)
+            )
     
     async def _update_delay_node_state(
         self,
@@ -294,11 +686,14 @@ class UserStateService:
         next_node_data: Optional[Dict[str, Any]] = None,
         validation_result: Optional[Dict[str, Any]] = None,
         fallback_message: Optional[str] = None,
-        clear_delay_data: bool = False
+        clear_delay_data: bool = False,
+        reset_validation: bool = True
     ) -> Dict[str, Any]:
         """
         Update user state with delay node data or clear delay node data.
         This function handles delay node processing separately.
+        reset_validation=False skips writing the validation reset on success
+        for users who were never in a failed state.
         
         Args:
             sender: User identifier
@@ -315,104 +710,79 @@ class UserStateService:
         Returns:
             Dict with status="success" and delay node information (or cleared status)
         """
+        # Single-flight guard for clears: a webhook burst during a delay can
+        # race several clear attempts for the same user+flow; only the first
+        # hits the DB and the rest return inside the dedup window
+        clear_lock = None
+        clear_key = None
+        if clear_delay_data:
+            clear_key = (sender, brand_id, flow_id)
+            cleared_at = self._recently_cleared_delays.get(clear_key)
+            if cleared_at is not None and time.monotonic() - cleared_at < _DELAY_CLEAR_DEDUP_TTL_SECONDS:
+                return {
+                    "status": "success",
+                    "message": "Delay node data already cleared"
+                }
+            clear_lock = self._delay_clear_locks.get(clear_key)
+            if clear_lock is None:
+                clear_lock = self._delay_clear_locks.setdefault(clear_key, asyncio.Lock())
+            await clear_lock.acquire()
+            # Re-check under the lock: the duplicate we raced may have
+            # finished the clear while we waited
+            cleared_at = self._recently_cleared_delays.get(clear_key)
+            if cleared_at is not None and time.monotonic() - cleared_at < _DELAY_CLEAR_DEDUP_TTL_SECONDS:
+                clear_lock.release()
+                return {
+                    "status": "success",
+                    "message": "Delay node data already cleared"
+                }
         try:
             if clear_delay_data:
                 self.log_util.info(
-                    service_name="UserStateService",
-                    message=f"Clearing delay node data for user {sender}"
+                    "UserStateService",
+                    "Clearing delay node data for user %s",
+                    sender
                 )
             else:
                 self.log_util.info(
-                    service_name="UserStateService",
-                    message=f"Updating delay node state for node {next_node_id}"
+                    "UserStateService",
+                    "Updating delay node state for node %s",
+                    next_node_id
                 )
             
             # Convert delay node data to dict for storage (only if not clearing)
             delay_node_dict = None
             if not clear_delay_data and next_node_data:
-                def _node_to_dict(node: Any) -> Dict[str, Any]:
-                    if hasattr(node, "model_dump"):
-                        return node.model_dump()
-                    if isinstance(node, dict):
-                        return node
-                    return dict(node)
-                
                 delay_node_dict = _node_to_dict(next_node_data)
-            
-            # Update validation state if needed (for validation scenarios)
-            if validation_result:
-                if validation_result.get("status") == "mismatch_retry":
-                    await self.flow_db.update_validation_state(
-                        user_identifier=sender,
-                        brand_id=brand_id,
-                        validation_failed=True,
-                        failure_message=fallback_message,
-                        channel=channel,
-                        channel_account_id=channel_account_id
-                    )
-                else:
-                    await self.flow_db.update_validation_state(
-                        user_identifier=sender,
-                        brand_id=brand_id,
-                        validation_failed=False,
-                        failure_message=None,
-                        channel=channel,
-                        channel_account_id=channel_account_id
-                    )
-            
-            # Update user automation state with complete delay node object or clear it
-            # When clearing delay data, check if user is still in automation (may have exited if terminal node)
-            # Get current user state to preserve is_in_automation if it was set to False
-            current_user = await self.flow_db.get_user_data(
-                user_identifier=sender,
-                brand_id=brand_id,
-                channel=channel,
-                channel_account_id=channel_account_id
-            )
-            
-            # If clearing delay data and user is not in automation, preserve that state
-            # Otherwise, use the appropriate state (True when saving delay, preserve existing when clearing)
-            is_in_automation_value = True
-            if clear_delay_data and current_user and not current_user.is_in_automation:
-                # User already exited automation (e.g., terminal node), preserve that state
-                is_in_automation_value = False
-                flow_id = None  # Also clear flow_id if exiting automation
-                next_node_id = None  # Also clear current_node_id if exiting automation
-            
-            await self.flow_db.update_user_automation_state(
-                user_identifier=sender,
-                brand_id=brand_id,
-                is_in_automation=is_in_automation_value,
-                current_flow_id=flow_id if not clear_delay_data or is_in_automation_value else None,
-                current_node_id=next_node_id if not clear_delay_data else None,  # Update to delay node ID when saving
-                channel=channel,
-                channel_account_id=channel_account_id,
-                delay_node_data=None if clear_delay_data else delay_node_dict
-            )
-            
-            # Save delay record to database for background scheduler (only when saving delay, not clearing)
+
+                # Precompute the interrupted/not-interrupted result ids once at
+                # save time, so interrupt handling reads them with a dict lookup
+                # instead of rescanning delayResult on every inbound message
+                for item in delay_node_dict.get("delayResult") or []:
+                    if isinstance(item, dict):
+                        item_id = item.get("id", "")
+                        if item_id.endswith(NOT_INTERRUPTED_SUFFIX):
+                            delay_node_dict["_not_interrupted_id"] = item_id
+                        elif item_id.endswith(INTERRUPTED_SUFFIX):
+                            delay_node_dict["_interrupted_id"] = item_id
+
+            # Build the delay record up front (only when saving delay, not clearing)
+            # so all DB writes below can run in one parallel batch
+            delay_record = None
+            delay_completes_at = None
+            delay_node_id = None
             if not clear_delay_data and delay_node_dict:
-                from models.delay_data import DelayData
-                from datetime import timedelta
-                
                 delay_duration = delay_node_dict.get("delayDuration", 0)
                 delay_unit = delay_node_dict.get("delayUnit", "minutes")
                 wait_time_seconds = delay_node_dict.get("wait_time_seconds", 0)
-                
+
                 # Calculate wait_time_seconds if not provided
                 if wait_time_seconds == 0:
-                    if delay_unit == "seconds":
-                        wait_time_seconds = delay_duration
-                    elif delay_unit == "minutes":
-                        wait_time_seconds = delay_duration * 60
-                    elif delay_unit == "hours":
-                        wait_time_seconds = delay_duration * 3600
-                    elif delay_unit == "days":
-                        wait_time_seconds = delay_duration * 86400
-                
+                    wait_time_seconds = delay_duration * _UNIT_SECONDS.get(delay_unit, 0)
+
                 delay_started_at = datetime.utcnow()
                 delay_completes_at = delay_started_at + timedelta(seconds=wait_time_seconds)
-                
+
                 # Get delay_node_id from delay_node_dict
                 delay_node_id = delay_node_dict.get("id") if delay_node_dict else next_node_id
                 if not delay_node_id:
@@ -421,7 +791,9 @@ class UserStateService:
                         message=f"Cannot save delay record: delay_node_id is missing"
                     )
                 else:
-                    delay_record = DelayData(
+                    # model_construct skips pydantic validation - the fields
+                    # come from our own normalized node dict
+                    delay_record = DelayData.model_construct(
                         user_identifier=sender,
                         brand_id=brand_id,
                         flow_id=flow_id,
@@ -435,20 +807,64 @@ class UserStateService:
                         channel=channel,
                         channel_account_id=channel_account_id
                     )
-                    
-                    saved_delay = await self.flow_db.save_delay(delay_record)
-                    if saved_delay:
-                        self.log_util.info(
-                            service_name="UserStateService",
-                            message=f"Delay record saved with ID: {saved_delay.id}, completes at: {delay_completes_at}"
-                        )
-                    else:
-                        self.log_util.warning(
-                            service_name="UserStateService",
-                            message=f"Failed to save delay record for node {delay_node_id}"
-                        )
+
+            # The user-state update (with any validation state folded into the
+            # same $set) and the delay record insert are independent writes;
+            # run them concurrently so a delay transition pays one round-trip
+            # of latency instead of three
+            validation_failed = None
+            if validation_result:
+                if validation_result.get("status") == "mismatch_retry":
+                    validation_failed = True
+                elif reset_validation:
+                    # Only write the reset when the user actually carries
+                    # failed validation state - most transitions don't
+                    validation_failed = False
+
+            # Update user automation state with complete delay node object or clear it.
+            # When clearing, the user may have exited automation meanwhile (e.g.
+            # terminal node); a single conditional server-side update preserves
+            # that state instead of a read-then-write pair
+            db_ops = [self.flow_db.update_user_delay_state(
+                user_identifier=sender,
+                brand_id=brand_id,
+                flow_id=flow_id,
+                delay_node_id=next_node_id,
+                delay_node_data=delay_node_dict,
+                clear_delay_data=clear_delay_data,
+                channel=channel,
+                channel_account_id=channel_account_id,
+                validation_failed=validation_failed,
+                failure_message=fallback_message if validation_failed else None
+            )]
+
+            # Save delay record to database for background scheduler - queued
+            # so bursts of delay saves flush together via one insert_many
+            if delay_record is not None:
+                db_ops.append(self.flow_db.save_delay_batched(delay_record))
+
+            results = await asyncio.gather(*db_ops)
+
+            if delay_record is not None:
+                saved_delay = results[-1]
+                if saved_delay:
+                    self.log_util.info(
+                        service_name="UserStateService",
+                        message=f"Delay record saved with ID: {saved_delay.id}, completes at: {delay_completes_at}"
+                    )
+                else:
+                    self.log_util.warning(
+                        service_name="UserStateService",
+                        message=f"Failed to save delay record for node {delay_node_id}"
+                    )
             
             if clear_delay_data:
+                # Record the clear so duplicates arriving within the dedup
+                # window skip the write entirely
+                if len(self._recently_cleared_delays) >= 1024:
+                    self._recently_cleared_delays.clear()
+                    self._delay_clear_locks.clear()
+                self._recently_cleared_delays[clear_key] = time.monotonic()
                 self.log_util.info(
                     service_name="UserStateService",
                     message=f"Successfully cleared delay node data for user {sender}"
@@ -472,18 +888,59 @@ class UserStateService:
         except Exception as e:
             self.log_util.error(
                 service_name="UserStateService",
-                message=f"Error updating delay node state: {str(e)}"
-            )
-            import traceback
-            self.log_util.error(
-                service_name="UserStateService",
-                message=f"Traceback: {traceback.format_exc()}"
+                message=f"Error updating delay node state: {str(e)}",
+                exc_info=True
             )
             return {
                 "status": "error",
                     "message": f"Error updating delay node state: {str(e)}"
                 }
-    
+        finally:
+            if clear_lock is not None and clear_lock.locked():
+                clear_lock.release()
+
+    async def _cancel_delay_record(
+        self,
+        sender: str,
+        brand_id: int,
+        flow_id: Optional[str],
+        delay_node_id: str
+    ) -> None:
+        """
+        Atomically mark the user's pending delay record as processed (cancelled).
+        One round-trip, no race window between reading the record and cancelling
+        it; failures are logged but never raised to the caller.
+        """
+        client_data = self.flow_db._get_client_for_current_loop()
+        try:
+            delay_record = await client_data['collections']['delays'].find_one_and_update(
+                {
+                    "user_identifier": sender,
+                    "brand_id": brand_id,
+                    "flow_id": flow_id,
+                    "delay_node_id": delay_node_id,
+                    "processed": False
+                },
+                {
+                    "$set": {
+                        "processed": True,
+                        "updated_at": datetime.utcnow()
+                    }
+                },
+                projection={"_id": 1}
+            )
+
+            if delay_record:
+                self.log_util.info(
+                    service_name="UserStateService",
+                    message=f"[DELAY_INTERRUPT] Cancelled delay record {delay_record['_id']}"
+                )
+        except Exception as e:
+            self.log_util.warning(
+                service_name="UserStateService",
+                message=f"[DELAY_INTERRUPT] Error cancelling delay record: {str(e)}"
+            )
+
     async def _handle_delay_interrupt(
         self,
         metadata: "WebhookMetadata",
@@ -492,7 +949,8 @@ class UserStateService:
         sender: str,
         brand_id: int,
         channel: str,
-        channel_account_id: Optional[str]
+        channel_account_id: Optional[str] = None,
+        lead_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Handle user reply when user is in delay state.
@@ -522,16 +980,19 @@ class UserStateService:
                     "message": "No delay node data found"
                 }
             
-            # Check delayInterrupt flag
-            delay_interrupt = delay_node_data.get("delayInterrupt", False)
-            
+            # One slot-based view resolves the delay fields and result ids the
+            # rest of the handler needs, instead of repeated dict lookups
+            delay_view = DelayNodeView(delay_node_data)
+            delay_interrupt = delay_view.delay_interrupt
+
             self.log_util.info(
-                service_name="UserStateService",
-                message=f"[DELAY_INTERRUPT] User {sender} sent message during delay. delayInterrupt={delay_interrupt}"
+                "UserStateService",
+                "[DELAY_INTERRUPT] User %s sent message during delay. delayInterrupt=%s",
+                sender, delay_interrupt
             )
-            
+
             # Get delayResult array
-            delay_result = delay_node_data.get("delayResult", [])
+            delay_result = delay_view.delay_result
             if not delay_result or not isinstance(delay_result, list):
                 self.log_util.error(
                     service_name="UserStateService",
@@ -541,19 +1002,13 @@ class UserStateService:
                     "status": "error",
                     "message": "Invalid delayResult in delay_node_data"
                 }
-            
-            # Extract delay result IDs (the id field, not nodeResultId)
-            # These IDs are used as source_node_id in edges (e.g., "delay-node-xxx__interrupted" or "delay-node-xxx__not_interrupted")
-            interrupted_node_id = None
-            not_interrupted_node_id = None
-            for item in delay_result:
-                if isinstance(item, dict):
-                    item_id = item.get("id", "")
-                    if "__interrupted" in item_id:
-                        interrupted_node_id = item_id  # Use the delay result ID itself, not nodeResultId
-                    elif "__not_interrupted" in item_id:
-                        not_interrupted_node_id = item_id  # Use the delay result ID itself, not nodeResultId
-            
+
+            # Delay result IDs (the id field, not nodeResultId) resolved by the
+            # view - these IDs are used as source_node_id in edges (e.g.,
+            # "delay-node-xxx__interrupted" or "delay-node-xxx__not_interrupted")
+            interrupted_node_id = delay_view.interrupted_id
+            not_interrupted_node_id = delay_view.not_interrupted_id
+
             # Handle based on delayInterrupt flag
             if delay_interrupt:
                 # Interrupt enabled - process interrupted path
@@ -572,46 +1027,20 @@ class UserStateService:
                     message=f"[DELAY_INTERRUPT] Delay interrupted by user message, processing interruptedNodeId: {interrupted_node_id}"
                 )
                 
-                # Cancel delay record in database
-                # Find delay record by user_identifier, flow_id, and delay_node_id
-                delay_node_id = delay_node_data.get("id")
+                # Cancel the delay record concurrently with the interrupted-path
+                # processing - node processing doesn't depend on the cancellation,
+                # so the user-facing response doesn't wait for that round-trip
+                cancel_task = None
+                delay_node_id = delay_view.id
                 if delay_node_id:
-                    # Get all pending delays for this user
-                    from models.delay_data import DelayData
-                    client_data = self.flow_db._get_client_for_current_loop()
-                    try:
-                        from bson import ObjectId
-                        # Find delay record
-                        delay_record = await client_data['collections']['delays'].find_one({
-                            "user_identifier": sender,
-                            "brand_id": brand_id,
-                            "flow_id": existing_user.current_flow_id,
-                            "delay_node_id": delay_node_id,
-                            "processed": False
-                        })
-                        
-                        if delay_record:
-                            # Mark as processed (cancelled)
-                            await client_data['collections']['delays'].update_one(
-                                {"_id": delay_record["_id"]},
-                                {
-                                    "$set": {
-                                        "processed": True,
-                                        "updated_at": datetime.utcnow()
-                                    }
-                                }
-                            )
-                            self.log_util.info(
-                                service_name="UserStateService",
-                                message=f"[DELAY_INTERRUPT] Cancelled delay record {delay_record['_id']}"
-                            )
-                    except Exception as e:
-                        self.log_util.warning(
-                            service_name="UserStateService",
-                            message=f"[DELAY_INTERRUPT] Error cancelling delay record: {str(e)}"
-                        )
-                
-                # Process interrupted path
+                    cancel_task = asyncio.create_task(self._cancel_delay_record(
+                        sender=sender,
+                        brand_id=brand_id,
+                        flow_id=existing_user.current_flow_id,
+                        delay_node_id=delay_node_id
+                    ))
+
+                # Process interrupted path
                 node_service_response = await self.node_identification_service.identify_and_process_node(
                     metadata=metadata,
                     data=data,
@@ -620,10 +1049,15 @@ class UserStateService:
                     node_id_to_process=None,
                     current_node_id=interrupted_node_id,
                     flow_id=existing_user.current_flow_id,
-                    user_detail=existing_user.user_detail.model_dump() if existing_user.user_detail else None,
+                    user_detail=_get_user_detail_dict(existing_user),
                     lead_id=existing_user.lead_id if existing_user else None
                 )
-                
+
+                # Cancellation failures are logged inside the helper; just make
+                # sure it finished before moving on
+                if cancel_task is not None:
+                    await cancel_task
+
                 if node_service_response.get("status") == "success":
                     next_node_id = node_service_response.get("next_node_id")
                     if next_node_id:
@@ -689,18 +1123,380 @@ class UserStateService:
         except Exception as e:
             self.log_util.error(
                 service_name="UserStateService",
-                message=f"[DELAY_INTERRUPT] Error handling delay interrupt: {str(e)}"
-            )
-            import traceback
-            self.log_util.error(
-                service_name="UserStateService",
-                message=f"[DELAY_INTERRUPT] Traceback: {traceback.format_exc()}"
+                message=f"[DELAY_INTERRUPT] Error handling delay interrupt: {str(e)}",
+                exc_info=True
             )
             return {
                 "status": "error",
                 "message": f"Error handling delay interrupt: {str(e)}"
             }
     
+    async def _handle_delay_complete(
+        self,
+        metadata: "WebhookMetadata",
+        data: Dict[str, Any],
+        existing_user: "UserData",
+        sender: str,
+        brand_id: int,
+        channel: str,
+        channel_account_id: Optional[str] = None,
+        lead_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Handle a delay_complete webhook for a user in automation: resolve
+        the not-interrupted path from the stored delay data, run the next
+        node through the node service, and fold the delay-data clear into
+        the resulting state write.
+        """
+        # ========== DELAY COMPLETE WEBHOOK ==========
+        self.log_util.debug(
+            "UserStateService",
+            "[EXISTING_USER] Delay complete webhook received, processing next node"
+        )
+
+        # Validate delay node exists in user state
+        if not existing_user.delay_node_data:
+            self.log_util.warning(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] Cannot process delay_complete webhook: delay_node_data is missing in user state. User may have exited automation or delay was already processed."
+            )
+            return
+
+        # Get delay node ID from webhook data to validate it matches user state
+        delay_node_id_from_webhook = data.get("node_id") or (data.get("user_state_id") and None)  # Will be in original_message_body
+        # Note: delay_node_id is in original_message_body, not in normalized data
+        # We'll validate by checking if delay_node_data exists and has the expected structure
+
+        # Extract notInterruptedNodeId - prefer the id tagged at
+        # save time (one dict get, no delayResult needed); only
+        # delay data persisted before tagging existed falls back
+        # to validating and scanning the delayResult array
+        current_node_id_for_delay = existing_user.delay_node_data.get("_not_interrupted_id")
+        if not current_node_id_for_delay:
+            delay_result = existing_user.delay_node_data.get("delayResult")
+            if not delay_result or not isinstance(delay_result, list):
+                self.log_util.error(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Cannot process delay_complete webhook: delayResult is missing or invalid in delay_node_data"
+                )
+                return
+
+            # Should use delay result ID (e.g., "delay-node-xxx__not_interrupted") not nodeResultId
+            for item in delay_result:
+                if isinstance(item, dict):
+                    item_id = item.get("id", "")
+                    if item_id.endswith(NOT_INTERRUPTED_SUFFIX):
+                        # Use the delay result ID itself (e.g., "delay-node-xxx__not_interrupted")
+                        # This is used as source_node_id in edges
+                        current_node_id_for_delay = item_id
+                        break
+
+        if not current_node_id_for_delay:
+            self.log_util.error(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] Cannot process delay_complete webhook: __not_interrupted result ID is missing in delayResult"
+            )
+            return
+
+        self.log_util.debug(
+            "UserStateService",
+            "[EXISTING_USER] Extracted notInterruptedNodeId from delay_node_data: %s",
+            current_node_id_for_delay
+        )
+
+        # Prefetch the flow context concurrently with the node
+        # service call below; the successful-processing step
+        # consumes it and would otherwise pay the fetch on its
+        # own critical path
+        flow_context_prefetch = asyncio.ensure_future(
+            self._get_flow_context(existing_user.current_flow_id)
+        )
+
+        # Step 1: Call node service with:
+        # - node_id_to_process = null (node service identifies next node from delay node)
+        # - current_node_id = notInterruptedNodeId from delay_node_data
+        node_service_response = await self.node_identification_service.identify_and_process_node(
+            metadata=metadata,
+            data=data,
+            is_validation_error=False,
+            fallback_message=None,
+            node_id_to_process=None,
+            current_node_id=current_node_id_for_delay,
+            flow_id=existing_user.current_flow_id,
+            user_detail=None,
+            lead_id=lead_id
+        )
+
+        # The prefetch has been running behind the node service
+        # call; awaiting it here is a no-op on the common path
+        await flow_context_prefetch
+
+        # Step 2: Update user state based on node service response
+        if node_service_response.get("status") == "success":
+            next_node_id = node_service_response.get("next_node_id")
+            if next_node_id:
+                # Handle successful node processing
+                # (is_validation_error = False). The delay-data
+                # clear rides in the chain's final state write
+                # instead of a separate clearing update after
+                processed_value = node_service_response.get("processed_value")
+                await self._handle_successful_node_processing(
+                    metadata=metadata,
+                    data=data,
+                    next_node_id=next_node_id,
+                    flow_id=existing_user.current_flow_id,
+                    sender=sender,
+                    brand_id=brand_id,
+                    channel=channel,
+                    channel_account_id=existing_user.channel_account_id,
+                    validation_result=None,
+                    fallback_message=None,
+                    processed_value=processed_value,
+                    clear_delay_data=True
+                )
+
+                # Mark delay record as processed in database
+                # Find delay record by user_identifier, flow_id, and delay_node_id
+                # Note: We'll mark it as processed when delay_complete webhook is sent
+                # This is handled by the delay scheduler service
+
+                self.log_util.debug(
+                    "UserStateService",
+                    "[EXISTING_USER] Delay complete processed successfully, cleared delay_node_data, next_node_id: %s",
+                    next_node_id
+                )
+        else:
+            self.log_util.error(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] Node service failed for delay webhook: {node_service_response.get('message')}"
+            )
+
+    async def _handle_regular_reply(
+        self,
+        metadata: "WebhookMetadata",
+        data: Dict[str, Any],
+        existing_user: "UserData",
+        sender: str,
+        brand_id: int,
+        channel: str,
+        channel_account_id: Optional[str] = None,
+        lead_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Handle a regular message from a user parked at a node: run reply
+        validation when the node expects input, then hand the result to
+        the node service and update state accordingly.
+        """
+        # ========== REGULAR REPLY - CHECK VALIDATION ==========
+        # Extract user reply from data
+        user_reply = data.get("user_reply")
+
+        if not user_reply:
+            self.log_util.warning(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] Could not extract user reply from data"
+            )
+            return
+
+        # Get the cached flow context to check if current node
+        # has expected reply; the per-version node index makes
+        # the current-node lookup one dict get instead of a
+        # scan that dumps every node up to the match
+        flow_context = await self._get_flow_context(existing_user.current_flow_id)
+        if not flow_context:
+            self.log_util.error(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] ❌ Failed to retrieve flow with id: {existing_user.current_flow_id}"
+            )
+            return
+        flow = flow_context.flow
+
+        current_node = flow_context.nodes_by_id.get(existing_user.current_node_id)
+
+        if not current_node:
+            self.log_util.error(
+                service_name="UserStateService",
+                message=f"[EXISTING_USER] ❌ Current node {existing_user.current_node_id} not found in flow"
+            )
+            return
+
+        # Get node type from current node
+        node_type = current_node.get("type")
+
+        # Classify in memory via the static type tables (same
+        # tables the processing loop uses); only a type unknown
+        # to both falls back to the node_detail lookup
+        is_text = (node_type == "question")
+        if node_type in _USER_INPUT_TYPES:
+            has_expected_reply = True
+        elif node_type in _TRANSIENT_TYPES or node_type == "delay":
+            has_expected_reply = False
+        else:
+            node_detail = await self.flow_db.get_node_detail_by_id(node_type)
+            if node_detail:
+                has_expected_reply = node_detail.user_input_required
+            else:
+                # Fallback: if node_detail not found, check node type directly
+                self.log_util.warning(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Node detail not found for node_type: {node_type}, using fallback check"
+                )
+                has_expected_reply = node_type in ("button_question", "list_question", "trigger_template")
+
+        if has_expected_reply:
+            # ========== CURRENT NODE HAS EXPECTED REPLY - CALL VALIDATION SERVICE ==========
+            validation_params = await self._process_validation_and_get_node_service_params(
+                metadata=metadata,
+                data=data,
+                existing_user=existing_user,
+                flow=flow,
+                current_node=current_node,
+                node_type=node_type,
+                is_text=is_text,
+                sender=sender,
+                        brand_id=brand_id,
+                        channel=channel,
+                        channel_account_id=existing_user.channel_account_id
+                    )
+
+            # Check if validation_exit was handled (automation exited)
+            if validation_params.handled:
+                # Validation limit exceeded, automation already exited
+                    return
+
+            # Extract parameters for node identification service
+            is_validation_error = validation_params.is_validation_error
+            fallback_message = validation_params.fallback_message
+            node_id_to_process = validation_params.node_id_to_process
+            current_node_id_for_service = validation_params.current_node_id_for_service
+            validation_result = validation_params.validation_result
+
+            if not current_node_id_for_service:
+                self.log_util.error(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Cannot proceed: current_node_id_for_service is None/empty"
+                    )
+                return
+
+            self.log_util.debug(
+                "UserStateService",
+                "[EXISTING_USER] Calling NodeIdentificationService with: current_node_id=%s, node_id_to_process=%s, is_validation_error=%s",
+                current_node_id_for_service, node_id_to_process, is_validation_error
+            )
+
+            user_detail_dict = _get_user_detail_dict(existing_user)
+            node_service_response = await self.node_identification_service.identify_and_process_node(
+                metadata=metadata,
+                data=data,
+                is_validation_error=is_validation_error,
+                fallback_message=fallback_message,
+                node_id_to_process=node_id_to_process,
+                current_node_id=current_node_id_for_service,
+                flow_id=flow.id,
+                user_detail=user_detail_dict,
+                lead_id=lead_id
+            )
+
+            # Step 2: Update user state based on node service response (only after successful node processing)
+            if node_service_response.get("status") == "success":
+                next_node_id = node_service_response.get("next_node_id")
+                if next_node_id:
+                    # Use _handle_successful_node_processing for all cases (it handles both validation_error and normal cases)
+                    processed_value = node_service_response.get("processed_value")
+                    # The validation reset only needs writing if the user
+                    # actually carries failed state; most replies don't, and
+                    # skipping the reset keeps those writes smaller
+                    user_validation = getattr(existing_user, "validation", None)
+                    if isinstance(user_validation, dict):
+                        had_validation_failure = bool(
+                            user_validation.get("failed") or user_validation.get("failure_count", 0)
+                        )
+                    else:
+                        had_validation_failure = bool(
+                            getattr(user_validation, "failed", False)
+                            or getattr(user_validation, "failure_count", 0)
+                        )
+                    node_processing_result = await self._handle_successful_node_processing(
+                        metadata=metadata,
+                        data=data,
+                        next_node_id=next_node_id,
+                        flow_id=flow.id,
+                        sender=sender,
+                        brand_id=brand_id,
+                        channel=channel,
+                        channel_account_id=existing_user.channel_account_id,
+                        validation_result=validation_result,
+                        fallback_message=fallback_message,
+                        processed_value=processed_value,
+                        reset_validation=had_validation_failure
+                    )
+
+                    # If delay node was processed, return the delay response to webhook service
+                    if node_processing_result and node_processing_result.get("status") == "success" and node_processing_result.get("delay_node_id"):
+                        return self._get_status_for_webhook(
+                            status="triggered",
+                            message=node_processing_result.get("message", "Delay node processed successfully"),
+                            flow_id=flow.id
+                        )
+            else:
+                self.log_util.error(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Node service failed: {node_service_response.get('message')}"
+                )
+        else:
+            # ========== CURRENT NODE HAS NO EXPECTED REPLY - CALL NODE SERVICE DIRECTLY ==========
+            self.log_util.debug(
+                "UserStateService",
+                "[EXISTING_USER] Current node has no expected reply, calling node service directly"
+            )
+
+            # Step 1: Call node service with:
+            # - node_id_to_process = null (node service identifies next node via default edge)
+            # - current_node_id = current node ID
+            user_detail_dict = _get_user_detail_dict(existing_user)
+            node_service_response = await self.node_identification_service.identify_and_process_node(
+                metadata=metadata,
+                data=data,
+                is_validation_error=False,
+                fallback_message=None,
+                node_id_to_process=None,
+                current_node_id=existing_user.current_node_id,
+                flow_id=flow.id,
+                user_detail=user_detail_dict,
+                lead_id=lead_id
+            )
+
+            # Step 2: Update user state based on node service response
+            if node_service_response.get("status") == "success":
+                next_node_id = node_service_response.get("next_node_id")
+                if next_node_id:
+                    # Handle successful node processing (is_validation_error = False).
+                    # Response doesn't depend on the chain's
+                    # outcome, so it runs in the background
+                    processed_value = node_service_response.get("processed_value")
+                    self._spawn_node_processing(
+                        self._handle_successful_node_processing(
+                            metadata=metadata,
+                            data=data,
+                            next_node_id=next_node_id,
+                            flow_id=flow.id,
+                            sender=sender,
+                            brand_id=brand_id,
+                            channel=channel,
+                            channel_account_id=existing_user.channel_account_id,
+                            validation_result=None,
+                            fallback_message=None,
+                            processed_value=processed_value
+                        ),
+                        description=f"flow {flow.id} continuation",
+                        sender=metadata.sender
+                    )
+            else:
+                self.log_util.error(
+                    service_name="UserStateService",
+                    message=f"[EXISTING_USER] Node service failed: {node_service_response.get('message')}"
+                )
+
     async def _handle_successful_node_processing(
         self,
         metadata: "WebhookMetadata",
@@ -713,18 +1509,26 @@ class UserStateService:
         channel_account_id: Optional[str],
         validation_result: Optional[Dict[str, Any]] = None,
         fallback_message: Optional[str] = None,
-        processed_value: Optional[Any] = None
+        processed_value: Optional[Any] = None,
+        clear_delay_data: bool = False,
+        reset_validation: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Handle successful node processing when is_validation_error = False.
-        
-        Logic:
+        reset_validation=False skips the validation-reset write on success
+        for users who were never in a failed state.
+        clear_delay_data=True folds the user's pending delay-data clear into
+        whichever state write ends the chain (one round-trip instead of a
+        separate clearing update afterwards); if the chain ends without a
+        state write, the clear falls back to its own update.
+
+        Logic (driven iteratively, one loop pass per node hop):
         1. Check if processed node is user input type or delay type
            - If yes: Update user state DB
         2. If not user input or delay:
            - Check if processed node is terminal node (no outgoing edges)
            - If terminal: Update user state with is_in_automation = False
-           - If not terminal: Recursively call node identification service with processed node as current_node_id
+           - If not terminal: Call node identification service with processed node as current_node_id and continue the loop
         
         Args:
             metadata: WebhookMetadata
@@ -738,258 +1542,222 @@ class UserStateService:
             validation_result: Optional validation result (for validation state updates)
             fallback_message: Optional fallback message (for validation state updates)
         """
+        # Tracks whether the caller's delay-data clear still needs a write;
+        # the state update that ends the chain consumes it
+        pending_delay_clear = clear_delay_data
         try:
-            # Get flow to check node type and edges
-            flow = await self.flow_db.get_flow_by_id(flow_id)
-            if not flow:
+            # Get flow context (cached per flow version) to check node type and edges
+            flow_context = await self._get_flow_context(flow_id)
+            if not flow_context:
                 self.log_util.error(
                     service_name="UserStateService",
                     message=f"Flow {flow_id} not found for node processing"
                 )
                 return
-            
-            # Get next node data
-            def _node_to_dict(node: Any) -> Dict[str, Any]:
-                if hasattr(node, "model_dump"):
-                    return node.model_dump()
-                if isinstance(node, dict):
-                    return node
-                return dict(node)
-            
-            next_node_data = None
-            for node in flow.flowNodes:
-                node_dict = _node_to_dict(node)
-                if node_dict.get("id") == next_node_id:
-                    next_node_data = node_dict
-                    break
-            
-            if not next_node_data:
-                self.log_util.error(
-                    service_name="UserStateService",
-                    message=f"Next node {next_node_id} not found in flow"
-                )
-                return
-            
-            # Get node type
-            next_node_type = next_node_data.get("type")
-            
-            # Check if node is condition or delay (processed by internal node service)
-            if next_node_type == "condition" and processed_value:
-                # Condition node - use processed_value (yes/no node ID) as current_node_id for next call
-                self.log_util.info(
-                    service_name="UserStateService",
-                    message=f"Condition node processed, using processed_value {processed_value} as next node"
-                )
-                
-                # Call node identification service with processed_value as current_node_id
-                # Note: user_detail not available in this recursive call context
-                node_service_response = await self.node_identification_service.identify_and_process_node(
-                    metadata=metadata,
-                    data=data,
-                    is_validation_error=False,
-                    fallback_message=None,
-                    node_id_to_process=None,
-                    current_node_id=processed_value,  # Use yes/no node ID from condition
-                    flow_id=flow_id,
-                    user_detail=None,  # Not available in recursive condition node processing
-                    lead_id=None  # Not available in recursive condition node processing
-                )
-                
-                if node_service_response.get("status") == "success":
-                    next_next_node_id = node_service_response.get("next_node_id")
-                    if next_next_node_id:
-                        # Recursively handle successful node processing
-                        next_processed_value = node_service_response.get("processed_value")
-                        recursive_result = await self._handle_successful_node_processing(
-                            metadata=metadata,
-                            data=data,
-                            next_node_id=next_next_node_id,
-                            flow_id=flow_id,
-                            sender=sender,
-                            brand_id=brand_id,
-                            channel=channel,
-                            channel_account_id=channel_account_id,
-                            validation_result=validation_result,
-                            fallback_message=fallback_message,
-                            processed_value=next_processed_value
-                        )
-                        # Return recursive result (may be delay node response)
-                        return recursive_result
-                return None
-            
-            # Check if node is delay type
-            if next_node_type == "delay" and processed_value:
-                # Delay node - use separate function to update delay node state
-                delay_update_result = await self._update_delay_node_state(
-                    sender=sender,
-                            brand_id=brand_id,
-                    flow_id=flow_id,
-                            channel=channel,
-                    channel_account_id=channel_account_id,
-                    next_node_id=next_node_id,
-                    next_node_data=next_node_data,
-                    validation_result=validation_result,
-                    fallback_message=fallback_message,
-                    clear_delay_data=False
-                )
-                
-                # Return success response (will be sent back to webhook service)
-                return delay_update_result
-            
-            # Check if node is user input type or delay type
-            node_detail = await self.flow_db.get_node_detail_by_id(next_node_type)
-            is_user_input = False
-            is_delay = False
-            
-            if node_detail:
-                is_user_input = node_detail.user_input_required
-                is_delay = (next_node_type == "delay")
-            else:
-                # Fallback check
-                is_user_input = next_node_type in ("button_question", "list_question", "question", "trigger_template")
-                is_delay = (next_node_type == "delay")
-            
-            if is_user_input or is_delay:
-                # Update user state DB
-                self.log_util.info(
-                    service_name="UserStateService",
-                    message=f"Processed node {next_node_id} is user input or delay type, updating user state"
-                )
-                
-                # Update validation state if needed (for validation scenarios)
-                if validation_result:
-                    if validation_result.get("status") == "mismatch_retry":
-                        await self.flow_db.update_validation_state(
-                            user_identifier=sender,
-                            brand_id=brand_id,
-                            validation_failed=True,
-                            failure_message=fallback_message,
-                            channel=channel,
-                            channel_account_id=channel_account_id
-                        )
-                    else:
-                        await self.flow_db.update_validation_state(
-                            user_identifier=sender,
-                            brand_id=brand_id,
-                            validation_failed=False,
-                            failure_message=None,
-                            channel=channel,
-                            channel_account_id=channel_account_id
-                        )
-                
-                # Update user automation state
-                await self.flow_db.update_user_automation_state(
-                    user_identifier=sender,
-                    brand_id=brand_id,
-                    is_in_automation=True,
-                    current_flow_id=flow_id,
-                    current_node_id=next_node_id,
-                    channel=channel,
-                    channel_account_id=channel_account_id
-                )
-                
-                # Return success response
-                return {
-                    "status": "success",
-                    "message": f"User state updated for node {next_node_id}",
-                    "node_id": next_node_id
-                }
-            else:
-                # Not user input or delay - check if terminal node
-                edges = await self.flow_db.get_flow_edges(flow_id)
-                is_terminal = True
-                
-                # Check if node has outgoing edges
-                # Edges are objects with source_node_id and target_node_id attributes
-                for edge in edges:
-                    # Edge objects have source_node_id as an attribute, not in a dict
-                    source_node_id = edge.source_node_id if hasattr(edge, 'source_node_id') else None
-                    if source_node_id == next_node_id:
-                        is_terminal = False
-                        break
+            nodes_by_id = flow_context.nodes_by_id
+            source_ids = flow_context.source_ids
+            parks_user_by_id = flow_context.parks_user_by_id
 
-                if is_terminal:
-                    # Terminal node - exit automation
-                    self.log_util.info(
+            # Iterative driver: each pass handles one hop through the flow and
+            # the loop only exits at a boundary (delay, user input, terminal,
+            # or a node service miss). This replaces the old self-recursion,
+            # so deep transient chains don't grow the call stack and the flow
+            # context stays in locals across hops.
+            while True:
+                # Get next node data from the precomputed per-version index
+                next_node_data = nodes_by_id.get(next_node_id)
+
+                if not next_node_data:
+                    self.log_util.error(
                         service_name="UserStateService",
-                        message=f"Processed node {next_node_id} is terminal node, exiting automation"
+                        message=f"Next node {next_node_id} not found in flow"
                     )
-                    
-                    await self.flow_db.update_user_automation_state(
-                        user_identifier=sender,
-                        brand_id=brand_id,
-                        is_in_automation=False,
-                        current_flow_id=None,
-                        current_node_id=None,
-                        channel=channel,
-                        channel_account_id=channel_account_id
-                    )
-                else:
-                    # Not terminal - recursively call node identification service
+                    return
+
+                # Get node type
+                next_node_type = next_node_data.get("type")
+
+                # Check if node is condition (processed by internal node service)
+                if next_node_type == "condition" and processed_value:
+                    # Condition node - use processed_value (yes/no node ID) as current_node_id for next call
                     self.log_util.info(
-                        service_name="UserStateService",
-                        message=f"Processed node {next_node_id} is not terminal, processing next node"
+                        "UserStateService",
+                        "Condition node processed, using processed_value %s as next node",
+                        processed_value
                     )
-                    
-                    # Note: user_detail not available in this recursive call context
-                    node_service_response = await self.node_identification_service.identify_and_process_node(
+
+                    # Call node identification service with processed_value as
+                    # current_node_id (deduped against concurrent identical hops)
+                    node_service_response = await self._process_chained_node_deduped(
                         metadata=metadata,
                         data=data,
-                        is_validation_error=False,
-                        fallback_message=None,
-                        node_id_to_process=None,
-                        current_node_id=next_node_id,  # Use processed node as current node
-                        flow_id=flow_id,
-                        user_detail=None,  # Not available in recursive processing
-                        lead_id=None  # Not available in recursive processing
+                        current_node_id=processed_value,  # Use yes/no node ID from condition
+                        flow_id=flow_id
                     )
-                    
-                    # Handle the response recursively
+
                     if node_service_response.get("status") == "success":
                         next_next_node_id = node_service_response.get("next_node_id")
                         if next_next_node_id:
-                            # Recursively handle successful node processing
+                            # Continue the loop with the resolved node;
+                            # validation state carries through condition hops
+                            next_node_id = next_next_node_id
                             processed_value = node_service_response.get("processed_value")
-                            try:
-                                recursive_result = await self._handle_successful_node_processing(
-                                    metadata=metadata,
-                                    data=data,
-                                    next_node_id=next_next_node_id,
-                                    flow_id=flow_id,
-                                    sender=sender,
-                                    brand_id=brand_id,
-                                    channel=channel,
-                                    channel_account_id=channel_account_id,
-                                    validation_result=None,
-                                    fallback_message=None,
-                                    processed_value=processed_value
-                                )
-                                # Return recursive result (may be delay node response)
-                                return recursive_result
-                            except Exception as e:
-                                self.log_util.error(
-                                    service_name="UserStateService",
-                                    message=f"Error handling successful node processing: {str(e)}"
-                                )
-                                return {
-                                    "status": "error",
-                                    "message": f"Error handling successful node processing: {str(e)}"
-                                }
+                            continue
+                    return None
+
+                # Check if node is delay type
+                if next_node_type == "delay" and processed_value:
+                    # Delay node - use separate function to update delay node state.
+                    # Saving replaces delay_node_data wholesale, so a pending
+                    # clear is satisfied by the same write
+                    pending_delay_clear = False
+                    delay_update_result = await self._update_delay_node_state(
+                        sender=sender,
+                        brand_id=brand_id,
+                        flow_id=flow_id,
+                        channel=channel,
+                        channel_account_id=channel_account_id,
+                        next_node_id=next_node_id,
+                        next_node_data=next_node_data,
+                        validation_result=validation_result,
+                        fallback_message=fallback_message,
+                        clear_delay_data=False,
+                        reset_validation=reset_validation
+                    )
+
+                    # Return success response (will be sent back to webhook service)
+                    return delay_update_result
+
+                # Decide whether the node parks the user (waits for input).
+                # The classification was precomputed for every node when the
+                # flow context was built, so each hop is a dict lookup; only
+                # nodes of a type unknown to the tables (None) fall through
+                # to the node_detail lookup
+                parks_user = parks_user_by_id.get(next_node_id)
+                if parks_user is None:
+                    node_detail = await self.flow_db.get_node_detail_by_id(next_node_type)
+                    parks_user = node_detail.user_input_required if node_detail else False
+
+                if parks_user:
+                    # Update user state DB
+                    self.log_util.info(
+                        "UserStateService",
+                        "Processed node %s is user input or delay type, updating user state",
+                        next_node_id
+                    )
+
+                    # Update user automation state, folding any validation
+                    # state into the same write (one round-trip instead of two)
+                    validation_failed = None
+                    if validation_result:
+                        if validation_result.get("status") == "mismatch_retry":
+                            validation_failed = True
+                        elif reset_validation:
+                            # Only write the reset when the user actually
+                            # carries failed validation state
+                            validation_failed = False
+
+                    # Any pending delay-data clear rides along in the same write
+                    consume_delay_clear = pending_delay_clear
+                    pending_delay_clear = False
+                    await self.flow_db.update_user_automation_state(
+                        user_identifier=sender,
+                        brand_id=brand_id,
+                        is_in_automation=True,
+                        current_flow_id=flow_id,
+                        current_node_id=next_node_id,
+                        channel=channel,
+                        channel_account_id=channel_account_id,
+                        validation_failed=validation_failed,
+                        failure_message=fallback_message if validation_failed else None,
+                        clear_delay_data=consume_delay_clear
+                    )
+
+                    # Return success response
+                    return {
+                        "status": "success",
+                        "message": f"User state updated for node {next_node_id}",
+                        "node_id": next_node_id
+                    }
+
+                # Not user input or delay - terminal check against the
+                # precomputed adjacency set (no outgoing edge == terminal)
+                if next_node_id not in source_ids:
+                    # Terminal node - exit automation
+                    self.log_util.info(
+                        "UserStateService",
+                        "Processed node %s is terminal node, exiting automation",
+                        next_node_id
+                    )
+
+                    # Exiting automation nulls delay_node_data in the same
+                    # write, which satisfies any pending clear; the validation
+                    # reset rides along too so the next flow starts clean
+                    # without a second round-trip
+                    pending_delay_clear = False
+                    await self.flow_db.update_user_automation_state(
+                        user_identifier=sender,
+                        brand_id=brand_id,
+                        is_in_automation=False,
+                        current_flow_id=None,
+                        current_node_id=None,
+                        channel=channel,
+                        channel_account_id=channel_account_id,
+                        validation_failed=False
+                    )
+                    return None
+
+                # Not terminal - call node identification service for the next hop
+                self.log_util.info(
+                    "UserStateService",
+                    "Processed node %s is not terminal, processing next node",
+                    next_node_id
+                )
+
+                # Deduped against concurrent identical hops (user_detail is
+                # not available in this chained-hop context)
+                node_service_response = await self._process_chained_node_deduped(
+                    metadata=metadata,
+                    data=data,
+                    current_node_id=next_node_id,  # Use processed node as current node
+                    flow_id=flow_id
+                )
+
+                if node_service_response.get("status") == "success":
+                    next_next_node_id = node_service_response.get("next_node_id")
+                    if next_next_node_id:
+                        # Continue the loop with the resolved node; validation
+                        # state only applies to the first hop
+                        next_node_id = next_next_node_id
+                        processed_value = node_service_response.get("processed_value")
+                        validation_result = None
+                        fallback_message = None
+                        continue
+                return None
         except Exception as e:
             self.log_util.error(
                 service_name="UserStateService",
-                message=f"Error in _handle_successful_node_processing: {str(e)}"
-            )
-            import traceback
-            self.log_util.error(
-                service_name="UserStateService",
-                message=f"Traceback: {traceback.format_exc()}"
+                message=f"Error in _handle_successful_node_processing: {str(e)}",
+                exc_info=True
             )
             return {
                 "status": "error",
                 "message": f"Error in _handle_successful_node_processing: {str(e)}"
             }
-    
+        finally:
+            if pending_delay_clear:
+                # The chain ended without a state write (lookup miss or node
+                # service failure); clear the delay data on its own so the
+                # next message isn't treated as a delay interrupt
+                await self._update_delay_node_state(
+                    sender=sender,
+                    brand_id=brand_id,
+                    flow_id=flow_id,
+                    channel=channel,
+                    channel_account_id=channel_account_id,
+                    clear_delay_data=True
+                )
+
     def _get_status_for_webhook(
         self,
         status: str,
@@ -1011,12 +1779,9 @@ class UserStateService:
             Dict with status information for WebhookService
         """
         if status == "no_trigger":
-            return {
-                "status": "no_trigger",
-                "message": "No trigger matched",
-                "flow_id": None,
-                "trigger_node_id": None
-            }
+            # The fields are constant for this case; reuse the module-level
+            # dict instead of allocating a fresh one per unmatched message
+            return _NO_TRIGGER_RESPONSE
         # TODO: Add other status cases as needed
         return {
             "status": status,
@@ -1087,16 +1852,19 @@ class UserStateService:
                     message=f"[{user_type}] Trigger matched! Calling node service with trigger_node_id: {trigger_node_id}"
                 )
                 
+                # Prefetch the flow context concurrently with the node-service
+                # call - the processing chain below needs it, so overlapping
+                # the two round-trips hides the flow read behind the node call
+                flow_context_prefetch = asyncio.ensure_future(self._get_flow_context(flow_id))
+
                 # Step 1: Call node service first (don't update user state yet)
                 # - node_id_to_process = null (node service identifies next node from trigger node)
                 # - current_node_id = trigger_node_id
-                user_detail_dict = None
-                if existing_user and existing_user.user_detail:
-                    user_detail_dict = existing_user.user_detail.model_dump()
-                
+                user_detail_dict = _get_user_detail_dict(existing_user)
+
                 # Get lead_id from existing_user if available
                 lead_id_for_trigger = existing_user.lead_id if existing_user and hasattr(existing_user, 'lead_id') else None
-                
+
                 node_service_response = await self.node_identification_service.identify_and_process_node(
                     metadata=metadata,
                     data=data,
@@ -1109,6 +1877,10 @@ class UserStateService:
                     lead_id=lead_id_for_trigger
                 )
 
+                # The prefetch has warmed the flow-context cache for the
+                # processing chain; its result isn't needed here
+                await flow_context_prefetch
+
                 # Step 2: Check node service response
                 if node_service_response.get("status") == "success":
                     next_node_id = node_service_response.get("next_node_id")
@@ -1118,22 +1890,29 @@ class UserStateService:
                             message=f"[{user_type}] Node service processed successfully, next_node_id: {next_node_id}"
                         )
                         
-                        # Step 3: Handle successful node processing (is_validation_error = False)
+                        # Step 3: Handle successful node processing (is_validation_error = False).
+                        # The result is not part of the webhook response here,
+                        # so the chain runs in the background and the webhook
+                        # is acknowledged as soon as the trigger has fired
                         processed_value = node_service_response.get("processed_value")
-                        await self._handle_successful_node_processing(
-                            metadata=metadata,
-                            data=data,
-                            next_node_id=next_node_id,
-                            flow_id=flow_id,
-                            sender=sender,
-                            brand_id=brand_id,
-                            channel=channel,
-                            channel_account_id=final_channel_account_id,
-                            validation_result=None,
-                            fallback_message=None,
-                            processed_value=processed_value
+                        self._spawn_node_processing(
+                            self._handle_successful_node_processing(
+                                metadata=metadata,
+                                data=data,
+                                next_node_id=next_node_id,
+                                flow_id=flow_id,
+                                sender=sender,
+                                brand_id=brand_id,
+                                channel=channel,
+                                channel_account_id=final_channel_account_id,
+                                validation_result=None,
+                                fallback_message=None,
+                                processed_value=processed_value
+                            ),
+                            description=f"trigger flow {flow_id}",
+                            sender=metadata.sender
                         )
-                        
+
                         # Step 4: Return status to WebhookService
                         return self._get_status_for_webhook(
                             status="triggered",
@@ -1165,10 +1944,43 @@ class UserStateService:
         metadata: "WebhookMetadata",
         data: Dict[str, Any],
         channel_account_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Serialize processing per sender, then delegate to the main handler.
+        Concurrent messages from one user would each re-read user state and
+        race the delay/automation updates; a sharded lock (sender hash mod
+        shard count, bounding memory) makes them run back-to-back so each
+        message sees the state the previous one wrote.
+
+        If the handler spawns a background node-processing chain, the chain
+        takes over this lock (see _spawn_node_processing) and releases it when
+        the user's state is settled, so the early webhook acknowledgment
+        doesn't let the next message in before the chain's state writes.
+        """
+        lock = self._sender_locks[hash(metadata.sender) % _SENDER_LOCK_SHARDS]
+        await lock.acquire()
+        handoff = [False]
+        token = _sender_lock_handoff.set(handoff)
+        try:
+            return await self._check_and_process_user_with_flow(
+                metadata=metadata,
+                data=data,
+                channel_account_id=channel_account_id
+            )
+        finally:
+            _sender_lock_handoff.reset(token)
+            if not handoff[0]:
+                lock.release()
+
+    async def _check_and_process_user_with_flow(
+        self,
+        metadata: "WebhookMetadata",
+        data: Dict[str, Any],
+        channel_account_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Check/create user and process flow automation based on user state.
-        
+
         Flow:
         1. If user doesn't exist: create user → check triggers → if match, call node service with trigger_node_id
         2. If user exists and in automation:
@@ -1196,10 +2008,24 @@ class UserStateService:
                     # Use user_state_id from data instead of sender
                     sender = user_state_id
                     self.log_util.info(
-                        service_name="UserStateService",
-                        message=f"[DELAY_COMPLETE] Using user_state_id from data: {user_state_id}"
+                        "UserStateService",
+                        "[DELAY_COMPLETE] Using user_state_id from data: %s",
+                        user_state_id
                     )
             
+            # Overlap the user-state read with a flow-context warm for the
+            # flow this sender was last seen in. The real flow_id is only
+            # known once the user row arrives, so the hint from the previous
+            # message stands in for it; on a hit (users rarely switch flows
+            # mid-conversation) the context is ready when the handlers ask
+            # for it, hiding one DB round-trip behind the other
+            hint_key = (sender, brand_id)
+            hinted_flow_id = self._sender_flow_hints.get(hint_key)
+            if hinted_flow_id:
+                warm_task = asyncio.ensure_future(self._get_flow_context(hinted_flow_id))
+                self._background_tasks.add(warm_task)
+                warm_task.add_done_callback(self._background_tasks.discard)
+
             existing_user = await self.flow_db.get_user_data(
                 user_identifier=sender,
                 brand_id=brand_id,
@@ -1207,6 +2033,15 @@ class UserStateService:
                 channel_account_id=channel_account_id
             )
 
+            # Refresh the hint from what we just read so the next message
+            # for this sender prefetches the right flow
+            if existing_user is not None and existing_user.is_in_automation and existing_user.current_flow_id:
+                if len(self._sender_flow_hints) >= _SENDER_FLOW_HINT_MAX_ENTRIES:
+                    self._sender_flow_hints.clear()
+                self._sender_flow_hints[hint_key] = existing_user.current_flow_id
+            else:
+                self._sender_flow_hints.pop(hint_key, None)
+
             if existing_user is None:
                 # ========== SCENARIO 1: NEW USER (NOT IN AUTOMATION) ==========
                 self.log_util.info(
@@ -1224,21 +2059,34 @@ class UserStateService:
                 email = user_detail.email
                 
                 # Extract additional user info from data if available
-                first_name = data.get("first_name") or data.get("firstName")
-                last_name = data.get("last_name") or data.get("lastName")
-                address = data.get("address")
+                lead_fields = _extract_lead_fields(data)
                 
-                # Get or create lead
-                lead_id = await self.lead_management_service.get_or_create_lead(
-                    phone=phone,
-                    email=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                    address=address,
+                # Get or create lead (external service) concurrently with the
+                # user insert - the lead call dominates the new-user latency,
+                # so overlapping the two pays max(RTT) instead of their sum.
+                # A single cross-store transaction isn't possible here because
+                # leads live behind the lead management API, not our database
+                new_user = UserData(
+                    user_detail=user_detail,
                     brand_id=brand_id,
-                    user_id=user_id
+                    user_id=user_id,
+                    lead_id=None,
+                    channel=channel,
+                    channel_account_id=channel_account_id
                 )
-                
+                lead_id, saved_user = await asyncio.gather(
+                    self.lead_management_service.get_or_create_lead(
+                        phone=phone,
+                        email=email,
+                        first_name=lead_fields.first_name,
+                        last_name=lead_fields.last_name,
+                        address=lead_fields.address,
+                        brand_id=brand_id,
+                        user_id=user_id
+                    ),
+                    self.flow_db.save_user_data(new_user)
+                )
+
                 if not lead_id:
                     self.log_util.warning(
                         service_name="UserStateService",
@@ -1249,17 +2097,7 @@ class UserStateService:
                         service_name="UserStateService",
                         message=f"Got lead_id: {lead_id} for user: {sender}"
                     )
-                
-                # Step 3: Create user in user state with lead_id
-                new_user = UserData(
-                    user_detail=user_detail,
-                    brand_id=brand_id,
-                    user_id=user_id,
-                    lead_id=lead_id,
-                    channel=channel,
-                    channel_account_id=channel_account_id
-                )
-                saved_user = await self.flow_db.save_user_data(new_user)
+
                 if not saved_user:
                     self.log_util.error(
                         service_name="UserStateService",
@@ -1270,11 +2108,22 @@ class UserStateService:
                         message=f"Failed to create user record for user: {sender}"
                     )
                 
+                if lead_id:
+                    # Backfill the lead_id persisted concurrently with the
+                    # lead call; downstream processing reads it from the
+                    # in-memory object right away
+                    saved_user.lead_id = lead_id
+                    backfill_task = asyncio.create_task(
+                        self.flow_db.update_user_lead_id(saved_user.id, lead_id)
+                    )
+                    self._background_tasks.add(backfill_task)
+                    backfill_task.add_done_callback(self._background_tasks.discard)
+
                 self.log_util.info(
                     service_name="UserStateService",
                     message=f"Created new user record for user: {sender}, brand_id: {brand_id}, lead_id: {lead_id}"
                 )
-                
+
                 # Check for triggers and initiate flow if matched (new user, not in automation)
                 # Pass saved_user (which contains lead_id) as existing_user for trigger flow
                 return await self._check_triggers_and_initiate_flow(
@@ -1290,9 +2139,13 @@ class UserStateService:
             else:
                 # ========== SCENARIO 2: EXISTING USER ==========
                 self.log_util.info(
-                    service_name="UserStateService",
-                    message=f"[EXISTING_USER] Processing existing user {sender}, is_in_automation: {existing_user.is_in_automation}, current_flow_id: {existing_user.current_flow_id}, current_node_id: {existing_user.current_node_id}"
+                    "UserStateService",
+                    "[EXISTING_USER] Processing existing user %s, is_in_automation: %s, current_flow_id: %s, current_node_id: %s",
+                    sender, existing_user.is_in_automation, existing_user.current_flow_id, existing_user.current_node_id
                 )
+
+                # Resolved once for every node service call in this branch
+                lead_id = getattr(existing_user, 'lead_id', None)
                 
                 # Handle delay_complete webhooks - check if user has delay_node_data
                 if message_type == "delay_complete":
@@ -1317,338 +2170,55 @@ class UserStateService:
                     and (existing_user.current_node_id or message_type == "delay_complete")  # Allow delay_complete even if current_node_id is None
                 ):
                     # ========== USER IN AUTOMATION ==========
-                    self.log_util.info(
-                        service_name="UserStateService",
-                        message=f"[EXISTING_USER] User is in automation, flow_id: {existing_user.current_flow_id}, current_node_id: {existing_user.current_node_id}"
+                    # Per-step logs in this branch are debug level: the entry
+                    # log above already carries the automation fields, so each
+                    # message emits one info record instead of half a dozen
+                    self.log_util.debug(
+                        "UserStateService",
+                        "[EXISTING_USER] User is in automation, flow_id: %s, current_node_id: %s",
+                        existing_user.current_flow_id, existing_user.current_node_id
                     )
                     
-                    # Check if user is in delay state and has delay_node_data
-                    if existing_user.delay_node_data and message_type != "delay_complete":
-                        # User is in delay state and sent a message - check for interrupt
-                        return await self._handle_delay_interrupt(
+                    # Scenario dispatch: delay interrupt (message during a
+                    # delay), delay completion, or a regular reply - the
+                    # decision collapses to one dict lookup over handlers
+                    # bound at __init__
+                    handler = self._automation_dispatch[(
+                        message_type == "delay_complete",
+                        bool(existing_user.delay_node_data)
+                    )]
+                    try:
+                        return await handler(
                             metadata=metadata,
                             data=data,
                             existing_user=existing_user,
                             sender=sender,
                             brand_id=brand_id,
                             channel=channel,
-                            channel_account_id=channel_account_id
-                    )
-                    
-                    # Check if delay_complete webhook
-                    if message_type == "delay_complete":
-                        # ========== DELAY COMPLETE WEBHOOK ==========
-                        self.log_util.info(
-                            service_name="UserStateService",
-                            message=f"[EXISTING_USER] Delay complete webhook received, processing next node"
+                            channel_account_id=channel_account_id,
+                            lead_id=lead_id
                         )
-                        
-                        # Validate delay node exists in user state
-                        if not existing_user.delay_node_data:
-                            self.log_util.warning(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Cannot process delay_complete webhook: delay_node_data is missing in user state. User may have exited automation or delay was already processed."
-                            )
-                            return
-                        
-                        # Get delay node ID from webhook data to validate it matches user state
-                        delay_node_id_from_webhook = data.get("node_id") or (data.get("user_state_id") and None)  # Will be in original_message_body
-                        # Note: delay_node_id is in original_message_body, not in normalized data
-                        # We'll validate by checking if delay_node_data exists and has the expected structure
-                        
-                        delay_result = existing_user.delay_node_data.get("delayResult")
-                        if not delay_result or not isinstance(delay_result, list):
-                            self.log_util.error(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Cannot process delay_complete webhook: delayResult is missing or invalid in delay_node_data"
-                            )
-                            return
-                        
-                        # Extract notInterruptedNodeId from array format
-                        # Should use delay result ID (e.g., "delay-node-xxx__not_interrupted") not nodeResultId
-                        current_node_id_for_delay = None
-                        for item in delay_result:
-                            if isinstance(item, dict):
-                                item_id = item.get("id", "")
-                                if "__not_interrupted" in item_id:
-                                    # Use the delay result ID itself (e.g., "delay-node-xxx__not_interrupted")
-                                    # This is used as source_node_id in edges
-                                    current_node_id_for_delay = item_id
-                                    break
-                        
-                        if not current_node_id_for_delay:
-                            self.log_util.error(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Cannot process delay_complete webhook: __not_interrupted result ID is missing in delayResult"
-                            )
-                            return
-                        
-                        self.log_util.info(
-                            service_name="UserStateService",
-                            message=f"[EXISTING_USER] Extracted notInterruptedNodeId from delay_node_data: {current_node_id_for_delay}"
+                    except Exception:
+                        # Per-branch boundary: name the scenario that failed
+                        # and keep the traceback, instead of the generic
+                        # method-wide log the outer handler would emit
+                        branch = handler.__name__.lstrip("_")
+                        self.log_util.error(
+                            "UserStateService",
+                            "[%s] Error processing in-automation message for user %s, flow %s",
+                            branch, sender, existing_user.current_flow_id,
+                            exc_info=True
                         )
-                        
-                        # Step 1: Call node service with:
-                        # - node_id_to_process = null (node service identifies next node from delay node)
-                        # - current_node_id = notInterruptedNodeId from delay_node_data
-                        node_service_response = await self.node_identification_service.identify_and_process_node(
-                            metadata=metadata,
-                            data=data,
-                            is_validation_error=False,
-                            fallback_message=None,
-                            node_id_to_process=None,
-                            current_node_id=current_node_id_for_delay,
-                            flow_id=existing_user.current_flow_id,
-                            user_detail=None,
-                            lead_id=existing_user.lead_id if existing_user and hasattr(existing_user, 'lead_id') else None
+                        return self._get_status_for_webhook(
+                            status="error",
+                            message=f"Error in {branch} for user {sender}",
+                            flow_id=existing_user.current_flow_id
                         )
-                        
-                        # Step 2: Update user state based on node service response
-                        if node_service_response.get("status") == "success":
-                            next_node_id = node_service_response.get("next_node_id")
-                            if next_node_id:
-                                # Handle successful node processing (is_validation_error = False)
-                                processed_value = node_service_response.get("processed_value")
-                                await self._handle_successful_node_processing(
-                                    metadata=metadata,
-                                    data=data,
-                                    next_node_id=next_node_id,
-                                    flow_id=existing_user.current_flow_id,
-                                    sender=sender,
-                                    brand_id=brand_id,
-                                    channel=channel,
-                                    channel_account_id=existing_user.channel_account_id,
-                                    validation_result=None,
-                                    fallback_message=None,
-                                    processed_value=processed_value
-                                )
-                                
-                                # Step 3: Clear delay_node_data after successful next node processing
-                                await self._update_delay_node_state(
-                                    sender=sender,
-                                    brand_id=brand_id,
-                                    flow_id=existing_user.current_flow_id,
-                                    channel=channel,
-                                    channel_account_id=existing_user.channel_account_id,
-                                    clear_delay_data=True
-                                )
-                                
-                                # Mark delay record as processed in database
-                                # Find delay record by user_identifier, flow_id, and delay_node_id
-                                from models.delay_data import DelayData
-                                # Note: We'll mark it as processed when delay_complete webhook is sent
-                                # This is handled by the delay scheduler service
-                                
-                                self.log_util.info(
-                                    service_name="UserStateService",
-                                    message=f"[EXISTING_USER] Delay complete processed successfully, cleared delay_node_data, next_node_id: {next_node_id}"
-                                )
-                        else:
-                            self.log_util.error(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Node service failed for delay webhook: {node_service_response.get('message')}"
-                            )
-                    else:
-                        # ========== REGULAR REPLY - CHECK VALIDATION ==========
-                        # Extract user reply from data
-                        user_reply = data.get("user_reply")
-                        
-                        if not user_reply:
-                            self.log_util.warning(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Could not extract user reply from data"
-                            )
-                            return
-                        
-                        # Get flow to check if current node has expected reply
-                        flow = await self.flow_db.get_flow_by_id(existing_user.current_flow_id)
-                        if not flow:
-                            self.log_util.error(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] ❌ Failed to retrieve flow with id: {existing_user.current_flow_id}"
-                            )
-                            return
-                        
-                        # Check if current node has expected reply using node_details database
-                        def _node_to_dict(node: Any) -> Dict[str, Any]:
-                            if hasattr(node, "model_dump"):
-                                return node.model_dump()
-                            if isinstance(node, dict):
-                                return node
-                            return dict(node)
-                        
-                        current_node = None
-                        for node in flow.flowNodes:
-                            node_dict = _node_to_dict(node)
-                            if node_dict.get("id") == existing_user.current_node_id:
-                                current_node = node_dict
-                                break
-                        
-                        if not current_node:
-                            self.log_util.error(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] ❌ Current node {existing_user.current_node_id} not found in flow"
-                            )
-                            return
-                        
-                        # Get node type from current node
-                        node_type = current_node.get("type")
-                        
-                        # Get node detail from database to check if it requires user input
-                        node_detail = await self.flow_db.get_node_detail_by_id(node_type)
-                        has_expected_reply = False
-                        is_text = False
-                        
-                        if node_detail:
-                            has_expected_reply = node_detail.user_input_required
-                            # Check if node type is "question" (text question)
-                            is_text = (node_type == "question")
-                        else:
-                            # Fallback: if node_detail not found, check node type directly
-                            self.log_util.warning(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Node detail not found for node_type: {node_type}, using fallback check"
-                            )
-                            has_expected_reply = node_type in ("button_question", "list_question", "trigger_template")
-                            is_text = (node_type == "question")
-                        
-                        if has_expected_reply:
-                            # ========== CURRENT NODE HAS EXPECTED REPLY - CALL VALIDATION SERVICE ==========
-                            validation_params = await self._process_validation_and_get_node_service_params(
-                                metadata=metadata,
-                                data=data,
-                                existing_user=existing_user,
-                                flow=flow,
-                                current_node=current_node,
-                                node_type=node_type,
-                                is_text=is_text,
-                                sender=sender,
-                                        brand_id=brand_id,
-                                        channel=channel,
-                                        channel_account_id=existing_user.channel_account_id
-                                    )
-                            
-                            # Check if validation_exit was handled (automation exited)
-                            if validation_params.get("handled"):
-                                # Validation limit exceeded, automation already exited
-                                    return
-                            
-                            # Extract parameters for node identification service
-                            is_validation_error = validation_params.get("is_validation_error", False)
-                            fallback_message = validation_params.get("fallback_message")
-                            node_id_to_process = validation_params.get("node_id_to_process")
-                            current_node_id_for_service = validation_params.get("current_node_id_for_service")
-                            validation_result = validation_params.get("validation_result")
-                            
-                            if not current_node_id_for_service:
-                                self.log_util.error(
-                                    service_name="UserStateService",
-                                    message=f"[EXISTING_USER] Cannot proceed: current_node_id_for_service is None/empty"
-                                    )
-                                return
-                            
-                            self.log_util.info(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Calling NodeIdentificationService with: current_node_id={current_node_id_for_service}, node_id_to_process={node_id_to_process}, is_validation_error={is_validation_error}"
-                            )
-                            
-                            user_detail_dict = existing_user.user_detail.model_dump() if existing_user.user_detail else None
-                            node_service_response = await self.node_identification_service.identify_and_process_node(
-                                metadata=metadata,
-                                data=data,
-                                is_validation_error=is_validation_error,
-                                fallback_message=fallback_message,
-                                node_id_to_process=node_id_to_process,
-                                current_node_id=current_node_id_for_service,
-                                flow_id=flow.id,
-                                user_detail=user_detail_dict,
-                                lead_id=existing_user.lead_id if existing_user and hasattr(existing_user, 'lead_id') else None
-                            )
-                            
-                            # Step 2: Update user state based on node service response (only after successful node processing)
-                            if node_service_response.get("status") == "success":
-                                next_node_id = node_service_response.get("next_node_id")
-                                if next_node_id:
-                                    # Use _handle_successful_node_processing for all cases (it handles both validation_error and normal cases)
-                                    processed_value = node_service_response.get("processed_value")
-                                    node_processing_result = await self._handle_successful_node_processing(
-                                        metadata=metadata,
-                                        data=data,
-                                        next_node_id=next_node_id,
-                                        flow_id=flow.id,
-                                        sender=sender,
-                                        brand_id=brand_id,
-                                        channel=channel,
-                                        channel_account_id=existing_user.channel_account_id,
-                                        validation_result=validation_result,
-                                        fallback_message=fallback_message,
-                                            processed_value=processed_value
-                                    )
-                                    
-                                    # If delay node was processed, return the delay response to webhook service
-                                    if node_processing_result and node_processing_result.get("status") == "success" and node_processing_result.get("delay_node_id"):
-                                        return self._get_status_for_webhook(
-                                            status="triggered",
-                                            message=node_processing_result.get("message", "Delay node processed successfully"),
-                                            flow_id=flow.id
-                                        )
-                            else:
-                                self.log_util.error(
-                                    service_name="UserStateService",
-                                    message=f"[EXISTING_USER] Node service failed: {node_service_response.get('message')}"
-                                )
-                        else:
-                            # ========== CURRENT NODE HAS NO EXPECTED REPLY - CALL NODE SERVICE DIRECTLY ==========
-                            self.log_util.info(
-                                service_name="UserStateService",
-                                message=f"[EXISTING_USER] Current node has no expected reply, calling node service directly"
-                            )
-                            
-                            # Step 1: Call node service with:
-                            # - node_id_to_process = null (node service identifies next node via default edge)
-                            # - current_node_id = current node ID
-                            user_detail_dict = existing_user.user_detail.model_dump() if existing_user.user_detail else None
-                            node_service_response = await self.node_identification_service.identify_and_process_node(
-                                metadata=metadata,
-                                data=data,
-                                is_validation_error=False,
-                                fallback_message=None,
-                                node_id_to_process=None,
-                                current_node_id=existing_user.current_node_id,
-                                flow_id=flow.id,
-                                user_detail=user_detail_dict,
-                                lead_id=existing_user.lead_id if existing_user and hasattr(existing_user, 'lead_id') else None
-                            )
-                            
-                            # Step 2: Update user state based on node service response
-                            if node_service_response.get("status") == "success":
-                                next_node_id = node_service_response.get("next_node_id")
-                                if next_node_id:
-                                    # Handle successful node processing (is_validation_error = False)
-                                    processed_value = node_service_response.get("processed_value")
-                                    await self._handle_successful_node_processing(
-                                        metadata=metadata,
-                                        data=data,
-                                        next_node_id=next_node_id,
-                                        flow_id=flow.id,
-                                        sender=sender,
-                                        brand_id=brand_id,
-                                        channel=channel,
-                                        channel_account_id=existing_user.channel_account_id,
-                                        validation_result=None,
-                                        fallback_message=None,
-                                        processed_value=processed_value
-                                    )
-                            else:
-                                self.log_util.error(
-                                    service_name="UserStateService",
-                                    message=f"[EXISTING_USER] Node service failed: {node_service_response.get('message')}"
-                                )
                 else:
                     # ========== USER EXISTS BUT NOT IN AUTOMATION ==========
-                    self.log_util.info(
-                        service_name="UserStateService",
-                        message=f"[EXISTING_USER] User not in automation, checking triggers"
+                    self.log_util.debug(
+                        "UserStateService",
+                        "[EXISTING_USER] User not in automation, checking triggers"
                     )
                     
                     # Check for triggers and initiate flow if matched (existing user, not in automation)
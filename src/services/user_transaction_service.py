@@ -4,6 +4,7 @@ Handles user transaction data processing and storage.
 Receives processed node data from NodeIdentificationService.
 """
 from typing import Optional, Dict, Any, TYPE_CHECKING
+import traceback
 from utils.log_utils import LogUtil
 
 if TYPE_CHECKING:
@@ -112,7 +113,6 @@ class UserTransactionService:
                 service_name="UserTransactionService",
                 message=f"Error processing transaction: {str(e)}"
             )
-            import traceback
             self.log_util.error(
                 service_name="UserTransactionService",
                 message=f"Traceback: {traceback.format_exc()}"
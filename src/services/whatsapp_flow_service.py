@@ -1,6 +1,13 @@
 from typing import Optional, Dict, Any, List
 import httpx
 
+try:
+    # Faster encoder for the outbound node-process payload; next_node_data
+    # can carry large templates, where orjson beats stdlib json severalfold
+    import orjson
+except ImportError:
+    orjson = None
+
 # Utils
 from utils.log_utils import LogUtil
 
@@ -13,6 +20,42 @@ from models.request.process_node_request import ProcessNodeRequest
 from models.response.process_node_response import ProcessNodeResponse
 
 
+def _extract_button(message_body: Dict[str, Any]) -> Optional[str]:
+    button = message_body.get("button")
+    if button is None:
+        return None
+    return button.get("text", button.get("payload", ""))
+
+
+def _extract_text(message_body: Dict[str, Any]) -> Optional[str]:
+    text = message_body.get("text")
+    if text is None:
+        return None
+    return text.get("body", "")
+
+
+def _extract_interactive(message_body: Dict[str, Any]) -> Optional[str]:
+    interactive_data = message_body.get("interactive")
+    if interactive_data is None:
+        return None
+    if interactive_data.get("type") == "button_reply":
+        button_reply = interactive_data.get("button_reply", {})
+        return button_reply.get("title", button_reply.get("id", ""))
+    if interactive_data.get("type") == "list_reply":
+        list_reply = interactive_data.get("list_reply", {})
+        return list_reply.get("title", list_reply.get("id", ""))
+    return None
+
+
+# Raw-message extractors by message_type - one dict lookup per message
+# instead of walking an if/elif chain of string comparisons
+_EXTRACTORS = {
+    "button": _extract_button,
+    "text": _extract_text,
+    "interactive": _extract_interactive,
+}
+
+
 class WhatsAppFlowService:
     def __init__(
         self,
@@ -24,6 +67,19 @@ class WhatsAppFlowService:
         self.flow_db = flow_db
         # Default to localhost, but can be overridden for different deployments
         self.node_process_api_url = node_process_api_url or "http://localhost:8017/whatsapp/node/process"
+        # One shared client for all node-process calls: connections stay warm
+        # across requests instead of paying pool setup plus a TCP handshake
+        # per call. Closed via aclose() at application shutdown.
+        self._http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        )
+
+    async def aclose(self):
+        """
+        Close the shared HTTP client. Wired to application shutdown.
+        """
+        await self._http_client.aclose()
 
     def _extract_user_input(self, message_type: str, message_body: Dict[str, Any]) -> Optional[str]:
         """
@@ -33,22 +89,12 @@ class WhatsAppFlowService:
         # First check for normalized user_reply (from webhook adapter)
         if "user_reply" in message_body:
             return message_body["user_reply"]
-        
-        # Fall back to raw message structure
-        user_input = None
-        if message_type == "button" and "button" in message_body:
-            user_input = message_body["button"].get("text", message_body["button"].get("payload", ""))
-        elif message_type == "text" and "text" in message_body:
-            user_input = message_body["text"].get("body", "")
-        elif message_type == "interactive" and "interactive" in message_body:
-            interactive_data = message_body.get("interactive", {})
-            if interactive_data.get("type") == "button_reply":
-                button_reply = interactive_data.get("button_reply", {})
-                user_input = button_reply.get("title", button_reply.get("id", ""))
-            elif interactive_data.get("type") == "list_reply":
-                list_reply = interactive_data.get("list_reply", {})
-                user_input = list_reply.get("title", list_reply.get("id", ""))
-        return user_input
+
+        # Fall back to raw message structure via the extractor table
+        extractor = _EXTRACTORS.get(message_type)
+        if extractor is None:
+            return None
+        return extractor(message_body)
 
     async def handle_question_node_reply(
         self,
@@ -58,19 +104,22 @@ class WhatsAppFlowService:
         user_identifier: str,
         brand_id: int,
         flow_id: str,
-        node_id: str
+        node_id: str,
+        user_input: Optional[str] = None
     ) -> bool:
         """
         Handle user reply to a question node.
         ONLY extracts user's answer and saves to flow context table as a separate record.
         Does NOT change user state or find next node.
-        
+        Callers that already extracted the reply pass it as user_input so the
+        message body isn't parsed a second time.
+
         Returns:
             bool: True if answer was saved successfully, False otherwise
         """
         try:
-            # Extract user's answer
-            user_answer = self._extract_user_input(message_type, message_body)
+            # Extract user's answer (unless the caller already did)
+            user_answer = user_input if user_input is not None else self._extract_user_input(message_type, message_body)
             
             if not user_answer:
                 self.log_util.warning(
@@ -78,23 +127,18 @@ class WhatsAppFlowService:
                     message=f"Could not extract user answer from message for user {user_identifier}"
                 )
                 user_answer = ""
-            
-            print(f"DEBUG: Extracted user answer: '{user_answer}'")
-            
+
             # Get the variable name to store the answer
             user_input_variable = question_node.get("userInputVariable", "")
-            
+
             # Only save if userInputVariable is provided
             if not user_input_variable:
-                print(f"DEBUG: No userInputVariable defined, skipping save")
                 self.log_util.info(
                     service_name="WhatsAppFlowService",
                     message=f"Question node has no userInputVariable, skipping answer save for user {user_identifier}"
                 )
                 return True
-            
-            print(f"DEBUG: Saving variable '{user_input_variable}' = '{user_answer}' as separate record")
-            
+
             # Save this variable as its own record
             await self.flow_db.save_or_update_flow_variable(
                 user_identifier=user_identifier,
@@ -104,8 +148,7 @@ class WhatsAppFlowService:
                 variable_value=user_answer,
                 node_id=node_id
             )
-            
-            print(f"DEBUG: Flow variable saved as new record in DB successfully")
+
             self.log_util.info(
                 service_name="WhatsAppFlowService",
                 message=f"Saved user answer '{user_answer}' to {user_input_variable} (node: {node_id}) for user {user_identifier} in flow {flow_id}"
@@ -138,18 +181,8 @@ class WhatsAppFlowService:
         Call the node process API endpoint to send node to channel service
         """
         try:
-            # Convert datetime objects in user_state to strings for JSON serialization
-            serializable_user_state = None
-            if user_state:
-                import json
-                from datetime import datetime
-                serializable_user_state = {}
-                for key, value in user_state.items():
-                    if isinstance(value, datetime):
-                        serializable_user_state[key] = value.isoformat()
-                    else:
-                        serializable_user_state[key] = value
-            
+            # Datetimes (and other non-JSON types) in user_state are handled
+            # by model_dump(mode='json') below - no manual conversion pass
             request_data = ProcessNodeRequest(
                 flow_id=flow.id,
                 current_node_id=current_node_id,
@@ -162,7 +195,7 @@ class WhatsAppFlowService:
                 channel=channel,
                 fallback_message=fallback_message,
                 is_validation_error=is_validation_error,
-                user_state=serializable_user_state
+                user_state=user_state
             )
             
             # Log the request being sent to node process API
@@ -179,28 +212,36 @@ class WhatsAppFlowService:
                 message=f"[NODE_PROCESS_API] Full request payload: {request_json}"
             )
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
+            # model_dump(mode='json') already produced JSON-safe values, so
+            # either encoder can take the dict as-is
+            if orjson is not None:
+                response = await self._http_client.post(
+                    self.node_process_api_url,
+                    content=orjson.dumps(request_json),
+                    headers={"Content-Type": "application/json"}
+                )
+            else:
+                response = await self._http_client.post(
                     self.node_process_api_url,
                     json=request_json,
                     headers={"Content-Type": "application/json"}
                 )
-                
-                if response.status_code == 200:
-                    response_data = response.json()
-                    return ProcessNodeResponse(**response_data).model_dump()
-                else:
-                    self.log_util.error(
-                        service_name="WhatsAppFlowService",
-                        message=f"Node process API returned error: {response.status_code} - {response.text}"
-                    )
-                    return {
-                        "status": "error",
-                        "message": f"Node process API error: {response.text}",
-                        "flow_id": flow.id,
-                        "next_node_id": next_node_id,
-                        "automation_exited": False
-                    }
+
+            if response.status_code == 200:
+                response_data = response.json()
+                return ProcessNodeResponse(**response_data).model_dump()
+            else:
+                self.log_util.error(
+                    service_name="WhatsAppFlowService",
+                    message=f"Node process API returned error: {response.status_code} - {response.text}"
+                )
+                return {
+                    "status": "error",
+                    "message": f"Node process API error: {response.text}",
+                    "flow_id": flow.id,
+                    "next_node_id": next_node_id,
+                    "automation_exited": False
+                }
                     
         except httpx.TimeoutException:
             self.log_util.error(
@@ -232,18 +273,22 @@ class WhatsAppFlowService:
         flow: FlowData,
         current_processed_node_id: str,
         current_processed_node_data: Dict[str, Any],
-        edges: List[Any]
+        edges: List[Any],
+        nodes_by_id: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Detect if the currently processed node should automatically chain to the next node.
         This handles transactional nodes (like message nodes) that don't require user input.
-        
+
         Args:
             flow: Complete flow object
             current_processed_node_id: The node that was just processed
             current_processed_node_data: The complete node JSON that was just processed
             edges: List of flow edges
-            
+            nodes_by_id: Optional {node_id: node_dict} map from the caller's
+                flow index; when provided the next-node lookup skips the
+                model_dump scan over flow.flowNodes
+
         Returns:
             Dict with keys:
                 - should_chain: bool - whether to chain to next node
@@ -276,23 +321,25 @@ class WhatsAppFlowService:
                     "reason": "no_next_edge"
                 }
             
-            # Get the next node data
-            def _node_to_dict(node: Any) -> Dict[str, Any]:
-                if hasattr(node, "model_dump"):
-                    return node.model_dump()
-                if isinstance(node, dict):
-                    return node
-                return dict(node)
-            
+            # Get the next node data - from the caller's index when available,
+            # otherwise by scanning the flow's nodes
             next_node_id = next_edge.target_node_id
             next_node_data = None
-            
-            for node in flow.flowNodes:
-                node_dict = _node_to_dict(node)
-                if node_dict.get("id") == next_node_id:
-                    next_node_data = node_dict
-                    break
-            
+
+            if nodes_by_id is not None:
+                next_node_data = nodes_by_id.get(next_node_id)
+            else:
+                for node in flow.flowNodes:
+                    if hasattr(node, "model_dump"):
+                        node_dict = node.model_dump()
+                    elif isinstance(node, dict):
+                        node_dict = node
+                    else:
+                        node_dict = dict(node)
+                    if node_dict.get("id") == next_node_id:
+                        next_node_data = node_dict
+                        break
+
             if not next_node_data:
                 return {
                     "should_chain": False,
@@ -47,15 +47,33 @@ class LogUtil:
         motor_logger = logging.getLogger("motor")
         motor_logger.setLevel(logging.WARNING)  # Suppress INFO and DEBUG messages from motor
 
-    def info(self, service_name: str, message: str):
-        self.logger.info(f"{message}", extra={"tags": {"service_name": service_name}})
+    def is_info_enabled(self) -> bool:
+        """
+        Check whether INFO logs would be emitted.
+        Callers can use this to skip building expensive log messages.
+        """
+        return self.logger.isEnabledFor(logging.INFO)
 
-    def error(self, service_name: str, message: str):
-        self.logger.error(f"{message}", extra={"tags": {"service_name": service_name}})
+    def is_debug_enabled(self) -> bool:
+        """
+        Check whether DEBUG logs would be emitted.
+        Callers can use this to skip building expensive log messages.
+        """
+        return self.logger.isEnabledFor(logging.DEBUG)
 
-    def warning(self, service_name: str, message: str):
-        self.logger.warning(f"{message}", extra={"tags": {"service_name": service_name}})
+    def info(self, service_name: str, message: str, *args):
+        # %s-style args are formatted lazily by the logging layer, only when
+        # the record is actually emitted
+        self.logger.info(message, *args, extra={"tags": {"service_name": service_name}})
 
-    def debug(self, service_name: str, message: str):
-        self.logger.debug(f"{message}", extra={"tags": {"service_name": service_name}})
+    def error(self, service_name: str, message: str, *args, exc_info: bool = False):
+        # exc_info=True attaches the active exception; the handler formats the
+        # traceback only when the record is actually emitted
+        self.logger.error(message, *args, extra={"tags": {"service_name": service_name}}, exc_info=exc_info)
+
+    def warning(self, service_name: str, message: str, *args):
+        self.logger.warning(message, *args, extra={"tags": {"service_name": service_name}})
+
+    def debug(self, service_name: str, message: str, *args):
+        self.logger.debug(message, *args, extra={"tags": {"service_name": service_name}})
 